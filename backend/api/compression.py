@@ -0,0 +1,105 @@
+"""
+./backend/api/compression.py
+
+Response compression for the Flask app. Text and JSON bodies are compressed with brotli or gzip,
+whichever the client's Accept-Encoding prefers (brotli only if the brotli package is installed).
+Small bodies are sent as they are, and so are files (uploads are already-compressed images).
+For responses with an ETag, the compressed bytes are cached so repeat requests skip compression.
+"""
+
+import gzip
+from typing import Optional
+
+from flask import Flask, Response, request
+
+from backend.utils.cache import MISSING, CacheStats, LRUCache
+from config.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_CACHE_SIZE,
+    COMPRESSION_CACHE_TTL,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_BYTES,
+)
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip only without it
+    brotli = None
+
+ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]  # Preferred first on equal quality
+COMPRESSIBLE_TYPES = {"application/json", "application/javascript", "image/svg+xml"}
+
+compressed_cache_stats = CacheStats()
+_compressed = LRUCache(COMPRESSION_CACHE_SIZE, COMPRESSION_CACHE_TTL, stats=compressed_cache_stats)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Compresses a body for a Content-Encoding ("br" or "gzip").
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input, so it can be cached by ETag
+    return gzip.compress(data, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _is_compressible(response: Response) -> bool:
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES
+
+
+def _choose_encoding() -> Optional[str]:
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook: compresses the body when the client accepts it and it is worth it.
+
+    Args:
+        response (Response): Response about to be sent.
+
+    Returns:
+        Response: The same response, compressed in place when applicable.
+    """
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough  # Files (send_from_directory) are streamed as they are
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not _is_compressible(response)
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if (response.content_length or 0) < COMPRESSION_MIN_BYTES:
+        return response
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    etag, weak = response.get_etag()
+    key = None
+    if etag and not response.cache_control.no_store:
+        key = (request.full_path, etag, weak, encoding)
+
+    body = _compressed.get(key) if key is not None else MISSING
+    if body is MISSING:
+        body = compress(response.get_data(), encoding)
+        if key is not None:
+            _compressed.put(key, body)
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        # Each encoding is its own representation, so it needs its own (strong) ETag
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compresses every eligible response of app (see compress_response).
+    """
+    app.after_request(compress_response)
@@ -0,0 +1,89 @@
+"""
+./backend/api/conditional.py
+
+Conditional GET for read endpoints. A view decorated with @conditional(...) names the datasets it
+reads. Its strong ETag is derived from their versions (repository.signature, which changes on
+every write, same-size rewrites included, and is the same in every worker process) and from the
+request's path and query string. When the client's If-None-Match already holds that ETag, a 304
+is returned before the view runs, so no filtering or serialization happens.
+"""
+
+import hashlib
+from functools import wraps
+from typing import Callable, Iterable, Union
+
+from flask import Response, make_response, request
+
+import backend.storage.repository as repo
+from backend.api.compression import ENCODINGS
+from backend.storage.repository import PathLike
+from backend.utils.search import NAME_MATCH_VERSION
+
+Datasets = Union[PathLike, Callable[[], Iterable[PathLike]]]
+
+
+def dataset_etag(paths: Iterable[PathLike]) -> str:
+    """
+    ETag for the current request given the datasets its response is built from.
+
+    Args:
+        paths (Iterable[PathLike]): Data files the response depends on.
+
+    Returns:
+        str: Opaque ETag value (unquoted).
+    """
+    versions = [(str(path), repo.signature(path)) for path in paths]
+    # Responses may hold fuzzy name matches, so a change to the matching code also changes the ETag
+    key = repr((request.path, sorted(request.args.items(multi=True)), versions, NAME_MATCH_VERSION))
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def _matching_etag(etag: str) -> Union[str, None]:
+    # A compressed response carries the ETag with its encoding appended (see compression.py)
+    for candidate in [etag] + [f"{etag}-{encoding}" for encoding in ENCODINGS]:
+        if request.if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+
+def conditional(*datasets: Datasets, private: bool = False) -> Callable:
+    """
+    Decorator adding ETag / If-None-Match handling to a GET view.
+
+    Args:
+        datasets (Datasets): Data files the view reads, or callables returning them (evaluated per
+            request, e.g. when a query parameter picks the file).
+        private (bool, optional): The response is specific to a user, so shared caches must not
+            store it. Defaults to False.
+
+    Returns:
+        Callable: The decorator.
+    """
+    cache_control = "private, no-cache" if private else "no-cache"
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs) -> Response:
+            paths = []
+            for dataset in datasets:
+                paths.extend(dataset() if callable(dataset) else [dataset])
+            etag = dataset_etag(paths)
+
+            matched = _matching_etag(etag) if request.if_none_match else None
+            if matched is not None:
+                resp = make_response("", 304)
+                resp.set_etag(matched)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp  # Errors are not cached
+                resp.set_etag(etag)
+
+            # Stored by the browser, but revalidated (cheaply, via If-None-Match) before every use
+            resp.headers["Cache-Control"] = cache_control
+            resp.vary.add("Accept-Encoding")
+            return resp
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,74 @@
+"""
+./backend/api/json_provider.py
+
+Flask JSON provider behind every jsonify call. Encodes with orjson when it is installed (several
+times faster than the stdlib json module) and falls back to the stdlib otherwise. Output is
+compact; add ?pretty=1 to any request to get it indented for debugging.
+"""
+
+import json
+from typing import Any
+
+from flask import Response, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+from config.config import JSON_ENCODER
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib encoder is used without it
+    orjson = None
+
+# Datetimes and dataclasses go through Flask's default hook, so both encoders produce the same JSON
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+def pretty_requested() -> bool:
+    return has_request_context() and request.args.get("pretty", "").lower() in ("1", "true")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider with a swappable encoder (see config JSON_ENCODER), unsorted keys,
+    unescaped UTF-8 and compact responses unless ?pretty=1 is passed.
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    def __init__(self, app, encoder: str = JSON_ENCODER) -> None:
+        super().__init__(app)
+        if encoder not in ("orjson", "stdlib"):
+            raise ValueError(f"ERROR: Unknown JSON encoder '{encoder}'.")
+        self.use_orjson = encoder == "orjson" and orjson is not None
+
+    def encode(self, obj: Any, pretty: bool = False) -> bytes:
+        """
+        Serializes obj to UTF-8 JSON bytes.
+
+        Args:
+            obj (Any): Data to serialize.
+            pretty (bool, optional): Indent by 2 spaces instead of compact output. Defaults to False.
+
+        Returns:
+            bytes: The encoded JSON.
+        """
+        if self.use_orjson:
+            options = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0)
+            try:
+                return orjson.dumps(obj, default=self.default, option=options)
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers beyond 64 bits, which the stdlib encoder handles
+
+        layout = {"indent": 2} if pretty else {"separators": (",", ":")}
+        return self.dumps(obj, **layout).encode("utf-8")
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.encode(obj, pretty_requested()) + b"\n", mimetype=self.mimetype
+        )
@@ -8,57 +8,174 @@ from flask import Blueprint, Response, jsonify, make_response, request
 
 import backend.core.business_manager as bm
 import backend.storage.json_handler as jh
+import backend.storage.repository as repo
+from backend.api.conditional import conditional
+from backend.utils.pagination import ExpiredCursor, InvalidCursor, version_token
+from backend.utils.projection import parse_fields, project_all
+from config.config import (
+    BATCH_MAX_IDS,
+    BUSINESSES_JSON,
+    NEAREST_MAX_K,
+    QUERY_CACHE_ENABLED,
+    QUERY_CACHE_GRID_DEG,
+    SUGGEST_MAX_LIMIT,
+)
 
 businesses_bp = Blueprint("businesses", __name__, url_prefix="/api/businesses")
 
 
+def _business_file() -> list:
+    return [request.args.get("filepath", type=str) or BUSINESSES_JSON]
+
+
 @businesses_bp.route("", methods=["GET"])
+@conditional(_business_file)
 def get_businesses() -> Response:
     """
     RESTful endpoint: GET /api/businesses
     """
     search_query = request.args.get("search", type=str)
     category = request.args.get("category", type=str)
-    filepath = request.args.get("filepath", "data/businesses.json", type=str)
+    cuisine = request.args.get("cuisine", type=str)
+    filepath = request.args.get("filepath", type=str)
     radius = request.args.get("radius", 10, type=int)
     lat1 = request.args.get("lat1", type=float)
     lon1 = request.args.get("lon1", type=float)
     min_rating = request.args.get("min_rating", type=int)
     offset = request.args.get("offset", 0, type=int)
     limit = request.args.get("limit", 30, type=int)
+    sort = request.args.get("sort", type=str)
+    # facets=1 counts every category and cuisine; facets=category counts only the named fields
+    facets = request.args.get("facets", "", type=str)
+    # cursor= (empty) starts cursor pagination; later pages pass the previous next_cursor
+    cursor = request.args.get("cursor", type=str)
+    # fields=id,name,latitude,longitude returns only those keys of each business
+    fields = request.args.get("fields", type=str)
+
+    if lat1 and lon1 and radius == 0:
+        resp = jsonify({"error": "Radius must be nonzero"})
+        return make_response(resp, 400)
+    if sort == "distance" and not (lat1 and lon1):
+        resp = jsonify({"error": "sort=distance needs lat1 and lon1"})
+        return make_response(resp, 400)
 
     try:
-        results = jh.load_businesses(input_filepath=filepath)
+        field_spec = parse_fields(fields)
+    except ValueError as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 400)
 
-        if lat1 and lon1:
-            if radius != 0:
-                results = bm.filter_by_radius(results, radius, lat1, lon1)
-            else:
-                resp = jsonify({"error": "Radius must be nonzero"})
-                return make_response(resp, 400)
+    if facets.lower() in ("1", "true"):
+        facet_fields = list(bm.FACET_FIELDS)
+    else:
+        facet_fields = [f for f in facets.split(",") if f]
+        unknown = [f for f in facet_fields if f not in bm.FACET_FIELDS]
+        if unknown:
+            resp = jsonify({"error": f"Unknown facet field(s): {', '.join(unknown)}"})
+            return make_response(resp, 400)
 
-        if category:
-            results = bm.filter_by_category(results, category)
+    if cursor is not None:
+        return _get_businesses_by_cursor(
+            cursor, limit, search_query, category, cuisine, min_rating, lat1, lon1, radius, sort, filepath,
+            field_spec,
+        )
+
+    try:
+        businesses = bm.load_for_query(filepath)
 
-        if min_rating:
-            results = bm.filter_by_min_rating(results, min_rating)
+        # Only the requested page is ever ranked or distance-sorted, but total counts every match.
+        # Matches stay as indices; only the returned page is turned into dicts.
+        results, total_count, plan, facet_counts = bm.query_page(
+            businesses,
+            offset,
+            limit,
+            search_query=search_query,
+            category=category,
+            cuisine=cuisine,
+            min_rating=min_rating,
+            lat=lat1 if lat1 and lon1 else None,
+            lon=lon1 if lat1 and lon1 else None,
+            radius=radius,
+            ranked_limit=offset + limit if sort == "relevance" else None,
+            facet_fields=facet_fields,
+            sort_by_distance=sort == "distance",
+            use_cache=QUERY_CACHE_ENABLED,
+        )
 
-        if search_query:
-            results = bm.search_by_name(results, search_query)
+        body = {
+            "status": "success",
+            "businesses": project_all(results, field_spec),
+            "count": len(results),
+            "total": total_count,
+        }
+        if facet_fields:
+            # Lists rather than objects: jsonify sorts object keys, which would lose the count order
+            body["facets"] = {
+                field: [{"value": value, "count": count} for value, count in counts.items()]
+                for field, counts in facet_counts.items()
+            }
+        resp = jsonify(body)
+        resp = make_response(resp, 200)
+        resp.headers["X-Query-Plan"] = plan
+        return resp
+
+    except ValueError as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 404)
+    except Exception as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 500)
 
-        total_count = len(results)
-        results = results[offset : offset + limit]
+
+def _get_businesses_by_cursor(
+    cursor, limit, search_query, category, cuisine, min_rating, lat1, lon1, radius, sort, filepath,
+    field_spec,
+) -> Response:
+    """
+    Cursor mode of GET /api/businesses: the response carries next_cursor (null on the last page)
+    instead of relying on offset. Facets are not computed in this mode.
+    """
+    if limit <= 0:
+        resp = jsonify({"error": "limit must be positive"})
+        return make_response(resp, 400)
+
+    try:
+        businesses = bm.load_for_query(filepath)
+        version = version_token(repo.signature(filepath or BUSINESSES_JSON))
+
+        results, total_count, next_cursor = bm.query_cursor_page(
+            businesses,
+            version,
+            limit,
+            cursor,
+            search_query=search_query,
+            category=category,
+            cuisine=cuisine,
+            min_rating=min_rating,
+            lat=lat1 if lat1 and lon1 else None,
+            lon=lon1 if lat1 and lon1 else None,
+            radius=radius,
+            sort=sort,
+            source=filepath,
+        )
 
         resp = jsonify(
             {
                 "status": "success",
-                "businesses": results,
+                "businesses": project_all(results, field_spec),
                 "count": len(results),
                 "total": total_count,
+                "next_cursor": next_cursor,
             }
         )
         return make_response(resp, 200)
 
+    except InvalidCursor as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 400)
+    except ExpiredCursor as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 410)
     except ValueError as e:
         resp = jsonify({"error": str(e)})
         return make_response(resp, 404)
@@ -67,16 +184,211 @@ def get_businesses() -> Response:
         return make_response(resp, 500)
 
 
+@businesses_bp.route("/batch", methods=["GET"])
+@conditional(BUSINESSES_JSON)
+def get_businesses_batch() -> Response:
+    """
+    RESTful endpoint: GET /api/businesses/batch?ids=1,2,3[&fields=...]
+
+    Returns several businesses in one round trip, in the order of ids. Ids that match no
+    business are listed under "missing".
+    """
+    try:
+        ids = [int(i) for i in request.args.get("ids", "", type=str).split(",") if i.strip()]
+    except ValueError:
+        resp = jsonify({"error": "ids must be a comma-separated list of integers"})
+        return make_response(resp, 400)
+    return _batch_response(ids, request.args.get("fields", type=str))
+
+
+@businesses_bp.route("/batch", methods=["POST"])
+def post_businesses_batch() -> Response:
+    """
+    RESTful endpoint: POST /api/businesses/batch with {"ids": [1, 2, 3], "fields": "id,name"}
+
+    Same as the GET variant, for id lists too long for a URL.
+    """
+    data = request.get_json(silent=True) or {}
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        resp = jsonify({"error": "ids must be a list of integers"})
+        return make_response(resp, 400)
+    return _batch_response(ids, data.get("fields"))
+
+
+def _batch_response(ids: list[int], fields) -> Response:
+    if not 1 <= len(ids) <= BATCH_MAX_IDS:
+        resp = jsonify({"error": f"Between 1 and {BATCH_MAX_IDS} ids are required"})
+        return make_response(resp, 400)
+    try:
+        field_spec = parse_fields(fields if isinstance(fields, str) else None)
+    except ValueError as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 400)
+
+    try:
+        results, missing = bm.businesses_by_ids(bm.load_for_query(), ids)
+
+        resp = jsonify(
+            {
+                "status": "success",
+                "businesses": project_all(results, field_spec),
+                "count": len(results),
+                "missing": missing,
+            }
+        )
+        return make_response(resp, 200)
+
+    except Exception as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 500)
+
+
+@businesses_bp.route("/cache-stats", methods=["GET"])
+def get_query_cache_stats() -> Response:
+    """
+    RESTful endpoint: GET /api/businesses/cache-stats
+
+    Hit/miss counters of the GET /api/businesses query cache since this process started, for
+    tuning QUERY_CACHE_GRID_DEG.
+    """
+    try:
+        stats = bm.query_cache_stats.snapshot()
+        stats["entries"] = len(bm.query_cache(bm.load_for_query()))
+        stats["enabled"] = QUERY_CACHE_ENABLED
+        stats["grid_deg"] = QUERY_CACHE_GRID_DEG
+
+        resp = jsonify({"status": "success", "cache": stats})
+        return make_response(resp, 200)
+
+    except Exception as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 500)
+
+
+@businesses_bp.route("/nearest", methods=["GET"])
+@conditional(BUSINESSES_JSON)
+def get_nearest_businesses() -> Response:
+    """
+    RESTful endpoint: GET /api/businesses/nearest?lat=&lon=&k=
+
+    Returns the k businesses closest to a point, closest first, each with its distance in km.
+    """
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+    k = request.args.get("k", 10, type=int)
+
+    if lat is None or lon is None:
+        resp = jsonify({"error": "lat and lon are required"})
+        return make_response(resp, 400)
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        resp = jsonify({"error": "lat must be within [-90, 90] and lon within [-180, 180]"})
+        return make_response(resp, 400)
+    if not 1 <= k <= NEAREST_MAX_K:
+        resp = jsonify({"error": f"k must be between 1 and {NEAREST_MAX_K}"})
+        return make_response(resp, 400)
+
+    try:
+        results = bm.nearest_businesses(bm.load_for_query(), lat, lon, k)
+
+        resp = jsonify(
+            {
+                "status": "success",
+                "businesses": results,
+                "count": len(results),
+            }
+        )
+        return make_response(resp, 200)
+
+    except Exception as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 500)
+
+
+@businesses_bp.route("/suggest", methods=["GET"])
+def get_business_suggestions() -> Response:
+    """
+    RESTful endpoint: GET /api/businesses/suggest?q=
+
+    Search-as-you-type suggestions: businesses whose name (or a word in it) starts with q, most
+    popular first.
+    """
+    query = request.args.get("q", "", type=str)
+    limit = request.args.get("limit", 8, type=int)
+
+    if not 1 <= limit <= SUGGEST_MAX_LIMIT:
+        resp = jsonify({"error": f"limit must be between 1 and {SUGGEST_MAX_LIMIT}"})
+        return make_response(resp, 400)
+
+    try:
+        suggestions = bm.suggest_businesses(bm.load_for_query(), query, limit)
+
+        resp = jsonify(
+            {
+                "status": "success",
+                "suggestions": suggestions,
+                "count": len(suggestions),
+            }
+        )
+        return make_response(resp, 200)
+
+    except Exception as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 500)
+
+
+@businesses_bp.route("/viewport", methods=["GET"])
+@conditional(BUSINESSES_JSON)
+def get_viewport_businesses() -> Response:
+    """
+    RESTful endpoint: GET /api/businesses/viewport?min_lat=&min_lon=&max_lat=&max_lon=&zoom=
+
+    Returns what the map should draw for its current view: the businesses themselves when zoomed
+    in, or cluster counts with centroids when zoomed out.
+    """
+    bounds = [request.args.get(name, type=float) for name in ("min_lat", "min_lon", "max_lat", "max_lon")]
+    zoom = request.args.get("zoom", type=int)
+    category = request.args.get("category", type=str)
+
+    if None in bounds or zoom is None:
+        resp = jsonify({"error": "min_lat, min_lon, max_lat, max_lon and zoom are required"})
+        return make_response(resp, 400)
+    min_lat, min_lon, max_lat, max_lon = bounds
+    if min_lat > max_lat or not 0 <= zoom <= 22:
+        resp = jsonify({"error": "min_lat must be <= max_lat and zoom within [0, 22]"})
+        return make_response(resp, 400)
+
+    try:
+        mode, items, total = bm.viewport_businesses(
+            bm.load_for_query(), min_lat, min_lon, max_lat, max_lon, zoom, category=category
+        )
+
+        resp = jsonify(
+            {
+                "status": "success",
+                "mode": mode,
+                mode: items,
+                "count": len(items),
+                "total": total,
+            }
+        )
+        return make_response(resp, 200)
+
+    except Exception as e:
+        resp = jsonify({"error": str(e)})
+        return make_response(resp, 500)
+
+
 @businesses_bp.route("/<int:business_id>", methods=["GET"])
+@conditional(BUSINESSES_JSON)
 def get_business_by_id(business_id: int) -> Response:
     """
     RESTful endpoint: GET /api/businesses/<id>
 
     Returns a single business by its ID.
     """
-    results = jh.load_businesses()
     try:
-        results = bm.search_by_id(results, business_id=business_id)
+        results = bm.search_by_id(bm.load_for_query(), business_id=business_id)
 
         resp = jsonify(
             {
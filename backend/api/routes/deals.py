@@ -7,6 +7,8 @@ API routes for deals and coupons.
 from flask import Blueprint, jsonify, request
 
 from backend.core import deal_manager as dm
+from backend.utils.pagination import ExpiredCursor, InvalidCursor
+from config.config import CURSOR_PAGE_SIZE
 
 deals_bp = Blueprint("deals", __name__, url_prefix="/api/deals")
 
@@ -41,9 +43,25 @@ def create_deal():
 def get_deals():
     business_id = request.args.get("business_id", type=int)
     active_only = request.args.get("active_only", "true").lower() == "true"
-
-    deals = dm.get_deals(business_id=business_id, active_only=active_only)
-    return jsonify({"status": "success", "deals": deals})
+    cursor = request.args.get("cursor", type=str)
+    limit = request.args.get("limit", type=int)
+
+    if cursor is None and limit is None:
+        deals = dm.get_deals(business_id=business_id, active_only=active_only)
+        return jsonify({"status": "success", "deals": deals})
+
+    # Paginated: limit and/or cursor (the next_cursor of the previous page)
+    if limit is not None and limit <= 0:
+        return jsonify({"status": "error", "message": "limit must be positive"}), 400
+    try:
+        deals, total, next_cursor = dm.get_deals_page(
+            limit or CURSOR_PAGE_SIZE, cursor, business_id=business_id, active_only=active_only
+        )
+    except InvalidCursor as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except ExpiredCursor as e:
+        return jsonify({"status": "error", "message": str(e)}), 410
+    return jsonify({"status": "success", "deals": deals, "total": total, "next_cursor": next_cursor})
 
 
 @deals_bp.route("/<int:deal_id>", methods=["GET"])
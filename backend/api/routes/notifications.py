@@ -7,19 +7,49 @@ Notification-related API endpoints.
 from flask import Blueprint, Response, jsonify, make_response, request
 
 import backend.core.notification_manager as nm
+from backend.api.conditional import conditional
+from backend.utils.pagination import ExpiredCursor, InvalidCursor
+from config.config import CURSOR_PAGE_SIZE, NOTIFICATIONS_JSON
 
 notifications_bp = Blueprint("notifications", __name__, url_prefix="/api/notifications")
 
 
 @notifications_bp.route("/", methods=["GET"])
+@conditional(NOTIFICATIONS_JSON, private=True)
 def get_notifications() -> Response:
     user_id = request.args.get("user_id", type=int)
     if not user_id:
         return make_response(jsonify({"status": "error", "message": "user_id required."}), 400)
 
     unread_only = request.args.get("unread_only", "false").lower() == "true"
-    notifications = nm.get_user_notifications(user_id, unread_only=unread_only)
-    return make_response(jsonify({"status": "success", "notifications": notifications}), 200)
+    cursor = request.args.get("cursor", type=str)
+    limit = request.args.get("limit", type=int)
+    if cursor is None and limit is None:
+        notifications = nm.get_user_notifications(user_id, unread_only=unread_only)
+        return make_response(jsonify({"status": "success", "notifications": notifications}), 200)
+
+    # Paginated: limit and/or cursor (the next_cursor of the previous page)
+    if limit is not None and limit <= 0:
+        return make_response(jsonify({"status": "error", "message": "limit must be positive."}), 400)
+    try:
+        notifications, total, next_cursor = nm.get_user_notifications_page(
+            user_id, limit or CURSOR_PAGE_SIZE, cursor, unread_only=unread_only
+        )
+    except InvalidCursor as e:
+        return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+    except ExpiredCursor as e:
+        return make_response(jsonify({"status": "error", "message": str(e)}), 410)
+    return make_response(
+        jsonify(
+            {
+                "status": "success",
+                "notifications": notifications,
+                "total": total,
+                "next_cursor": next_cursor,
+            }
+        ),
+        200,
+    )
 
 
 @notifications_bp.route("/<int:notification_id>/read", methods=["PUT"])
@@ -10,7 +10,10 @@ from flask import Blueprint, Response, jsonify, make_response, request
 from werkzeug.utils import secure_filename
 
 import backend.core.review_manager as rm
-from config.config import PROJECT_ROOT
+from backend.api.conditional import conditional
+from backend.utils.pagination import ExpiredCursor, InvalidCursor
+from backend.utils.projection import parse_fields, project_all
+from config.config import CURSOR_PAGE_SIZE, PROJECT_ROOT, REVIEWS_JSON
 
 reviews_bp = Blueprint("reviews", __name__, url_prefix="/api/reviews")
 
@@ -23,35 +26,66 @@ def allowed_file(filename):
 
 
 @reviews_bp.route("", methods=["GET"])
+@conditional(REVIEWS_JSON)
 def get_reviews() -> Response:
     """
-    GET /api/reviews?business_id=X
-    Returns all reviews for a specific business.
+    GET /api/reviews?business_id=X[&limit=N][&cursor=C][&fields=F]
+    Returns all reviews for a specific business, or one page of them when limit or cursor is
+    given (the response then carries total and next_cursor). fields=rating,review,replies.username
+    returns only those keys of each review.
     """
     business_id = request.args.get("business_id", type=int)
+    cursor = request.args.get("cursor", type=str)
+    limit = request.args.get("limit", type=int)
+    fields = request.args.get("fields", type=str)
 
     if not business_id:
         resp = jsonify({"status": "error", "message": "business_id is required"})
         return make_response(resp, 400)
+    if limit is not None and limit <= 0:
+        resp = jsonify({"status": "error", "message": "limit must be positive"})
+        return make_response(resp, 400)
+    try:
+        field_spec = parse_fields(fields)
+    except ValueError as e:
+        resp = jsonify({"status": "error", "message": str(e)})
+        return make_response(resp, 400)
 
     try:
-        reviews = rm.get_reviews_for_business(business_id)
         avg_rating = rm.calculate_average_rating(business_id)
-
-        resp = jsonify({
-            "status": "success",
-            "reviews": reviews,
-            "count": len(reviews),
-            "averageRating": avg_rating,
-        })
+        if cursor is None and limit is None:
+            reviews = rm.get_reviews_for_business(business_id)
+            body = {"status": "success", "reviews": reviews, "count": len(reviews)}
+        else:
+            reviews, total, next_cursor = rm.get_reviews_page(
+                business_id, limit or CURSOR_PAGE_SIZE, cursor
+            )
+            body = {
+                "status": "success",
+                "reviews": reviews,
+                "count": len(reviews),
+                "total": total,
+                "next_cursor": next_cursor,
+            }
+        body["reviews"] = project_all(reviews, field_spec)
+        body["averageRating"] = avg_rating
+
+        resp = jsonify(body)
         return make_response(resp, 200)
 
+    except InvalidCursor as e:
+        resp = jsonify({"status": "error", "message": str(e)})
+        return make_response(resp, 400)
+    except ExpiredCursor as e:
+        resp = jsonify({"status": "error", "message": str(e)})
+        return make_response(resp, 410)
     except Exception as e:
         resp = jsonify({"status": "error", "message": str(e)})
         return make_response(resp, 500)
 
 
 @reviews_bp.route("/<int:review_id>", methods=["GET"])
+@conditional(REVIEWS_JSON)
 def get_review(review_id: int) -> Response:
     """
     GET /api/reviews/<review_id>
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
+from backend.api.conditional import conditional
 from backend.core import saved_manager
+from backend.utils.projection import parse_fields, project_all
 
 saved_bp = Blueprint("saved", __name__, url_prefix="/api/saved")
 
@@ -95,17 +97,22 @@ def delete_collection(collection_id):
 
 # Saved Business Routes
 @saved_bp.route("/businesses", methods=["GET"])
+@conditional(saved_manager.SAVED_BUSINESSES_FILE, private=True)
 def get_saved_businesses():
-    """Get saved businesses for a user, optionally filtered by collection."""
+    """Get saved businesses for a user, optionally filtered by collection (fields= picks keys)."""
     user_id = request.args.get("user_id", type=int)
     collection_id = request.args.get("collection_id", type=int)
 
     if not user_id:
         return jsonify({"status": "error", "message": "user_id required"}), 400
+    try:
+        field_spec = parse_fields(request.args.get("fields", type=str))
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
 
     try:
         saved_businesses = saved_manager.get_saved_businesses(user_id, collection_id)
-        return jsonify({"status": "success", "savedBusinesses": saved_businesses})
+        return jsonify({"status": "success", "savedBusinesses": project_all(saved_businesses, field_spec)})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
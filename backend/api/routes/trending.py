@@ -9,8 +9,9 @@ import uuid
 
 from flask import Blueprint, jsonify, request
 
+from backend.api.conditional import conditional
 from backend.core import trending_manager as tm
-from config.config import PROJECT_ROOT
+from config.config import PROJECT_ROOT, TRENDING_POINTS_JSON
 
 trending_bp = Blueprint("trending", __name__, url_prefix="/api/trending")
 
@@ -48,6 +49,7 @@ def upload_receipt():
 
 
 @trending_bp.route("", methods=["GET"])
+@conditional(TRENDING_POINTS_JSON)
 def get_trending():
     limit = request.args.get("limit", 50, type=int)
     trending = tm.get_trending(limit)
@@ -55,6 +57,7 @@ def get_trending():
 
 
 @trending_bp.route("/<int:business_id>/stats", methods=["GET"])
+@conditional(TRENDING_POINTS_JSON)
 def get_stats(business_id):
     stats = tm.get_business_trending_stats(business_id)
     if stats is None:
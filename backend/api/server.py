@@ -26,15 +26,17 @@ from backend.api.routes import (
     recommendations_bp,
     verification_bp,
 )
+from backend.api.compression import init_compression
+from backend.api.json_provider import FastJSONProvider
 from config.config import PROJECT_ROOT
 
 app = Flask(__name__)
 
 CORS(app, origins="*")
 
-app.config["JSON_SORT_KEYS"] = False
-app.config["JSON_AS_ASCII"] = False
-app.config["JSONIFY_PRETTYPRINT_REGULAR"] = True
+# Compact, unsorted, UTF-8 JSON (add ?pretty=1 to a request for indented output)
+app.json = FastJSONProvider(app)
+init_compression(app)
 
 UPLOAD_FOLDER = PROJECT_ROOT / "data" / "uploads"
 
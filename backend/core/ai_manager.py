@@ -11,6 +11,9 @@ import time
 from datetime import datetime
 from typing import Optional
 
+import backend.core.business_manager as bm
+import backend.storage.repository as repo
+from backend.storage.locks import locked
 from config.config import (
     RECOMMENDATIONS_CACHE_JSON,
     RECEIPTS_JSON,
@@ -24,25 +27,28 @@ CACHE_TTL_SECONDS = 6 * 60 * 60  # 6 hours
 
 
 def _load_json(path) -> list:
-    try:
-        with open(str(path), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    return repo.load(path, default=[])
 
 
 def _load_cache() -> dict:
-    try:
-        with open(str(RECOMMENDATIONS_CACHE_JSON), "r") as f:
-            data = json.load(f)
-            return {item["userId"]: item for item in data} if isinstance(data, list) else {}
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+    data = repo.load(RECOMMENDATIONS_CACHE_JSON, default=[], for_update=True)
+    return {item["userId"]: item for item in data} if isinstance(data, list) else {}
 
 
 def _save_cache(cache: dict) -> None:
-    with open(str(RECOMMENDATIONS_CACHE_JSON), "w") as f:
-        json.dump(list(cache.values()), f, indent=4)
+    repo.save(RECOMMENDATIONS_CACHE_JSON, list(cache.values()), indent=4)
+
+
+@locked(RECOMMENDATIONS_CACHE_JSON)
+def _cache_recommendations(user_id: int, recommendations: list) -> None:
+    # Re-read under the lock: the Gemini call can take seconds and other users may have been cached
+    cache = _load_cache()
+    cache[user_id] = {
+        "userId": user_id,
+        "recommendations": recommendations,
+        "cachedAt": time.time(),
+    }
+    _save_cache(cache)
 
 
 def _build_user_context(user_id: int, search_history: list = None) -> str:
@@ -166,20 +172,15 @@ def get_recommendations(user_id: int, search_history: list = None) -> dict:
 
         # Enrich with business names
         businesses = _load_json(BUSINESSES_JSON)
-        biz_map = {b.get("id"): b for b in businesses}
-        for rec in recommendations:
-            biz = biz_map.get(rec.get("businessId"))
+        positions = bm.positions_of_ids(businesses, [rec.get("businessId") for rec in recommendations])
+        for rec, position in zip(recommendations, positions.tolist()):
+            biz = businesses[position] if position >= 0 else None
             if biz:
                 rec["businessName"] = biz.get("name", "")
                 rec["category"] = biz.get("category", "")
 
         # Cache results
-        cache[user_id] = {
-            "userId": user_id,
-            "recommendations": recommendations,
-            "cachedAt": time.time(),
-        }
-        _save_cache(cache)
+        _cache_recommendations(user_id, recommendations)
 
         return {"status": "success", "recommendations": recommendations, "cached": False}
 
@@ -8,10 +8,13 @@ from typing import Optional
 
 from typing_extensions import Any
 
+import backend.core.business_manager as bm
 import backend.storage.json_handler as jh
+from backend.storage.locks import locked
 from config.config import USERS_JSON
 
 
+@locked(USERS_JSON)
 def create_bookmarks(
     username: str,
     bookmarks: Any,
@@ -31,7 +34,7 @@ def create_bookmarks(
     if isinstance(bookmarks, int):
         bookmarks = [bookmarks]
 
-    users = jh.load_users()  # Loading all users in memory
+    users = jh.load_users(for_update=True)  # Private copy, modified below
     for user in users:
         if user["username"] == username:
             user["bookmarks"].extend(bookmarks)
@@ -42,6 +45,7 @@ def create_bookmarks(
     jh.save_users(users, output_filepath, io_type="w")
 
 
+@locked(USERS_JSON)
 def remove_bookmarks(
     username: str,
     bookmarks: Any,
@@ -61,7 +65,7 @@ def remove_bookmarks(
     if isinstance(bookmarks, int):
         bookmarks = [bookmarks]
 
-    users = jh.load_users()  # Loading all users in memory
+    users = jh.load_users(for_update=True)  # Private copy, modified below
     user_found = False
     for user in users:
         if user["username"] == username:
@@ -135,11 +139,7 @@ def get_bookmarked_businesses(
     if loaded_user is None:
         raise ValueError("ERROR: Username does not exist.")
 
-    business_map = {business["id"]: business for business in businesses}
-    loaded_businesses = [
-        business_map[bookmark]
-        for bookmark in loaded_user["bookmarks"]
-        if bookmark in business_map
-    ]
+    # Bookmarks that no longer match a business are skipped
+    loaded_businesses, _ = bm.businesses_by_ids(businesses, loaded_user["bookmarks"])
 
     return loaded_businesses
@@ -5,19 +5,118 @@ Brain of business logic, including fetching businesses from JSON file, searching
 matching, and geolocation.
 """
 
+import math
+import threading
+import time
+from typing import Optional, Sequence, Union
+
+import numpy as np
 from fuzzywuzzy import fuzz, process
 
+import backend.storage.columnar as columnar
+import backend.storage.repository as repo
+import backend.utils.pagination as pagination
 import backend.utils.search as search
+from backend.storage.columnar import BusinessColumns, materialize
+from backend.storage.id_index import IdIndex, load_id_index
 from backend.storage.json_handler import load_businesses
-from backend.utils.geo import Haversine
+from backend.utils.cache import MISSING, CacheStats, LRUCache
+from backend.utils.geo import GeoColumns, Haversine, SpatialGrid, cluster_points, haversine_km
+from backend.utils.search import normalize_name
+from config.config import (
+    COLUMNAR_BUSINESSES,
+    QUERY_CACHE_GRID_DEG,
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL,
+    REVIEWS_JSON,
+    SUGGEST_MAX_LIMIT,
+    SUGGEST_POPULARITY_TTL,
+    SUGGEST_PRECOMPUTE_MATCHES,
+    TRENDING_POINTS_JSON,
+    VIEWPORT_CLUSTER_PX,
+    VIEWPORT_CLUSTER_ZOOM,
+    VIEWPORT_MAX_MARKERS,
+)
+
+Businesses = Union[list[dict], BusinessColumns]
+# plan_query output: (indices, scores, plan, matches), see plan_query
+Plan = tuple[Optional[Sequence[int]], Optional[list[float]], str, Optional[Sequence[int]]]
+
+FACET_FIELDS = ("category", "cuisine")
+
+
+def load_for_query(filepath: Optional[str] = None) -> Businesses:
+    """
+    Returns the businesses to run queries against: the shared memory-mapped columns of the default
+    business file, or the parsed JSON list when a custom file is requested or columns are disabled.
+
+    Args:
+        filepath (str, optional): Business file to read. Defaults to config BUSINESSES_JSON.
+
+    Returns:
+        Businesses: BusinessColumns or list[dict], both indexable by dataset position.
+    """
+    if filepath is None and COLUMNAR_BUSINESSES:
+        return columnar.load_columns()
+    return load_businesses(input_filepath=filepath)
+
+
+def _build_geo_columns(businesses: Businesses) -> GeoColumns:
+    if isinstance(businesses, BusinessColumns):
+        return GeoColumns.from_precomputed(
+            businesses.lat,
+            businesses.lon,
+            businesses.lat_rad,
+            businesses.lon_rad,
+            businesses.cos_lat,
+        )
+    return GeoColumns(businesses)
+
+
+def geo_columns(businesses: Businesses) -> GeoColumns:
+    """
+    Radian and cos(lat) coordinate columns for a business list, built once per dataset version.
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+
+    Returns:
+        GeoColumns: Precomputed coordinate columns, aligned with businesses.
+    """
+    return repo.derived(businesses, "geo_columns", _build_geo_columns)
+
+
+def spatial_grid(businesses: Businesses) -> SpatialGrid:
+    """
+    Spatial grid over a business list, built once per dataset version.
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+
+    Returns:
+        SpatialGrid: Grid index whose indices point into businesses.
+    """
+    return repo.derived(
+        businesses,
+        "spatial_grid",
+        lambda data: SpatialGrid.from_columns(geo_columns(data)),
+    )
+
 
+def id_index(businesses: Businesses) -> IdIndex:
+    """
+    Id -> position index shared by every lookup on this dataset version (see
+    ./backend/storage/id_index.py).
+    """
+    return repo.derived(businesses, "id_index", load_id_index)
 
-def search_by_id(businesses: list[dict], business_id: int) -> list:
+
+def search_by_id(businesses: Businesses, business_id: int) -> list:
     """
     Fetches a business given its ID and returns it.
 
     Args:
-        businesses (list[dict]): Businesses being searched through.
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
         business_id (int): Numerical identification of business.
 
     Raises:
@@ -26,12 +125,7 @@ def search_by_id(businesses: list[dict], business_id: int) -> list:
     Returns:
         list: Contains the dict containing business information (normally only one result).
     """
-    results = []
-    for business in businesses:
-        if business.get("id") == business_id:
-            results.append(business)
-        else:
-            continue
+    results = materialize(businesses, id_index(businesses).all_positions(business_id))
 
     if not results:
         raise ValueError(f"ERROR: Cannot find business id: {business_id}")
@@ -54,15 +148,78 @@ def search_by_name(businesses: list[dict], query: str) -> list[dict]:
     return search.search_by_text(businesses, query=query)
 
 
-def filter_by_category(businesses: list[dict], target_category: str) -> list[dict]:
+def rank_by_name(businesses: list[dict], query: str, limit: int) -> list[dict]:
     """
-    Filters through businesses by category using functions from ./backend/utils/search.py.
+    Ranked version of search_by_name: returns only the best matches, best first, each with its
+    fuzzy match "score" (0-100).
 
     Args:
-        businesses (dict): Businesses being searched through.
+        businesses (list[dict]): Businesses being searched through.
+        query (str): What the user is searching for.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list[dict]: Copies of the matching businesses with a "score" key added.
+    """
+    return [
+        {**business, "score": score}
+        for business, score in search.search_top_k(businesses, query, limit)
+    ]
+
+
+def filter_by_category(businesses: Businesses, target_category: str) -> list[dict]:
+    """
+    Filters through businesses by category using the category index from
+    ./backend/utils/search.py (built once per dataset version).
+
+    Args:
+        businesses (Businesses): Businesses being searched through.
         target_category (str): Category that is being searched for by the user, such as restaurant.
+
+    Raises:
+        ValueError: If no business has that category.
+    """
+    return _filter_by_indexed_field(businesses, "category", target_category)
+
+
+def filter_by_cuisine(businesses: Businesses, target_cuisine: str) -> list[dict]:
+    """
+    Filters through businesses by cuisine using the cuisine index.
+
+    Args:
+        businesses (Businesses): Businesses being searched through.
+        target_cuisine (str): Cuisine that is being searched for by the user, such as italian.
+
+    Raises:
+        ValueError: If no business has that cuisine.
+    """
+    return _filter_by_indexed_field(businesses, "cuisine", target_cuisine)
+
+
+def _filter_by_indexed_field(businesses: Businesses, field: str, value: str) -> list[dict]:
+    ids = search.field_index(businesses, field).lookup(value)
+    if len(ids) == 0:
+        raise ValueError(NO_CATEGORY_MATCH)
+    return materialize(businesses, ids)
+
+
+def facet_counts(
+    businesses: Businesses,
+    indices: Optional[Sequence[int]] = None,
+    fields: Sequence[str] = FACET_FIELDS,
+) -> dict[str, dict]:
+    """
+    Per-value counts of some fields over a result set, e.g. {"category": {"restaurant": 812, ...}}.
+
+    Args:
+        businesses (Businesses): Businesses the indices point into.
+        indices (Sequence[int], optional): Result set to count. Defaults to every business.
+        fields (Sequence[str], optional): Fields to count. Defaults to category and cuisine.
+
+    Returns:
+        dict[str, dict]: Field -> (value -> count), most common value first.
     """
-    return search.filter_by_field(businesses, "category", target_category)
+    return {field: search.field_index(businesses, field).counts(indices) for field in fields}
 
 
 def filter_by_min_rating(businesses: list[dict], min_rating: int) -> list[dict]:
@@ -80,16 +237,19 @@ def filter_by_min_rating(businesses: list[dict], min_rating: int) -> list[dict]:
 
 
 def filter_by_radius(
-    businesses: list[dict], radius: int, lat1: float, lon1: float
+    businesses: list[dict], radius: int, lat1: float, lon1: float, sort_by_distance: bool = False
 ) -> list[dict]:
     """
-    Filters by location through shops with a custom radius, given the user's location.
+    Filters by location through shops with a custom radius, given the user's location. Uses the
+    spatial grid built once per dataset version, so only businesses in nearby cells are measured.
 
     Args:
         businesses (list[dict]): Businesses being searched through.
         radius (int): Radius within which the user is searching.
         lat1 (float): User's latitude.
         lon1 (float): User's longitude.
+        sort_by_distance (bool, optional): Return the businesses closest first, each with its
+            "distance_km". Defaults to False (dataset order, unannotated).
 
     Raises:
         ValueError: If there were no businesses found in the given radius.
@@ -97,17 +257,677 @@ def filter_by_radius(
     Returns:
         list[dict]: Contains all businesses found in the given radius.
     """
-    results = []
+    idx, distances = spatial_grid(businesses).query_radius(lat1, lon1, radius)
+
+    if len(idx) == 0:
+        raise ValueError("ERROR: Could not find any businesses in the selected radius.")
+
+    if sort_by_distance:
+        order = np.lexsort((idx, distances))
+        return _with_distances([businesses[i] for i in idx[order].tolist()], distances[order])
+    return [businesses[i] for i in idx.tolist()]
+
+
+def nearest_businesses(businesses: Businesses, lat: float, lon: float, k: int) -> list[dict]:
+    """
+    Finds the k businesses closest to the user, using the spatial grid built once per dataset
+    version (see SpatialGrid.nearest).
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+        lat (float): User's latitude.
+        lon (float): User's longitude.
+        k (int): Number of businesses to return.
+
+    Returns:
+        list[dict]: Up to k businesses, closest first, each with its "distance_km".
+    """
+    idx, distances = spatial_grid(businesses).nearest(lat, lon, k)
+    return _with_distances(materialize(businesses, idx), distances)
+
+
+def positions_of_ids(businesses: Businesses, business_ids: Sequence) -> np.ndarray:
+    """
+    Looks up many business ids at once in the shared id index.
+
+    Args:
+        businesses (Businesses): Businesses to look in (list or compiled columns).
+        business_ids (Sequence): Ids to find (anything that is not an int is never found).
+
+    Returns:
+        np.ndarray: Index of each id's business (the first one, if ids repeat), or -1 where no
+            business has that id.
+    """
+    return id_index(businesses).positions(business_ids)
+
+
+def businesses_by_ids(businesses: Businesses, business_ids: Sequence) -> tuple[list[dict], list]:
+    """
+    Fetches several businesses by id in one call, in the order the ids are given.
+
+    Args:
+        businesses (Businesses): Businesses to look in (list or compiled columns).
+        business_ids (Sequence): Ids to fetch. Repeated ids return the business repeatedly.
+
+    Returns:
+        tuple[list[dict], list]: The businesses found, and the ids that matched no business.
+    """
+    positions = positions_of_ids(businesses, business_ids)
+    found = positions >= 0
+    missing = [business_id for business_id, ok in zip(business_ids, found.tolist()) if not ok]
+    return materialize(businesses, positions[found]), missing
+
+
+def business_popularity(businesses: Businesses) -> np.ndarray:
+    """
+    Static popularity signal per business: its number of reviews plus its number of trending
+    receipts.
+
+    Args:
+        businesses (Businesses): Businesses to score (list or compiled columns).
+
+    Returns:
+        np.ndarray: Popularity per business, aligned with businesses.
+    """
+    popularity = np.zeros(len(businesses), dtype=np.float64)
+
+    def add(business_ids: list, weights: Optional[list] = None) -> None:
+        if not business_ids:
+            return
+        positions = positions_of_ids(businesses, business_ids)
+        found = positions >= 0
+        amounts = 1.0 if weights is None else np.asarray(weights, dtype=np.float64)[found]
+        np.add.at(popularity, positions[found], amounts)
+
+    add([review.get("businessID") for review in repo.load(REVIEWS_JSON, default=[])])
+    trending = repo.load(TRENDING_POINTS_JSON, default=[])
+    add([t.get("businessId") for t in trending], [t.get("receiptCount") or 0 for t in trending])
+    return popularity
+
+
+def _prefix_index(businesses: Businesses) -> search.PrefixIndex:
+    return search.prefix_index(businesses, SUGGEST_PRECOMPUTE_MATCHES)
+
+
+_suggest_lock = threading.Lock()
+_suggest_state: dict = {}
+
+
+def _suggest_tables(businesses: Businesses) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    Popularity and precomputed suggestions for busy prefixes, recounted at most every
+    SUGGEST_POPULARITY_TTL seconds (reviews change far more often than rankings need to).
+    """
+    with _suggest_lock:
+        state = dict(_suggest_state)
+    if state.get("businesses") is businesses and time.monotonic() - state["built_at"] < SUGGEST_POPULARITY_TTL:
+        return state["popularity"], state["tops"]
+
+    popularity = business_popularity(businesses)
+    tops = _prefix_index(businesses).busy_prefix_tops(popularity, SUGGEST_MAX_LIMIT)
+    with _suggest_lock:
+        _suggest_state.update(
+            businesses=businesses, built_at=time.monotonic(), popularity=popularity, tops=tops
+        )
+    return popularity, tops
+
+
+def suggest_businesses(businesses: Businesses, query: str, limit: int = 8) -> list[dict]:
+    """
+    Search-as-you-type: businesses whose name, or a word in their name, starts with the query,
+    most popular first (see business_popularity).
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+        query (str): What the user has typed so far.
+        limit (int, optional): Maximum number of suggestions (capped at SUGGEST_MAX_LIMIT).
+            Defaults to 8.
+
+    Returns:
+        list[dict]: Up to limit {"id", "name"} suggestions.
+    """
+    prefix = normalize_name(query)
+    limit = min(limit, SUGGEST_MAX_LIMIT)
+    if not prefix or limit <= 0:
+        return []
 
-    for business in businesses:
-        lat2 = business["latitude"]
-        lon2 = business["longitude"]
-        if Haversine(lat1, lon1, lat2, lon2).final_distance() < radius:
-            results.append(business)
+    popularity, tops = _suggest_tables(businesses)
+    if prefix in tops:
+        idx = tops[prefix][:limit]
+    else:
+        idx = _prefix_index(businesses).top(prefix, popularity, limit)
+
+    ids = id_index(businesses).ids
+    if isinstance(businesses, BusinessColumns):
+        names = [businesses.name(i) for i in idx.tolist()]
+    else:
+        names = [businesses[i].get("name") for i in idx.tolist()]
+    return [{"id": int(ids[i]), "name": name} for i, name in zip(idx.tolist(), names)]
+
+
+def viewport_businesses(
+    businesses: Businesses,
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    zoom: int,
+    category: Optional[str] = None,
+) -> tuple[str, list[dict], int]:
+    """
+    Finds what the map should draw for its current view. Zoomed in (VIEWPORT_CLUSTER_ZOOM or
+    more) with at most VIEWPORT_MAX_MARKERS businesses in view, that is the businesses themselves;
+    otherwise they are grouped into clusters about VIEWPORT_CLUSTER_PX pixels wide at that zoom.
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+        min_lat (float): Southern edge of the view.
+        min_lon (float): Western edge of the view (greater than max_lon across the antimeridian).
+        max_lat (float): Northern edge of the view.
+        max_lon (float): Eastern edge of the view.
+        zoom (int): Map zoom level (0 shows the whole world).
+        category (str, optional): Exact category.
+
+    Returns:
+        tuple[str, list[dict], int]: "businesses" or "clusters", the items to draw, and the number
+            of businesses in view.
+    """
+    idx = spatial_grid(businesses).query_bbox(min_lat, min_lon, max_lat, max_lon)
+    if category:
+        idx = np.intersect1d(
+            idx, search.field_index(businesses, "category").lookup(category), assume_unique=True
+        )
+
+    if zoom >= VIEWPORT_CLUSTER_ZOOM and len(idx) <= VIEWPORT_MAX_MARKERS:
+        return "businesses", materialize(businesses, idx), len(idx)
+
+    # Width of one 256 px map tile in degrees of longitude, scaled to the cluster size
+    cell_deg = 360 / 2**zoom * VIEWPORT_CLUSTER_PX / 256
+    return "clusters", cluster_points(geo_columns(businesses), idx, cell_deg), len(idx)
+
+
+def closest_first(
+    businesses: Businesses, indices: Sequence[int], lat: float, lon: float, count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Orders matches by distance from a point, but only as far as needed: the `count` closest are
+    picked out with a partial sort (argpartition) and only those are fully sorted.
+
+    Args:
+        businesses (Businesses): Businesses the indices point into.
+        indices (Sequence[int]): Matches to order.
+        lat (float): User's latitude.
+        lon (float): User's longitude.
+        count (int): How many of the closest matches are needed, in order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (at most) count closest indices, closest first (ties
+            broken by index, missing coordinates last), and their distances in km.
+    """
+    idx = np.asarray(indices, dtype=np.int64)
+    distances = geo_columns(businesses).distances(lat, lon, idx)
+
+    if 0 < count < len(idx):
+        kth = np.partition(distances, count - 1)[count - 1]
+        # Keep ties with the count-th distance too, so the tie-break below decides who stays
+        head = np.flatnonzero(distances <= kth) if not np.isnan(kth) else np.arange(len(idx))
+        idx, distances = idx[head], distances[head]
+    elif count <= 0:
+        return idx[:0], distances[:0]
+
+    order = np.lexsort((idx, distances))[:count]  # NaN sorts last
+    return idx[order], distances[order]
+
+
+def _with_distances(results: list[dict], distances: Sequence[float]) -> list[dict]:
+    return [
+        {**business, "distance_km": None if math.isnan(d) else round(float(d), 3)}
+        for business, d in zip(results, distances)
+    ]
+
+
+NO_CATEGORY_MATCH = "ERROR: Field and/or value does not exist."
+NO_RADIUS_MATCH = "ERROR: Could not find any businesses in the selected radius."
+NO_SEARCH_MATCH = "ERROR: Query did not match any businesses."
+
+
+def plan_query(
+    businesses: Businesses,
+    search_query: Optional[str] = None,
+    category: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius: Optional[float] = None,
+    ranked_limit: Optional[int] = None,
+    cuisine: Optional[str] = None,
+) -> Plan:
+    """
+    Applies every requested filter together, cheapest first, and returns the positions of the
+    matching businesses without building any result dicts. Category and rating are answered from
+    precomputed indexes and intersected, the radius check then runs on the survivors (through the
+    spatial grid or a vectorized scan, whichever touches fewer businesses), and fuzzy name scoring
+    runs last on whatever is left.
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+        search_query (str, optional): Fuzzy name query.
+        category (str, optional): Exact category.
+        min_rating (float, optional): Minimum rating.
+        lat (float, optional): User's latitude (radius filter needs lat, lon and radius).
+        lon (float, optional): User's longitude.
+        radius (float, optional): Radius in km.
+        ranked_limit (int, optional): If given with search_query, return only this many matches,
+            best first, each with a "score" (see rank_by_name).
+        cuisine (str, optional): Exact cuisine.
+
+    Raises:
+        ValueError: If the category, radius or name filter leaves nothing.
+
+    Returns:
+        Plan: Indices of the matching businesses (dataset order unless ranked; None means every
+            business), their scores when ranked, a short description of the plan that was run,
+            e.g. "category(812)>geo:scan(41)>fuzzy(3)", and every match in dataset order (the
+            same as the indices unless ranked, when the indices are only the ranked_limit best).
+            Totals and facet counts come from the matches.
+    """
+    candidates, plan = _filter_candidates(
+        businesses, category, cuisine, min_rating, lat, lon, radius, search_query
+    )
+    return _match_names(businesses, candidates, plan, search_query, ranked_limit)
+
+
+def _filter_candidates(
+    businesses: Businesses,
+    category: Optional[str],
+    cuisine: Optional[str],
+    min_rating: Optional[float],
+    lat: Optional[float],
+    lon: Optional[float],
+    radius: Optional[float],
+    search_query: Optional[str] = None,
+) -> tuple[Optional[np.ndarray], list[str]]:
+    """
+    Index and radius stage of plan_query: sorted candidate indices (None means every business) and
+    the plan steps so far. search_query only decides which error an empty rating filter raises.
+    """
+    candidates: Optional[np.ndarray] = None  # Sorted indices; None means every business
+    plan = []
+
+    index_filters = []
+    if category:
+        ids = search.field_index(businesses, "category").lookup(category)
+        index_filters.append(("category", ids))
+    if cuisine:
+        ids = search.field_index(businesses, "cuisine").lookup(cuisine)
+        index_filters.append(("cuisine", ids))
+    if min_rating:
+        ids = search.rating_index(businesses).at_least(min_rating)
+        index_filters.append(("rating", ids))
+
+    # Most selective index first, so each intersection is as small as possible
+    for name, ids in sorted(index_filters, key=lambda f: len(f[1])):
+        candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+        plan.append(f"{name}({len(candidates)})")
+
+        if len(candidates) == 0:
+            if name in ("category", "cuisine"):
+                raise ValueError(NO_CATEGORY_MATCH)
+            if search_query:
+                raise ValueError(NO_SEARCH_MATCH)
+            return candidates, plan
+
+    if lat is not None and lon is not None and radius:
+        grid = spatial_grid(businesses)
+        grid_cost = sum(len(grid.cells[key]) for key in grid.candidate_cells(lat, lon, radius))
+
+        if candidates is None or grid_cost <= len(candidates):
+            idx, _ = grid.query_radius(lat, lon, radius)
+            if candidates is not None:
+                idx = np.intersect1d(idx, candidates, assume_unique=True)
+            plan.append(f"geo:grid({len(idx)})")
         else:
-            continue
+            distances = geo_columns(businesses).distances(lat, lon, candidates)
+            idx = candidates[distances < radius]
+            plan.append(f"geo:scan({len(idx)})")
 
-    if not results:
-        raise ValueError("ERROR: Could not find any businesses in the selected radius.")
+        candidates = idx
+        if len(candidates) == 0:
+            raise ValueError(NO_RADIUS_MATCH)
 
-    return results
+    return candidates, plan
+
+
+def _match_names(
+    businesses: Businesses,
+    candidates: Optional[np.ndarray],
+    plan: list[str],
+    search_query: Optional[str],
+    ranked_limit: Optional[int],
+) -> Plan:
+    """
+    Fuzzy name stage of plan_query, run on the candidates left by _filter_candidates.
+    """
+    if search_query:
+        if ranked_limit is not None:
+            # Only ranked_limit matches are ranked, but every match is kept for totals and facets
+            ranked, matches = search.rank_matches(
+                businesses, search_query, ranked_limit, within=candidates
+            )
+            indices = [idx for idx, _ in ranked]
+            scores = [score for _, score in ranked]
+        else:
+            matches = search.match_indices(businesses, search_query, within=candidates)
+            indices, scores = matches, None
+
+        plan = plan + [f"fuzzy({len(matches)})"]
+        if not matches:
+            raise ValueError(NO_SEARCH_MATCH)
+        return indices, scores, ">".join(plan), matches
+
+    if candidates is None:
+        return None, None, "all", None
+    return candidates, None, ">".join(plan), candidates
+
+
+query_cache_stats = CacheStats()  # Shared by every dataset version's cache, so rates survive reloads
+
+
+def query_cache(businesses: Businesses) -> LRUCache:
+    """
+    Query result cache for a business list, created once per dataset version and therefore
+    dropped as soon as the dataset changes.
+    """
+    return repo.derived(
+        businesses,
+        "query_cache",
+        lambda _: LRUCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL, stats=query_cache_stats),
+    )
+
+
+def _snap_slack_km(snap_lat: float, snap_lon: float, grid_deg: float) -> float:
+    """
+    Farthest a point that snaps to (snap_lat, snap_lon) can be from it: the distance to the cell
+    corner on the side nearer the equator, where a degree of longitude is longest.
+    """
+    corners = [
+        haversine_km(snap_lat, snap_lon, max(min(snap_lat + dlat, 90), -90), snap_lon + grid_deg / 2)
+        for dlat in (grid_deg / 2, -grid_deg / 2)
+    ]
+    return max(corners) * 1.001 + 1e-6  # Margin for float error
+
+
+def cached_plan_query(
+    businesses: Businesses,
+    search_query: Optional[str] = None,
+    category: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius: Optional[float] = None,
+    ranked_limit: Optional[int] = None,
+    cuisine: Optional[str] = None,
+    grid_deg: float = QUERY_CACHE_GRID_DEG,
+) -> Plan:
+    """
+    plan_query behind the per-dataset LRU+TTL cache, with identical results (including errors).
+
+    Queries without a location are cached whole. For located queries, lat/lon are snapped to a
+    grid_deg grid, and what is cached is the index and radius stage for the snapped point with
+    the radius widened by the largest possible snapping error. That candidate list therefore
+    contains every business the exact query can match. On every request the exact radius is
+    re-applied to it, and fuzzy name matching runs on the survivors. Nearby users with the same
+    filters share one entry.
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+        grid_deg (float, optional): Snapping grid in degrees. Defaults to config
+            QUERY_CACHE_GRID_DEG.
+        Remaining arguments: See plan_query.
+
+    Raises:
+        ValueError: As plan_query.
+
+    Returns:
+        Plan: As plan_query. The plan starts
+            with "cache:hit" or "cache:miss".
+    """
+    cache = query_cache(businesses)
+    filters = (category or None, cuisine or None, float(min_rating) if min_rating else None)
+
+    if lat is None or lon is None or not radius:
+        key = (
+            "all", search.NAME_MATCH_VERSION, search_query or None,
+            ranked_limit if search_query else None,
+        ) + filters
+        outcome = cache.get(key)
+        hit = outcome is not MISSING
+        if not hit:
+            outcome = _outcome(
+                plan_query,
+                businesses, search_query, category, min_rating, lat, lon, radius, ranked_limit, cuisine,
+            )
+            cache.put(key, outcome)
+        indices, scores, plan, matches = _unwrap(outcome)
+        return indices, scores, f"cache:{'hit' if hit else 'miss'}>{plan}", matches
+
+    snap_lat = round(lat / grid_deg) * grid_deg
+    snap_lon = round(lon / grid_deg) * grid_deg
+    key = ("geo", grid_deg, round(snap_lat, 9), round(snap_lon, 9), float(radius)) + filters
+    outcome = cache.get(key)
+    hit = outcome is not MISSING
+    if not hit:
+        wide_radius = radius + _snap_slack_km(snap_lat, snap_lon, grid_deg)
+        outcome = _outcome(
+            _filter_candidates,
+            businesses, category, cuisine, min_rating, snap_lat, snap_lon, wide_radius,
+        )
+        cache.put(key, outcome)
+    candidates, plan = _unwrap(outcome)
+
+    plan = [f"cache:{'hit' if hit else 'miss'}"] + plan
+    if len(candidates) > 0:
+        distances = geo_columns(businesses).distances(lat, lon, candidates)
+        candidates = candidates[distances < radius]
+        plan.append(f"geo:exact({len(candidates)})")
+        if len(candidates) == 0:
+            raise ValueError(NO_RADIUS_MATCH)
+    return _match_names(businesses, candidates, plan, search_query, ranked_limit)
+
+
+def _outcome(func, *args) -> tuple:
+    # Errors are cached too: an empty category or radius stays empty until the dataset changes
+    try:
+        return ("ok", func(*args))
+    except ValueError as e:
+        return ("error", str(e))
+
+
+def _unwrap(outcome: tuple):
+    kind, value = outcome
+    if kind == "error":
+        raise ValueError(value)
+    return value
+
+
+def _with_scores(results: list[dict], scores: Optional[list[float]]) -> list[dict]:
+    if scores is None:
+        return results
+    return [{**business, "score": score} for business, score in zip(results, scores)]
+
+
+def query_businesses(
+    businesses: Businesses,
+    search_query: Optional[str] = None,
+    category: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius: Optional[float] = None,
+    ranked_limit: Optional[int] = None,
+    cuisine: Optional[str] = None,
+) -> tuple[list[dict], str]:
+    """
+    Runs plan_query and returns every matching business as a dict. Ranked results carry a "score"
+    (see rank_by_name).
+
+    Raises:
+        ValueError: If the category, radius or name filter leaves nothing.
+
+    Returns:
+        tuple[list[dict], str]: Matching businesses and the plan that was run.
+    """
+    indices, scores, plan, _ = plan_query(
+        businesses, search_query, category, min_rating, lat, lon, radius, ranked_limit, cuisine
+    )
+    if indices is None:
+        if isinstance(businesses, BusinessColumns):
+            return materialize(businesses, range(len(businesses))), plan
+        return businesses, plan
+    return _with_scores(materialize(businesses, indices), scores), plan
+
+
+def query_page(
+    businesses: Businesses,
+    offset: int,
+    limit: int,
+    search_query: Optional[str] = None,
+    category: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius: Optional[float] = None,
+    ranked_limit: Optional[int] = None,
+    cuisine: Optional[str] = None,
+    facet_fields: Sequence[str] = (),
+    sort_by_distance: bool = False,
+    use_cache: bool = False,
+) -> tuple[list[dict], int, str, dict[str, dict]]:
+    """
+    Runs plan_query and turns only the requested page of matches back into dicts. When lat and
+    lon are given, every returned business carries its "distance_km".
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+        offset (int): Index of the first match to return.
+        limit (int): Maximum number of matches to return.
+        facet_fields (Sequence[str], optional): Fields to count over all matches (see
+            facet_counts). Defaults to none.
+        sort_by_distance (bool, optional): Return matches closest to lat/lon first (overrides
+            ranked_limit). Only the first offset + limit are sorted. Defaults to False.
+        use_cache (bool, optional): Go through cached_plan_query. Defaults to False.
+        Remaining arguments: See plan_query.
+
+    Raises:
+        ValueError: If the category, cuisine, radius or name filter leaves nothing.
+
+    Returns:
+        tuple[list[dict], int, str, dict[str, dict]]: The page of businesses, the total number of
+            matches, the plan that was run and the facet counts (empty if none were asked for).
+    """
+    located = lat is not None and lon is not None
+    sort_by_distance = sort_by_distance and located
+    if sort_by_distance:
+        ranked_limit = None
+
+    planner = cached_plan_query if use_cache else plan_query
+    indices, scores, plan, matches = planner(
+        businesses, search_query, category, min_rating, lat, lon, radius, ranked_limit, cuisine
+    )
+    # Totals and facets describe every match, also when only the best few were ranked
+    facets = facet_counts(businesses, matches, facet_fields) if facet_fields else {}
+    if indices is None:
+        indices = range(len(businesses))
+    total = len(matches) if matches is not None else len(businesses)
+
+    page = slice(offset, offset + limit)
+    if sort_by_distance:
+        ordered, distances = closest_first(businesses, indices, lat, lon, offset + limit)
+        page_idx, page_distances = ordered[page], distances[page]
+        plan = ">".join(filter(None, [plan, f"sort:distance({len(ordered)})"]))
+    else:
+        page_idx = indices[page]
+        if located:
+            page_distances = geo_columns(businesses).distances(
+                lat, lon, np.asarray(page_idx, dtype=np.int64)
+            )
+
+    results = _with_scores(
+        materialize(businesses, page_idx), scores[page] if scores is not None else None
+    )
+    if located:
+        results = _with_distances(results, page_distances)
+    return results, total, plan, facets
+
+
+def query_cursor_page(
+    businesses: Businesses,
+    version: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    search_query: Optional[str] = None,
+    category: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius: Optional[float] = None,
+    cuisine: Optional[str] = None,
+    sort: Optional[str] = None,
+    source: Optional[str] = None,
+) -> tuple[list[dict], int, Optional[str]]:
+    """
+    Cursor-paginated query_page. The first page runs the query once and keeps every match, in
+    order, as an index array (see ./backend/utils/pagination.py). Each later page only slices
+    that array and decodes limit businesses, however deep the page.
+
+    Relevance and distance orders are therefore computed over all matches instead of just the
+    first offset + limit. When resuming, the filters stored in the cursor apply, not the
+    arguments.
+
+    Args:
+        businesses (Businesses): Businesses being searched through (list or compiled columns).
+        version (str): Version token of the dataset (see pagination.version_token).
+        limit (int): Page size.
+        cursor (str, optional): Cursor from the previous page. Defaults to the first page.
+        sort (str, optional): "relevance" (needs search_query) or "distance" (needs lat/lon).
+        source (str, optional): Custom business file, kept in the cursor so it cannot be resumed
+            against another file.
+        Remaining arguments: See plan_query.
+
+    Raises:
+        ValueError: If the cursor is invalid or expired (see pagination), or as query_page.
+
+    Returns:
+        tuple[list[dict], int, Optional[str]]: The page of businesses, the total number of
+            matches and the cursor for the next page (None on the last page).
+    """
+    query = None
+    if not cursor:
+        query = [search_query, category, cuisine, min_rating, lat, lon, radius, sort, source]
+
+    def build(q: list) -> tuple[Businesses, np.ndarray, Optional[list[float]]]:
+        search_query, category, cuisine, min_rating, lat, lon, radius, sort, _ = q
+        indices, scores, _, _ = cached_plan_query(
+            businesses, search_query, category, min_rating, lat, lon, radius,
+            len(businesses) if sort == "relevance" else None, cuisine,
+        )
+        if indices is None:
+            indices = np.arange(len(businesses), dtype=np.int64)
+        if sort == "distance" and lat is not None and lon is not None:
+            indices, _ = closest_first(businesses, indices, lat, lon, len(indices))
+            scores = None
+        # The business list is kept with its matches so every page reads the same dataset version
+        return businesses, np.asarray(indices, dtype=np.int64), scores
+
+    (snapshot, indices, scores), page, next_cursor, query = pagination.paginate(
+        "businesses", version, query, build, cursor, limit, size=lambda r: len(r[1])
+    )
+    _, _, _, _, lat, lon, _, _, _ = query
+
+    page_idx = indices[page]
+    results = _with_scores(
+        materialize(snapshot, page_idx), scores[page] if scores is not None else None
+    )
+    if lat is not None and lon is not None:
+        results = _with_distances(results, geo_columns(snapshot).distances(lat, lon, page_idx))
+    return results, len(indices), next_cursor
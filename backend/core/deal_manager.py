@@ -13,26 +13,27 @@ from typing import Optional
 import requests
 from bs4 import BeautifulSoup
 
+import backend.storage.repository as repo
+import backend.utils.pagination as pagination
+from backend.storage.locks import locked
 from config.config import DEALS_JSON
 
+SAVED_DEALS_JSON = str(DEALS_JSON).replace("deals.json", "saved_deals.json")
 
-def _load_deals() -> list[dict]:
-    try:
-        with open(str(DEALS_JSON), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+
+def _load_deals(for_update: bool = False) -> list[dict]:
+    return repo.load(DEALS_JSON, default=[], for_update=for_update)
 
 
 def _save_deals(deals: list[dict]) -> None:
-    with open(str(DEALS_JSON), "w") as f:
-        json.dump(deals, f, indent=4)
+    repo.save(DEALS_JSON, deals, indent=4)
 
 
 def _generate_deal_id() -> int:
     return random.randint(10000000, 99999999)
 
 
+@locked(DEALS_JSON)
 def create_deal(
     business_id: int,
     title: str,
@@ -44,7 +45,7 @@ def create_deal(
     source: str = "manual",
     source_url: Optional[str] = None,
 ) -> dict:
-    deals = _load_deals()
+    deals = _load_deals(for_update=True)
 
     deal = {
         "dealId": _generate_deal_id(),
@@ -87,6 +88,29 @@ def get_deals(
     return deals
 
 
+def get_deals_page(
+    limit: int,
+    cursor: Optional[str] = None,
+    business_id: Optional[int] = None,
+    category: Optional[str] = None,
+    active_only: bool = True,
+) -> tuple[list[dict], int, Optional[str]]:
+    """
+    One page of get_deals, for cursor pagination (see ./backend/utils/pagination.py). Returns the
+    page, the total number of deals and the cursor for the next page.
+    """
+    version = pagination.version_token(repo.signature(DEALS_JSON))
+    deals, page, next_cursor, _ = pagination.paginate(
+        "deals",
+        version,
+        [business_id, category, active_only],
+        lambda q: get_deals(business_id=q[0], category=q[1], active_only=q[2]),
+        cursor,
+        limit,
+    )
+    return deals[page], len(deals), next_cursor
+
+
 def get_deal_by_id(deal_id: int) -> Optional[dict]:
     deals = _load_deals()
     for deal in deals:
@@ -95,8 +119,9 @@ def get_deal_by_id(deal_id: int) -> Optional[dict]:
     return None
 
 
+@locked(DEALS_JSON)
 def delete_deal(deal_id: int) -> bool:
-    deals = _load_deals()
+    deals = _load_deals(for_update=True)
     for i, deal in enumerate(deals):
         if deal["dealId"] == deal_id:
             deals.pop(i)
@@ -105,6 +130,7 @@ def delete_deal(deal_id: int) -> bool:
     return False
 
 
+@locked(DEALS_JSON)
 def cleanup_expired_deals() -> int:
     deals = _load_deals()
     now = datetime.utcnow().isoformat()
@@ -119,6 +145,7 @@ def cleanup_expired_deals() -> int:
     return original_count - len(deals)
 
 
+@locked(SAVED_DEALS_JSON)
 def save_deal_for_user(user_id: int, deal_id: int) -> dict:
     deals = _load_deals()
     deal = None
@@ -130,12 +157,7 @@ def save_deal_for_user(user_id: int, deal_id: int) -> dict:
     if deal is None:
         return {"status": "error", "message": "Deal not found"}
 
-    saved_deals_path = str(DEALS_JSON).replace("deals.json", "saved_deals.json")
-    try:
-        with open(saved_deals_path, "r") as f:
-            saved = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        saved = []
+    saved = repo.load(SAVED_DEALS_JSON, default=[], for_update=True)
 
     for s in saved:
         if s["userId"] == user_id and s["dealId"] == deal_id:
@@ -148,25 +170,22 @@ def save_deal_for_user(user_id: int, deal_id: int) -> dict:
         "savedAt": datetime.utcnow().isoformat(),
     })
 
-    with open(saved_deals_path, "w") as f:
-        json.dump(saved, f, indent=4)
+    repo.save(SAVED_DEALS_JSON, saved, indent=4)
 
     return {"status": "success"}
 
 
+@locked(SAVED_DEALS_JSON)
 def unsave_deal_for_user(user_id: int, deal_id: int) -> dict:
-    saved_deals_path = str(DEALS_JSON).replace("deals.json", "saved_deals.json")
     try:
-        with open(saved_deals_path, "r") as f:
-            saved = json.load(f)
+        saved = repo.load(SAVED_DEALS_JSON, for_update=True)
     except (FileNotFoundError, json.JSONDecodeError):
         return {"status": "error", "message": "No saved deals found"}
 
     for i, s in enumerate(saved):
         if s["userId"] == user_id and s["dealId"] == deal_id:
             saved.pop(i)
-            with open(saved_deals_path, "w") as f:
-                json.dump(saved, f, indent=4)
+            repo.save(SAVED_DEALS_JSON, saved, indent=4)
             return {"status": "success"}
 
     return {"status": "error", "message": "Saved deal not found"}
@@ -4,44 +4,36 @@
 Manages friend relationships and social features.
 """
 
-import json
 import random
 from datetime import datetime
 from typing import Optional
 
+import backend.storage.repository as repo
+from backend.storage.locks import locked
 from config.config import FRIENDS_JSON, FRIEND_REQUESTS_JSON, REVIEWS_JSON
 
 
-def _load_friends() -> list[dict]:
-    try:
-        with open(str(FRIENDS_JSON), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def _load_friends(for_update: bool = False) -> list[dict]:
+    return repo.load(FRIENDS_JSON, default=[], for_update=for_update)
 
 
 def _save_friends(friends: list[dict]) -> None:
-    with open(str(FRIENDS_JSON), "w") as f:
-        json.dump(friends, f, indent=4)
+    repo.save(FRIENDS_JSON, friends, indent=4)
 
 
-def _load_requests() -> list[dict]:
-    try:
-        with open(str(FRIEND_REQUESTS_JSON), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def _load_requests(for_update: bool = False) -> list[dict]:
+    return repo.load(FRIEND_REQUESTS_JSON, default=[], for_update=for_update)
 
 
 def _save_requests(requests: list[dict]) -> None:
-    with open(str(FRIEND_REQUESTS_JSON), "w") as f:
-        json.dump(requests, f, indent=4)
+    repo.save(FRIEND_REQUESTS_JSON, requests, indent=4)
 
 
 def _generate_id() -> int:
     return random.randint(10000000, 99999999)
 
 
+@locked(FRIEND_REQUESTS_JSON)
 def send_friend_request(from_user_id: int, to_user_id: int) -> dict:
     if from_user_id == to_user_id:
         return {"status": "error", "message": "Cannot send request to yourself"}
@@ -54,7 +46,7 @@ def send_friend_request(from_user_id: int, to_user_id: int) -> dict:
             return {"status": "error", "message": "Already friends"}
 
     # Check for existing pending request
-    requests = _load_requests()
+    requests = _load_requests(for_update=True)
     for r in requests:
         if r["status"] == "pending":
             if r["fromUserId"] == from_user_id and r["toUserId"] == to_user_id:
@@ -75,8 +67,9 @@ def send_friend_request(from_user_id: int, to_user_id: int) -> dict:
     return {"status": "success", "request": request}
 
 
+@locked(FRIEND_REQUESTS_JSON, FRIENDS_JSON)
 def accept_request(request_id: int, user_id: int) -> dict:
-    requests = _load_requests()
+    requests = _load_requests(for_update=True)
 
     for r in requests:
         if r["requestId"] == request_id:
@@ -89,7 +82,7 @@ def accept_request(request_id: int, user_id: int) -> dict:
             _save_requests(requests)
 
             # Create friendship
-            friends = _load_friends()
+            friends = _load_friends(for_update=True)
             friendship = {
                 "friendshipId": _generate_id(),
                 "user1Id": r["fromUserId"],
@@ -104,8 +97,9 @@ def accept_request(request_id: int, user_id: int) -> dict:
     return {"status": "error", "message": "Request not found"}
 
 
+@locked(FRIEND_REQUESTS_JSON)
 def reject_request(request_id: int, user_id: int) -> dict:
-    requests = _load_requests()
+    requests = _load_requests(for_update=True)
 
     for r in requests:
         if r["requestId"] == request_id:
@@ -123,12 +117,12 @@ def reject_request(request_id: int, user_id: int) -> dict:
 
 def get_pending_requests(user_id: int) -> list[dict]:
     requests = _load_requests()
-    return [r for r in requests if r["toUserId"] == user_id and r["status"] == "pending"]
+    return [dict(r) for r in requests if r["toUserId"] == user_id and r["status"] == "pending"]
 
 
 def get_sent_requests(user_id: int) -> list[dict]:
     requests = _load_requests()
-    return [r for r in requests if r["fromUserId"] == user_id and r["status"] == "pending"]
+    return [dict(r) for r in requests if r["fromUserId"] == user_id and r["status"] == "pending"]
 
 
 def get_friends(user_id: int) -> list[dict]:
@@ -142,8 +136,9 @@ def get_friends(user_id: int) -> list[dict]:
     return result
 
 
+@locked(FRIENDS_JSON)
 def remove_friend(friendship_id: int, user_id: int) -> dict:
-    friends = _load_friends()
+    friends = _load_friends(for_update=True)
     for i, f in enumerate(friends):
         if f["friendshipId"] == friendship_id:
             if f["user1Id"] != user_id and f["user2Id"] != user_id:
@@ -162,11 +157,7 @@ def get_friend_activity(user_id: int, limit: int = 20) -> list[dict]:
     if not friend_ids:
         return []
 
-    try:
-        with open(str(REVIEWS_JSON), "r") as f:
-            reviews = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    reviews = repo.load(REVIEWS_JSON, default=[])
 
     friend_reviews = [r for r in reviews if r.get("userId") in friend_ids]
     friend_reviews.sort(key=lambda r: r.get("createdAt", ""), reverse=True)
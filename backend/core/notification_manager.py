@@ -4,25 +4,26 @@
 Manages in-app notifications.
 """
 
-import json
 import random
 from datetime import datetime
 from typing import Optional
 
+import backend.storage.repository as repo
+import backend.utils.pagination as pagination
+from backend.storage.locks import locked
 from config.config import NOTIFICATIONS_JSON
 
 
-def _load_notifications() -> list[dict]:
-    try:
-        with open(str(NOTIFICATIONS_JSON), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def _load_notifications(for_update: bool = False) -> list[dict]:
+    return repo.load(NOTIFICATIONS_JSON, default=[], for_update=for_update)
 
 
 def _save_notifications(notifications: list[dict]) -> None:
-    with open(str(NOTIFICATIONS_JSON), "w") as f:
-        json.dump(notifications, f, indent=4)
+    repo.save(NOTIFICATIONS_JSON, notifications, indent=4)
+
+
+def _append_notification(notification: dict) -> None:
+    repo.append(NOTIFICATIONS_JSON, [notification], indent=4)
 
 
 def _generate_id() -> int:
@@ -36,8 +37,6 @@ def create_notification(
     message: str,
     related_id: Optional[int] = None,
 ) -> dict:
-    notifications = _load_notifications()
-
     notif = {
         "notificationId": _generate_id(),
         "userId": user_id,
@@ -49,22 +48,39 @@ def create_notification(
         "createdAt": datetime.utcnow().isoformat(),
     }
 
-    notifications.append(notif)
-    _save_notifications(notifications)
+    _append_notification(notif)
     return notif
 
 
 def get_user_notifications(user_id: int, unread_only: bool = False) -> list[dict]:
-    notifications = _load_notifications()
-    result = [n for n in notifications if n["userId"] == user_id]
+    result = repo.find(NOTIFICATIONS_JSON, "userId", user_id)
     if unread_only:
         result = [n for n in result if not n.get("read", False)]
-    result.sort(key=lambda n: n["createdAt"], reverse=True)
-    return result
-
-
+    return sorted(result, key=lambda n: n["createdAt"], reverse=True)
+
+
+def get_user_notifications_page(
+    user_id: int, limit: int, cursor: Optional[str] = None, unread_only: bool = False
+) -> tuple[list[dict], int, Optional[str]]:
+    """
+    One page of get_user_notifications, for cursor pagination (see ./backend/utils/pagination.py).
+    Returns the page, the total number of notifications and the cursor for the next page.
+    """
+    version = pagination.version_token(repo.signature(NOTIFICATIONS_JSON))
+    notifications, page, next_cursor, _ = pagination.paginate(
+        "notifications",
+        version,
+        [user_id, unread_only],
+        lambda q: get_user_notifications(q[0], unread_only=q[1]),
+        cursor,
+        limit,
+    )
+    return notifications[page], len(notifications), next_cursor
+
+
+@locked(NOTIFICATIONS_JSON)
 def mark_as_read(notification_id: int) -> dict:
-    notifications = _load_notifications()
+    notifications = _load_notifications(for_update=True)
     for n in notifications:
         if n["notificationId"] == notification_id:
             n["read"] = True
@@ -73,8 +89,9 @@ def mark_as_read(notification_id: int) -> dict:
     return {"status": "error", "message": "Notification not found"}
 
 
+@locked(NOTIFICATIONS_JSON)
 def mark_all_read(user_id: int) -> dict:
-    notifications = _load_notifications()
+    notifications = _load_notifications(for_update=True)
     changed = False
     for n in notifications:
         if n["userId"] == user_id and not n.get("read", False):
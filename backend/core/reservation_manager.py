@@ -4,31 +4,28 @@
 Manages reservations for businesses.
 """
 
-import json
 import random
 from datetime import datetime, timedelta
 from typing import Optional
 
+import backend.storage.repository as repo
+from backend.storage.locks import locked
 from config.config import RESERVATIONS_JSON
 
 
-def _load_reservations() -> list[dict]:
-    try:
-        with open(str(RESERVATIONS_JSON), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def _load_reservations(for_update: bool = False) -> list[dict]:
+    return repo.load(RESERVATIONS_JSON, default=[], for_update=for_update)
 
 
 def _save_reservations(reservations: list[dict]) -> None:
-    with open(str(RESERVATIONS_JSON), "w") as f:
-        json.dump(reservations, f, indent=4)
+    repo.save(RESERVATIONS_JSON, reservations, indent=4)
 
 
 def _generate_id() -> int:
     return random.randint(10000000, 99999999)
 
 
+@locked(RESERVATIONS_JSON)
 def create_reservation(
     user_id: int,
     business_id: int,
@@ -38,7 +35,7 @@ def create_reservation(
     party_size: int,
     notes: Optional[str] = None,
 ) -> dict:
-    reservations = _load_reservations()
+    reservations = _load_reservations(for_update=True)
 
     reservation = {
         "reservationId": _generate_id(),
@@ -69,8 +66,9 @@ def get_business_reservations(business_id: int) -> list[dict]:
     return [r for r in reservations if r["businessId"] == business_id]
 
 
+@locked(RESERVATIONS_JSON)
 def cancel_reservation(reservation_id: int, user_id: int) -> dict:
-    reservations = _load_reservations()
+    reservations = _load_reservations(for_update=True)
     for r in reservations:
         if r["reservationId"] == reservation_id and r["userId"] == user_id:
             r["status"] = "cancelled"
@@ -98,9 +96,10 @@ def get_upcoming_reservations(user_id: int) -> list[dict]:
     ]
 
 
+@locked(RESERVATIONS_JSON)
 def check_reminders(user_id: int) -> list[dict]:
     """Find reservations within 24 hours that haven't had reminders sent."""
-    reservations = _load_reservations()
+    reservations = _load_reservations(for_update=True)
     now = datetime.utcnow()
     tomorrow = now + timedelta(hours=24)
     now_str = now.strftime("%Y-%m-%d")
@@ -10,6 +10,9 @@ from typing import Optional, List
 from pydantic import ValidationError
 
 import backend.storage.json_handler as jh
+import backend.storage.repository as repo
+import backend.utils.pagination as pagination
+from backend.storage.locks import locked
 from backend.models.review import Review, Reply
 from config.config import REVIEWS_JSON
 
@@ -18,19 +21,40 @@ def get_reviews_for_business(business_id: int) -> List[dict]:
     """
     Get all reviews for a specific business.
     """
-    reviews = jh.load_reviews()
-    return [r for r in reviews if r.get("businessID") == business_id]
+    return repo.find(REVIEWS_JSON, "businessID", business_id)
+
+
+def get_reviews_page(
+    business_id: int, limit: int, cursor: Optional[str] = None
+) -> tuple[List[dict], int, Optional[str]]:
+    """
+    One page of a business's reviews, for cursor pagination (see ./backend/utils/pagination.py).
+
+    Args:
+        business_id (int): Business whose reviews are listed.
+        limit (int): Page size.
+        cursor (str, optional): Cursor from the previous page. Defaults to the first page.
+
+    Raises:
+        ValueError: If the cursor is invalid or has expired.
+
+    Returns:
+        tuple[List[dict], int, Optional[str]]: The page, the total number of reviews and the
+            cursor for the next page (None on the last page).
+    """
+    version = pagination.version_token(repo.signature(REVIEWS_JSON))
+    reviews, page, next_cursor, _ = pagination.paginate(
+        "reviews", version, [business_id], lambda q: get_reviews_for_business(q[0]), cursor, limit
+    )
+    return reviews[page], len(reviews), next_cursor
 
 
 def get_review_by_id(review_id: int) -> Optional[dict]:
     """
     Get a specific review by its ID.
     """
-    reviews = jh.load_reviews()
-    for review in reviews:
-        if review.get("reviewId") == review_id:
-            return review
-    return None
+    matches = repo.find(REVIEWS_JSON, "reviewId", review_id)
+    return matches[0] if matches else None
 
 
 def user_has_reviewed_business(user_id: int, business_id: int) -> bool:
@@ -38,13 +62,13 @@ def user_has_reviewed_business(user_id: int, business_id: int) -> bool:
     Check if a user has already reviewed a business.
     Returns True if the user has an existing review.
     """
-    reviews = jh.load_reviews()
-    for review in reviews:
-        if review.get("userID") == user_id and review.get("businessID") == business_id:
-            return True
-    return False
+    return any(
+        review.get("businessID") == business_id
+        for review in repo.find(REVIEWS_JSON, "userID", user_id)
+    )
 
 
+@locked(REVIEWS_JSON)
 def create_review(
     business_id: int,
     user_id: int,
@@ -87,6 +111,7 @@ def create_review(
         raise ValueError(f"Review validation failed: {str(e)}")
 
 
+@locked(REVIEWS_JSON)
 def update_review(
     review_id: int,
     username: str,
@@ -97,7 +122,7 @@ def update_review(
     """
     Updates an existing review. Only the owner can update.
     """
-    reviews = jh.load_reviews()
+    reviews = jh.load_reviews(for_update=True)
 
     target_idx = None
     for idx, review in enumerate(reviews):
@@ -128,11 +153,12 @@ def update_review(
     return reviews[target_idx]
 
 
+@locked(REVIEWS_JSON)
 def delete_review(review_id: int, username: str) -> None:
     """
     Deletes a specific review. Only the owner can delete.
     """
-    reviews = jh.load_reviews()
+    reviews = jh.load_reviews(for_update=True)
 
     target_idx = None
     for idx, review in enumerate(reviews):
@@ -149,6 +175,7 @@ def delete_review(review_id: int, username: str) -> None:
     jh.save_reviews(reviews, io_type="w")
 
 
+@locked(REVIEWS_JSON)
 def add_reply_to_review(
     review_id: int,
     user_id: int,
@@ -159,7 +186,7 @@ def add_reply_to_review(
     Adds a reply to an existing review.
     Users can reply multiple times to the same review.
     """
-    reviews = jh.load_reviews()
+    reviews = jh.load_reviews(for_update=True)
 
     target_idx = None
     for idx, review in enumerate(reviews):
@@ -194,11 +221,12 @@ def add_reply_to_review(
         raise ValueError(f"Reply validation failed: {str(e)}")
 
 
+@locked(REVIEWS_JSON)
 def delete_reply(review_id: int, reply_id: int, username: str) -> None:
     """
     Deletes a reply from a review. Only the reply owner can delete.
     """
-    reviews = jh.load_reviews()
+    reviews = jh.load_reviews(for_update=True)
 
     for review in reviews:
         if review.get("reviewId") == review_id:
@@ -214,11 +242,12 @@ def delete_reply(review_id: int, reply_id: int, username: str) -> None:
     raise ValueError(f"Reply {reply_id} not found in review {review_id}")
 
 
+@locked(REVIEWS_JSON)
 def vote_helpful(review_id: int) -> dict:
     """
     Increments the helpful vote count for a review.
     """
-    reviews = jh.load_reviews()
+    reviews = jh.load_reviews(for_update=True)
 
     for idx, review in enumerate(reviews):
         if review.get("reviewId") == review_id:
@@ -1,38 +1,34 @@
-import json
-from pathlib import Path
 from typing import List, Optional, Dict
 from datetime import datetime
+import backend.storage.repository as repo
+from backend.storage.locks import locked
 from backend.models.saved import Collection, SavedBusiness
+from config.config import DATA_DIR
 
-DATA_DIR = Path(__file__).parent.parent.parent / "data"
 COLLECTIONS_FILE = DATA_DIR / "collections.json"
 SAVED_BUSINESSES_FILE = DATA_DIR / "saved_businesses.json"
 
 
-def _load_collections() -> List[Dict]:
+def _load_collections(for_update: bool = False) -> List[Dict]:
     if not COLLECTIONS_FILE.exists():
         return []
-    with open(COLLECTIONS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return repo.load(COLLECTIONS_FILE, for_update=for_update)
 
 
 def _save_collections(collections: List[Dict]):
     COLLECTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(COLLECTIONS_FILE, "w", encoding="utf-8") as f:
-        json.dump(collections, f, indent=2, ensure_ascii=False)
+    repo.save(COLLECTIONS_FILE, collections, indent=2, ensure_ascii=False)
 
 
-def _load_saved_businesses() -> List[Dict]:
+def _load_saved_businesses(for_update: bool = False) -> List[Dict]:
     if not SAVED_BUSINESSES_FILE.exists():
         return []
-    with open(SAVED_BUSINESSES_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return repo.load(SAVED_BUSINESSES_FILE, for_update=for_update)
 
 
 def _save_saved_businesses(saved_businesses: List[Dict]):
     SAVED_BUSINESSES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SAVED_BUSINESSES_FILE, "w", encoding="utf-8") as f:
-        json.dump(saved_businesses, f, indent=2, ensure_ascii=False)
+    repo.save(SAVED_BUSINESSES_FILE, saved_businesses, indent=2, ensure_ascii=False)
 
 
 def _get_next_collection_id() -> int:
@@ -50,9 +46,10 @@ def _get_next_saved_id() -> int:
 
 
 # Collection Management
+@locked(COLLECTIONS_FILE)
 def create_collection(user_id: int, name: str) -> Dict:
     """Create a new collection for a user."""
-    collections = _load_collections()
+    collections = _load_collections(for_update=True)
 
     # Check if collection name already exists for this user
     if any(c["userId"] == user_id and c["name"].lower() == name.lower() for c in collections):
@@ -76,6 +73,7 @@ def get_user_collections(user_id: int) -> List[Dict]:
     return [c for c in collections if c["userId"] == user_id]
 
 
+@locked(COLLECTIONS_FILE, SAVED_BUSINESSES_FILE)
 def delete_collection(user_id: int, collection_id: int) -> bool:
     """Delete a collection and all saved businesses in it."""
     collections = _load_collections()
@@ -101,9 +99,10 @@ def delete_collection(user_id: int, collection_id: int) -> bool:
     return True
 
 
+@locked(COLLECTIONS_FILE)
 def rename_collection(user_id: int, collection_id: int, new_name: str) -> bool:
     """Rename a collection."""
-    collections = _load_collections()
+    collections = _load_collections(for_update=True)
 
     # Check if new name already exists for this user
     if any(c["userId"] == user_id and c["name"].lower() == new_name.lower() and c["collectionId"] != collection_id for c in collections):
@@ -119,10 +118,11 @@ def rename_collection(user_id: int, collection_id: int, new_name: str) -> bool:
 
 
 # Saved Business Management
+@locked(SAVED_BUSINESSES_FILE)
 def save_business(user_id: int, business_id: int, collection_id: int) -> Dict:
     """Save a business to a collection."""
     collections = _load_collections()
-    saved_businesses = _load_saved_businesses()
+    saved_businesses = _load_saved_businesses(for_update=True)
 
     # Verify collection exists and belongs to user
     if not any(c["collectionId"] == collection_id and c["userId"] == user_id for c in collections):
@@ -145,6 +145,7 @@ def save_business(user_id: int, business_id: int, collection_id: int) -> Dict:
     return saved.model_dump()
 
 
+@locked(SAVED_BUSINESSES_FILE)
 def unsave_business(user_id: int, business_id: int, collection_id: Optional[int] = None) -> bool:
     """
     Remove a business from saved.
@@ -198,10 +199,11 @@ def is_business_saved(user_id: int, business_id: int) -> Dict:
     }
 
 
+@locked(SAVED_BUSINESSES_FILE)
 def move_business_to_collection(user_id: int, business_id: int, old_collection_id: int, new_collection_id: int) -> bool:
     """Move a saved business from one collection to another."""
     collections = _load_collections()
-    saved_businesses = _load_saved_businesses()
+    saved_businesses = _load_saved_businesses(for_update=True)
 
     # Verify new collection exists and belongs to user
     if not any(c["collectionId"] == new_collection_id and c["userId"] == user_id for c in collections):
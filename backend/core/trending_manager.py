@@ -18,12 +18,13 @@ Behavior:
   - $5000 total -> ~326 points (slow logarithmic growth)
 """
 
-import json
 import math
 import random
 from datetime import datetime
 from typing import Optional
 
+import backend.storage.repository as repo
+from backend.storage.locks import locked
 from config.config import RECEIPTS_JSON, TRENDING_POINTS_JSON
 
 # Points formula constants
@@ -32,30 +33,24 @@ POINTS_THRESHOLD = 400   # T - transition point in dollars
 POINTS_STEEPNESS = 2     # n - exponent controlling curve shape
 
 
-def _load_receipts() -> list[dict]:
-    try:
-        with open(str(RECEIPTS_JSON), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def _load_receipts(for_update: bool = False) -> list[dict]:
+    return repo.load(RECEIPTS_JSON, default=[], for_update=for_update)
 
 
 def _save_receipts(receipts: list[dict]) -> None:
-    with open(str(RECEIPTS_JSON), "w") as f:
-        json.dump(receipts, f, indent=4)
+    repo.save(RECEIPTS_JSON, receipts, indent=4)
 
 
-def _load_trending() -> list[dict]:
-    try:
-        with open(str(TRENDING_POINTS_JSON), "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+def _append_receipt(receipt: dict) -> None:
+    repo.append(RECEIPTS_JSON, [receipt], indent=4)
+
+
+def _load_trending(for_update: bool = False) -> list[dict]:
+    return repo.load(TRENDING_POINTS_JSON, default=[], for_update=for_update)
 
 
 def _save_trending(trending: list[dict]) -> None:
-    with open(str(TRENDING_POINTS_JSON), "w") as f:
-        json.dump(trending, f, indent=4)
+    repo.save(TRENDING_POINTS_JSON, trending, indent=4)
 
 
 def _generate_id() -> int:
@@ -77,8 +72,6 @@ def submit_receipt(user_id: int, business_id: int, amount: float, image_path: st
     if amount <= 0:
         return {"status": "error", "message": "Amount must be positive"}
 
-    receipts = _load_receipts()
-
     receipt = {
         "receiptId": _generate_id(),
         "userId": user_id,
@@ -89,15 +82,15 @@ def submit_receipt(user_id: int, business_id: int, amount: float, image_path: st
         "verified": False,
     }
 
-    receipts.append(receipt)
-    _save_receipts(receipts)
+    _append_receipt(receipt)
 
     # Recalculate points for this business
-    _update_business_points(business_id, receipts)
+    _update_business_points(business_id)
 
     return {"status": "success", "receipt": receipt}
 
 
+@locked(TRENDING_POINTS_JSON)
 def _update_business_points(business_id: int, receipts: Optional[list] = None) -> None:
     if receipts is None:
         receipts = _load_receipts()
@@ -106,7 +99,7 @@ def _update_business_points(business_id: int, receipts: Optional[list] = None) -
     total_spent = sum(r["amount"] for r in business_receipts)
     points = calculate_points(total_spent)
 
-    trending = _load_trending()
+    trending = _load_trending(for_update=True)
 
     found = False
     for t in trending:
@@ -129,24 +122,21 @@ def _update_business_points(business_id: int, receipts: Optional[list] = None) -
 
 
 def get_trending(limit: int = 50) -> list[dict]:
-    trending = _load_trending()
-    trending.sort(key=lambda t: t["points"], reverse=True)
+    trending = sorted(_load_trending(), key=lambda t: t["points"], reverse=True)
     return trending[:limit]
 
 
 def get_business_trending_stats(business_id: int) -> Optional[dict]:
-    trending = _load_trending()
-    for t in trending:
-        if t["businessId"] == business_id:
-            return t
+    for t in repo.find(TRENDING_POINTS_JSON, "businessId", business_id):
+        return t
     return None
 
 
 def get_user_receipts(user_id: int) -> list[dict]:
-    receipts = _load_receipts()
-    return [r for r in receipts if r["userId"] == user_id]
+    return repo.find(RECEIPTS_JSON, "userId", user_id)
 
 
+@locked(TRENDING_POINTS_JSON)
 def recalculate_all_points() -> None:
     receipts = _load_receipts()
     business_ids = set(r["businessId"] for r in receipts)
@@ -10,10 +10,14 @@ from pydantic import ValidationError
 from pydantic_extra_types.phone_numbers import PhoneNumber
 
 import backend.storage.json_handler as jh
+import backend.storage.repository as repo
+from backend.storage.locks import locked
 import backend.utils.password as pw
 from backend.models.user import User, UserLocation, UserProfile
+from config.config import USERS_JSON
 
 
+@locked(USERS_JSON)
 def create_user(
     username: str,
     email: str,
@@ -76,6 +80,7 @@ def create_user(
         return f"ERROR: User information invalid. {str(e)}"
 
 
+@locked(USERS_JSON)
 def remove_user(username: str, users: Optional[list[dict]] = None):
     """
     Removes a user by username.
@@ -88,7 +93,7 @@ def remove_user(username: str, users: Optional[list[dict]] = None):
         ValueError: When the user does not exist.
     """
     if not users:
-        users = jh.load_users()
+        users = jh.load_users(for_update=True)
 
     user_exists = False
     for idx, user in enumerate(users):
@@ -102,6 +107,7 @@ def remove_user(username: str, users: Optional[list[dict]] = None):
         raise ValueError("ERROR: User does not exist.")
 
 
+@locked(USERS_JSON)
 def edit_user(
     username: str, field: str, new_value: Any, users: Optional[list[dict]] = None
 ):
@@ -118,7 +124,7 @@ def edit_user(
         ValueError: When user does not exist.
     """
     if not users:
-        users = jh.load_users()
+        users = jh.load_users(for_update=True)
 
     user_exists = False
     for user in users:
@@ -155,7 +161,7 @@ def get_user_by_username(username: str, users: Optional[list[dict]] = None) -> d
         dict: User that was found.
     """
     if not users:
-        users = jh.load_users()
+        users = repo.find(USERS_JSON, "username", username)
 
     for user in users:
         if user["username"] == username:
@@ -206,7 +212,7 @@ def get_user_by_id(user_id: int, users: Optional[list[dict]] = None) -> Optional
         Optional[dict]: User dict if found, None otherwise.
     """
     if not users:
-        users = jh.load_users()
+        users = repo.find(USERS_JSON, "id", user_id)
 
     for user in users:
         if user["id"] == user_id:
@@ -0,0 +1,326 @@
+"""
+./backend/storage/columnar.py
+
+Compiled, memory-mapped columnar copy of businesses.json. Coordinates, ratings and interned
+category/cuisine codes are NumPy arrays, while names and full records sit in offset-indexed byte
+blobs. Every file is opened with mmap, so all worker processes share the same pages. Filters run
+on the columns, and only the page being returned is decoded back into dicts.
+
+The compiled files live in data/businesses.columns/<fingerprint>/, one directory per version of
+the source data. A source change therefore compiles a new directory instead of rewriting files
+that other processes may have mapped.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+import numpy as np
+
+import backend.storage.repository as repo
+from backend.storage.locks import file_lock
+from config.config import BUSINESS_COLUMNS_DIR, BUSINESSES_JSON
+
+FORMAT_VERSION = 1
+CODED_FIELDS = ("category", "cuisine")  # Interned as int32 codes; code 0 means missing
+
+PathLike = Union[str, Path]
+
+
+def _fingerprint(signature: Any) -> str:
+    return hashlib.sha1(repr((FORMAT_VERSION, signature)).encode()).hexdigest()[:16]
+
+
+def _blob(values: list[Optional[bytes]]) -> tuple[bytes, np.ndarray, np.ndarray]:
+    """
+    Packs byte strings into one blob with n + 1 offsets, plus a mask of which values are present.
+    """
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    present = np.zeros(len(values), dtype=np.bool_)
+    parts = []
+    position = 0
+    for i, value in enumerate(values):
+        if value is not None:
+            parts.append(value)
+            position += len(value)
+            present[i] = True
+        offsets[i + 1] = position
+    return b"".join(parts), offsets, present
+
+
+def compile_businesses(businesses: list[dict], out_dir: PathLike, source_signature: Any = None) -> None:
+    """
+    Writes the columnar form of a business list into out_dir.
+
+    Args:
+        businesses (list[dict]): Businesses to compile.
+        out_dir (PathLike): Directory to create (must not exist yet).
+        source_signature (Any, optional): Fingerprint of the source data, stored in meta.json.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True)
+    n = len(businesses)
+
+    def number(value: Any) -> float:
+        return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+    lat = np.array([number(b.get("latitude")) for b in businesses], dtype=np.float64)
+    lon = np.array([number(b.get("longitude")) for b in businesses], dtype=np.float64)
+    lat_rad = np.radians(lat)
+    arrays = {
+        "lat": lat,
+        "lon": lon,
+        "lat_rad": lat_rad,
+        "lon_rad": np.radians(lon),
+        "cos_lat": np.cos(lat_rad),
+        "rating": np.array([number(b.get("rating")) for b in businesses], dtype=np.float32),
+        "id": np.array(
+            [b.get("id") if isinstance(b.get("id"), int) else -1 for b in businesses], dtype=np.int64
+        ),
+    }
+    arrays["id_order"] = np.argsort(arrays["id"], kind="stable")
+
+    vocabularies = {}
+    for field in CODED_FIELDS:
+        vocabulary: dict[Any, int] = {}
+        codes = np.zeros(n, dtype=np.int32)
+        for i, business in enumerate(businesses):
+            value = business.get(field)
+            if value is not None:
+                codes[i] = vocabulary.setdefault(value, len(vocabulary) + 1)
+        # Postings per code, each already in dataset order thanks to the stable sort
+        order = np.argsort(codes, kind="stable")
+        starts = np.searchsorted(codes[order], np.arange(len(vocabulary) + 2), side="left")
+        arrays[f"{field}_codes"] = codes
+        arrays[f"{field}_order"] = order.astype(np.int64)
+        arrays[f"{field}_starts"] = starts.astype(np.int64)
+        vocabularies[field] = list(vocabulary)
+
+    names = [b.get("name") for b in businesses]
+    name_blob, arrays["name_offsets"], arrays["name_present"] = _blob(
+        [name.encode("utf-8") if isinstance(name, str) else None for name in names]
+    )
+    record_blob, arrays["record_offsets"], _ = _blob(
+        [json.dumps(b, separators=(",", ":")).encode("utf-8") for b in businesses]
+    )
+
+    for name, array in arrays.items():
+        np.save(out / f"{name}.npy", array)
+    (out / "names.bin").write_bytes(name_blob)
+    (out / "records.bin").write_bytes(record_blob)
+
+    # Written last: a directory without meta.json is an unfinished compile
+    with open(out / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "format": FORMAT_VERSION,
+                "count": n,
+                "source": repr(source_signature),
+                "vocabularies": vocabularies,
+            },
+            f,
+        )
+
+
+def _map_bytes(path: Path) -> np.ndarray:
+    if path.stat().st_size == 0:
+        return np.empty(0, dtype=np.uint8)  # mmap cannot map an empty file
+    return np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+
+
+class BusinessColumns:
+    """
+    Read-only, memory-mapped view of a compiled business list. Indices are positions in the
+    original businesses.json, so they line up with the JSON list and every index built over it.
+    """
+
+    def __init__(self, directory: PathLike) -> None:
+        self.directory = Path(directory)
+        with open(self.directory / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.count = meta["count"]
+        self.vocabularies = meta["vocabularies"]
+        self.derived_cache: dict[str, Any] = {}  # Used by repository.derived
+
+        def load(name: str) -> np.ndarray:
+            # Plain ndarray view of the map: same shared pages, without np.memmap's per-slice overhead
+            return np.load(self.directory / f"{name}.npy", mmap_mode="r").view(np.ndarray)
+
+        self.lat = load("lat")
+        self.lon = load("lon")
+        self.lat_rad = load("lat_rad")
+        self.lon_rad = load("lon_rad")
+        self.cos_lat = load("cos_lat")
+        self.rating = load("rating")
+        self.ids = load("id")
+        self.id_order = load("id_order")
+        self.codes = {field: load(f"{field}_codes") for field in CODED_FIELDS}
+        self._orders = {field: load(f"{field}_order") for field in CODED_FIELDS}
+        self._starts = {field: load(f"{field}_starts") for field in CODED_FIELDS}
+        self._name_offsets = load("name_offsets")
+        self._name_present = load("name_present")
+        self._record_offsets = load("record_offsets")
+        self._names = _map_bytes(self.directory / "names.bin")
+        self._records = _map_bytes(self.directory / "records.bin")
+        self._records_view = memoryview(self._records)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx: int) -> dict:
+        return self.record(idx)
+
+    def record(self, idx: int) -> dict:
+        """
+        Decodes one business back into the dict stored in businesses.json.
+        """
+        start, end = self._record_offsets[idx], self._record_offsets[idx + 1]
+        return json.loads(self._records[start:end].tobytes())
+
+    def records(self, indices: Iterable[int]) -> list[dict]:
+        """
+        Decodes several businesses, in the order given, with a single JSON parse.
+        """
+        idx = np.fromiter(indices, dtype=np.int64) if not isinstance(indices, np.ndarray) else indices
+        if len(idx) == 0:
+            return []
+        starts = self._record_offsets[idx].tolist()
+        ends = self._record_offsets[idx + 1].tolist()
+        blob = self._records_view
+        return json.loads(b"[" + b",".join([blob[s:e] for s, e in zip(starts, ends)]) + b"]")
+
+    def name(self, idx: int) -> Optional[str]:
+        if not self._name_present[idx]:
+            return None
+        start, end = self._name_offsets[idx], self._name_offsets[idx + 1]
+        return self._names[start:end].tobytes().decode("utf-8")
+
+    def names(self) -> list[Optional[str]]:
+        """
+        Every business name (None where missing), decoded from the name blob in one pass.
+        """
+        text = self._names.tobytes().decode("utf-8") if len(self._names) else ""
+        if text.isascii():
+            offsets = self._name_offsets.tolist()
+        else:
+            # Offsets are in bytes; re-derive character offsets from the per-name byte slices
+            return [self.name(i) for i in range(self.count)]
+        present = self._name_present.tolist()
+        return [
+            text[offsets[i] : offsets[i + 1]] if present[i] else None for i in range(self.count)
+        ]
+
+    def postings(self, field: str) -> dict[Any, np.ndarray]:
+        """
+        Value -> sorted indices of the businesses with that value, as views into the mapped file.
+        Businesses without the field are grouped under None.
+
+        Args:
+            field (str): One of CODED_FIELDS.
+
+        Returns:
+            dict[Any, np.ndarray]: Inverted index for the field.
+        """
+        order, starts = self._orders[field], self._starts[field]
+        values = [None] + self.vocabularies[field]
+        return {
+            value: order[starts[code] : starts[code + 1]]
+            for code, value in enumerate(values)
+            if starts[code + 1] > starts[code]
+        }
+
+    def index_of(self, business_id: int) -> Optional[int]:
+        """
+        Position of the business with this id (the first one, if ids repeat), found by binary search.
+
+        Args:
+            business_id (int): Business id.
+
+        Returns:
+            Optional[int]: Index into the business list, or None if no business has that id.
+        """
+        pos = int(np.searchsorted(self.ids, business_id, sorter=self.id_order))
+        if pos < self.count and self.ids[self.id_order[pos]] == business_id:
+            return int(self.id_order[pos])
+        return None
+
+
+_cache: dict[str, tuple[Any, BusinessColumns]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_columns(
+    path: PathLike = BUSINESSES_JSON, columns_dir: PathLike = BUSINESS_COLUMNS_DIR
+) -> BusinessColumns:
+    """
+    Returns the memory-mapped columns for a business file, compiling them first if the source has
+    changed since the last compile (in this or any other process).
+
+    Args:
+        path (PathLike, optional): Source business file. Defaults to config BUSINESSES_JSON.
+        columns_dir (PathLike, optional): Where compiled versions are kept. Defaults to config
+            BUSINESS_COLUMNS_DIR.
+
+    Returns:
+        BusinessColumns: Columns matching the current contents of path.
+    """
+    key = str(Path(path).resolve())
+    signature = repo.signature(path)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with file_lock(path):
+        # Re-read the signature under the lock: another process may have just rewritten the source
+        signature = repo.signature(path)
+        target = Path(columns_dir) / _fingerprint(signature)
+        if not (target / "meta.json").exists():
+            _compile_into(repo.load(path), target, signature)
+        # Opened under the lock, so a concurrent compile cannot delete the directory mid-open
+        columns = BusinessColumns(target)
+
+    with _cache_lock:
+        _cache[key] = (signature, columns)
+    return columns
+
+
+def _compile_into(businesses: list[dict], target: Path, signature: Any) -> None:
+    """
+    Compiles into a temporary directory, renames it into place and removes older versions (open
+    memory maps of removed files stay valid in the processes using them).
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=target.parent, prefix=".compile-"))
+    try:
+        compile_businesses(businesses, tmp / "out", signature)
+        os.replace(tmp / "out", target)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    for old in target.parent.iterdir():
+        if old != target and not old.name.startswith("."):
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def materialize(businesses: Any, indices: Iterable[int]) -> list[dict]:
+    """
+    Turns indices into business dicts, for either a BusinessColumns or a plain list.
+
+    Args:
+        businesses (Any): BusinessColumns or list[dict].
+        indices (Iterable[int]): Indices to return, in order.
+
+    Returns:
+        list[dict]: The businesses at those indices.
+    """
+    if isinstance(businesses, BusinessColumns):
+        return businesses.records(indices)
+    return [businesses[int(idx)] for idx in indices]
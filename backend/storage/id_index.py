@@ -0,0 +1,170 @@
+"""
+./backend/storage/id_index.py
+
+Business id -> position index. The ids are kept in dataset order next to a stable argsort of them,
+so looking up one id, or many at once, is a binary search.
+
+For the compiled columns the index is part of the compile (columnar.py). For the JSON list it is
+built once per version of the file and written to a sidecar file in
+data/businesses.ids/. Workers that start later, or the next process, memory-map that file instead
+of rebuilding it.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+import numpy as np
+
+import backend.storage.repository as repo
+from backend.storage.columnar import BusinessColumns
+from config.config import BUSINESS_ID_INDEX_DIR
+
+FORMAT_VERSION = 1
+VERIFY_SAMPLES = 16  # Sidecar entries checked against the list before a sidecar is trusted
+
+PathLike = Union[str, Path]
+
+
+def _id_or_missing(value: Any) -> int:
+    # Non-integer ids (and bools, which are ints to Python) are stored as -1 and never match
+    return value if isinstance(value, int) and not isinstance(value, bool) else -1
+
+
+class IdIndex:
+    """
+    Sorted view of a business list's ids. Positions are indices into the list it was built from.
+    """
+
+    def __init__(self, ids: np.ndarray, order: np.ndarray) -> None:
+        self.ids = ids  # Id per business, in dataset order (-1 where missing)
+        self.order = order  # Stable argsort of ids: equal ids stay in dataset order
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def positions(self, business_ids: Iterable[Any]) -> np.ndarray:
+        """
+        Looks up many ids at once.
+
+        Args:
+            business_ids (Iterable[Any]): Ids to find (anything that is not an int is never found).
+
+        Returns:
+            np.ndarray: Position of each id's business (the first one, if ids repeat), or -1 where
+                no business has that id.
+        """
+        keys = np.array([_id_or_missing(i) for i in business_ids], dtype=np.int64)
+        if len(self.ids) == 0 or len(keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+
+        pos = np.minimum(np.searchsorted(self.ids, keys, sorter=self.order), len(self.ids) - 1)
+        found = (self.ids[self.order[pos]] == keys) & (keys != -1)
+        return np.where(found, self.order[pos], -1)
+
+    def all_positions(self, business_id: Any) -> np.ndarray:
+        """
+        Positions of every business with this id, in dataset order (normally zero or one).
+        """
+        key = _id_or_missing(business_id)
+        if key == -1:
+            return np.empty(0, dtype=np.int64)
+        start = np.searchsorted(self.ids, key, side="left", sorter=self.order)
+        end = np.searchsorted(self.ids, key, side="right", sorter=self.order)
+        return np.asarray(self.order[start:end], dtype=np.int64)
+
+
+def build_id_index(businesses: list[dict]) -> IdIndex:
+    ids = np.array([_id_or_missing(b.get("id")) for b in businesses], dtype=np.int64)
+    return IdIndex(ids, np.argsort(ids, kind="stable"))
+
+
+def _sidecar_name(key: str, signature: Any) -> tuple[str, str]:
+    """
+    File name for one version of one source file, and the prefix shared by all its versions.
+    """
+    prefix = hashlib.sha1(key.encode()).hexdigest()[:12]
+    version = hashlib.sha1(repr((FORMAT_VERSION, signature)).encode()).hexdigest()[:16]
+    return f"{prefix}-{version}.npy", f"{prefix}-"
+
+
+def _write_sidecar(index: IdIndex, path: Path, prefix: str) -> None:
+    """
+    Saves the index as one (2, n) int64 array, via a temporary file renamed into place, then
+    removes older versions for the same source (open memory maps of them stay valid).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.stack([index.ids, index.order.astype(np.int64)]))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    for old in path.parent.glob(f"{prefix}*.npy"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def _matches_list(stored: np.ndarray, businesses: list[dict]) -> bool:
+    """
+    Spot-checks a loaded sidecar against the list: at evenly spaced places in the sorted order,
+    the position must be valid, its stored id must be the business's id there, and the ids must
+    be ascending. Catches a sidecar left by another version of the file that its name did not
+    tell apart.
+    """
+    if stored.shape != (2, len(businesses)):
+        return False
+    if len(businesses) == 0:
+        return True
+
+    ranks = np.unique(np.linspace(0, len(businesses) - 1, VERIFY_SAMPLES).astype(np.int64))
+    positions = stored[1][ranks]
+    if positions.min() < 0 or positions.max() >= len(businesses):
+        return False
+    ids = stored[0][positions]
+    expected = [_id_or_missing(businesses[p].get("id")) for p in positions.tolist()]
+    return bool(np.all(np.diff(ids) >= 0)) and ids.tolist() == expected
+
+
+def load_id_index(businesses: Any, sidecar_dir: PathLike = BUSINESS_ID_INDEX_DIR) -> IdIndex:
+    """
+    Returns the id index of a business list: the compiled one for BusinessColumns, otherwise the
+    sidecar file for the list's file version (repository.signature, inode included), building and
+    writing it first if there is none or it fails the spot check against the list.
+    Lists that did not come from repository.load() are indexed in memory only.
+
+    Args:
+        businesses (Any): BusinessColumns or list[dict].
+        sidecar_dir (PathLike, optional): Where sidecar files are kept. Defaults to config
+            BUSINESS_ID_INDEX_DIR.
+
+    Returns:
+        IdIndex: Index over businesses.
+    """
+    if isinstance(businesses, BusinessColumns):
+        return IdIndex(businesses.ids, businesses.id_order)
+
+    origin = repo.source(businesses)
+    if origin is None:
+        return build_id_index(businesses)
+
+    name, prefix = _sidecar_name(*origin)
+    path = Path(sidecar_dir) / name
+    try:
+        stored = np.load(path, mmap_mode="r").view(np.ndarray)
+        if _matches_list(stored, businesses):
+            return IdIndex(stored[0], stored[1])
+    except (OSError, ValueError):
+        pass  # Not written yet (or unreadable): rebuild below
+
+    index = build_id_index(businesses)
+    try:
+        _write_sidecar(index, path, prefix)
+    except OSError:
+        pass  # A read-only data directory only costs the rebuild in the next process
+    return index
@@ -4,11 +4,12 @@
 Handles saving and loading JSON files from their pipelines.
 """
 
-import json
 from pathlib import Path
 from tarfile import TarError
 from typing import Optional, Union
 
+import backend.storage.repository as repo
+from backend.storage.locks import file_lock
 from config.config import BUSINESSES_JSON, REVIEWS_JSON, SESSIONS_JSON, USERS_JSON
 
 
@@ -27,8 +28,7 @@ def load_businesses(
     if input_filepath is None:
         input_filepath = str(BUSINESSES_JSON)
 
-    with open(input_filepath, "r") as f:
-        return json.load(f)
+    return repo.load(input_filepath)
 
 
 def save_businesses(
@@ -47,16 +47,27 @@ def save_businesses(
     if output_filepath is None:
         output_filepath = str(BUSINESSES_JSON)
 
-    with open(output_filepath, io_type) as f:
-        json.dump(businesses, f, indent=4)
+    with file_lock(output_filepath):
+        if io_type == "a":
+            # Added to the existing list; appending a second JSON document would not be valid JSON
+            all_businesses = repo.load(output_filepath, default=[], for_update=True)
+            all_businesses.extend(businesses)
+        else:
+            all_businesses = businesses
 
+        repo.save(output_filepath, all_businesses, indent=4)
 
-def load_users(input_filepath: Optional[str] = None) -> list[dict]:
+
+def load_users(
+    input_filepath: Optional[str] = None, for_update: bool = False
+) -> list[dict]:
     """
     Loads a JSON file that contains all users.
 
     Args:
         input_filepath (str, optional): Filepath to user JSON file. Defaults to config USERS_JSON.
+        for_update (bool, optional): Return a private copy that can be modified and saved back.
+            Defaults to False (shared cached copy, read-only).
 
     Returns:
         list[dict]: List containing the dictionaries with all users and their data.
@@ -64,8 +75,7 @@ def load_users(input_filepath: Optional[str] = None) -> list[dict]:
     if input_filepath is None:
         input_filepath = str(USERS_JSON)
 
-    with open(input_filepath, "r") as f:
-        return json.load(f)
+    return repo.load(input_filepath, for_update=for_update)
 
 
 def save_users(
@@ -82,23 +92,27 @@ def save_users(
     if output_filepath is None:
         output_filepath = str(USERS_JSON)
 
-    if io_type == "a":
-        existing_users = load_users(output_filepath)
-        existing_users.extend(users)
-        all_users = existing_users
-    else:
-        all_users = users
+    with file_lock(output_filepath):
+        if io_type == "a":
+            existing_users = load_users(output_filepath, for_update=True)
+            existing_users.extend(users)
+            all_users = existing_users
+        else:
+            all_users = users
 
-    with open(output_filepath, "w") as f:
-        json.dump(all_users, f, indent=4)
+        repo.save(output_filepath, all_users, indent=4)
 
 
-def load_sessions(input_filepath: Optional[str] = None) -> list[dict]:
+def load_sessions(
+    input_filepath: Optional[str] = None, for_update: bool = False
+) -> list[dict]:
     """
     Loads a JSON file that contains all active sessions.
 
     Args:
         input_filepath (str, optional): Filepath to sessions JSON file. Defaults to config SESSIONS_JSON.
+        for_update (bool, optional): Return a private copy that can be modified and saved back.
+            Defaults to False (shared cached copy, read-only).
 
     Returns:
         list[dict]: List containing session dictionaries.
@@ -107,8 +121,7 @@ def load_sessions(input_filepath: Optional[str] = None) -> list[dict]:
         input_filepath = str(SESSIONS_JSON)
 
     try:
-        with open(input_filepath, "r") as f:
-            return json.load(f)
+        return repo.load(input_filepath, for_update=for_update)
     except FileNotFoundError:
         return []
 
@@ -132,14 +145,14 @@ def save_session(
     if output_filepath is None:
         output_filepath = str(SESSIONS_JSON)
 
-    if io_type == "a":
-        sessions = load_sessions(output_filepath)
-        sessions.append(session_info)
-    else:
-        sessions = [session_info]
+    with file_lock(output_filepath):
+        if io_type == "a":
+            sessions = load_sessions(output_filepath, for_update=True)
+            sessions.append(session_info)
+        else:
+            sessions = [session_info]
 
-    with open(output_filepath, "w") as f:
-        json.dump(sessions, f, indent=4)
+        repo.save(output_filepath, sessions, indent=4)
 
 
 def delete_session(session_id: str, output_filepath: Optional[str] = None) -> None:
@@ -153,28 +166,32 @@ def delete_session(session_id: str, output_filepath: Optional[str] = None) -> No
     if output_filepath is None:
         output_filepath = str(SESSIONS_JSON)
 
-    sessions = load_sessions(output_filepath)
+    with file_lock(output_filepath):
+        sessions = load_sessions(output_filepath, for_update=True)
 
-    session_found = False
-    for i, session in enumerate(sessions):
-        if session.get("session_id") == session_id:
-            sessions.pop(i)
-            session_found = True
-            break
+        session_found = False
+        for i, session in enumerate(sessions):
+            if session.get("session_id") == session_id:
+                sessions.pop(i)
+                session_found = True
+                break
 
-    if not session_found:
-        raise ValueError(f"ERROR: Session {session_id} does not exist.")
+        if not session_found:
+            raise ValueError(f"ERROR: Session {session_id} does not exist.")
 
-    with open(output_filepath, "w") as f:
-        json.dump(sessions, f, indent=4)
+        repo.save(output_filepath, sessions, indent=4)
 
 
-def load_reviews(input_filepath: Optional[str] = None) -> list[dict]:
+def load_reviews(
+    input_filepath: Optional[str] = None, for_update: bool = False
+) -> list[dict]:
     """
     Loads a JSON file that contains all reviews.
 
     Args:
         input_filepath (str, optional): Filepath to reviews JSON file. Defaults to config REVIEWS_JSON.
+        for_update (bool, optional): Return a private copy that can be modified and saved back.
+            Defaults to False (shared cached copy, read-only).
 
     Returns:
         list[dict]: List containing review dictionaries.
@@ -182,8 +199,7 @@ def load_reviews(input_filepath: Optional[str] = None) -> list[dict]:
     if input_filepath is None:
         input_filepath = str(REVIEWS_JSON)
 
-    with open(input_filepath, "r") as f:
-        return json.load(f)
+    return repo.load(input_filepath, for_update=for_update)
 
 
 def save_reviews(
@@ -192,7 +208,8 @@ def save_reviews(
     io_type: str = "a",
 ) -> None:
     """
-    Function to save new reviews to JSON file
+    Function to save new reviews to JSON file. Appends go to the append-only reviews log, which
+    load_reviews replays on top of the snapshot.
 
     Args:
         new_reviews (list[dict]): List of review dictionaries to save.
@@ -203,11 +220,7 @@ def save_reviews(
         output_filepath = str(REVIEWS_JSON)
 
     if io_type == "a":
-        existing_reviews = load_reviews(output_filepath)
-        existing_reviews.extend(new_reviews)
-        all_reviews = existing_reviews
+        # Appended to the reviews log: one small write instead of rewriting every review
+        repo.append(output_filepath, new_reviews, indent=4)
     else:
-        all_reviews = new_reviews
-
-    with open(output_filepath, "w") as f:
-        json.dump(all_reviews, f, indent=4)
+        repo.save(output_filepath, new_reviews, indent=4)
@@ -0,0 +1,142 @@
+"""
+./backend/storage/locks.py
+
+Per-file locks for read-modify-write on the data files. Each lock is a re-entrant thread lock plus
+an OS-level lock on a sidecar "<file>.lock" file (fcntl.flock on POSIX, msvcrt.locking on Windows),
+so two threads or two worker processes never interleave load -> modify -> save on the same file.
+"""
+
+import functools
+import os
+import threading
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PathLike = Union[str, Path]
+
+
+class FileLock:
+    """
+    Re-entrant lock shared by every thread and process that uses the same file. Only the outermost
+    acquire in a thread takes the OS lock, so nested calls (a locked manager function calling
+    repository.save) do not deadlock.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock_path = path + ".lock"
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._lock_os()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_os()
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def _lock_os(self) -> None:
+        if self._fd is None:
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)  # Retries for ~10s, then raises
+                    break
+                except OSError:
+                    continue
+
+    def _unlock_os(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+
+_locks: dict[str, FileLock] = {}
+_registry_lock = threading.Lock()
+
+
+def get_lock(path: PathLike) -> FileLock:
+    """
+    Returns the lock guarding a data file (one shared instance per resolved path).
+
+    Args:
+        path (PathLike): Path to the data file.
+
+    Returns:
+        FileLock: Lock for that file.
+    """
+    key = str(Path(path).resolve())
+    with _registry_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = FileLock(key)
+        return lock
+
+
+@contextmanager
+def file_lock(*paths: PathLike) -> Iterator[None]:
+    """
+    Holds the locks of one or more data files. Multiple locks are always taken in the same (sorted)
+    order, so two functions that touch the same pair of files cannot deadlock.
+
+    Args:
+        *paths (PathLike): Data files to lock.
+    """
+    locks = sorted({get_lock(path).path: get_lock(path) for path in paths}.items())
+    with ExitStack() as stack:
+        for _, lock in locks:
+            stack.enter_context(lock)
+        yield
+
+
+def locked(*paths: PathLike) -> Callable:
+    """
+    Decorator that runs a function while holding the locks of the given data files. Use it on every
+    function that loads a file with for_update=True and saves it back.
+
+    Args:
+        *paths (PathLike): Data files the function reads, modifies and writes.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with file_lock(*paths):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,548 @@
+"""
+./backend/storage/repository.py
+
+Shared in-process cache for every JSON data file. Each file is parsed once and the parsed list is
+reused until the file's mtime or size changes on disk, so read-heavy endpoints no longer pay for a
+full json.load on every request.
+
+Insert-heavy datasets can also grow through an append-only JSON-Lines log next to the snapshot
+(reviews.json + reviews.jsonl). Loading replays the log on top of the snapshot, and the log is
+compacted back into the snapshot once it gets large.
+
+With CNLC_STORAGE_BACKEND=sqlite, the data files in DATA_DIR are served from SQLite instead (see
+sqlite_store.py); callers keep using the same load/save/append/find functions.
+"""
+
+import glob
+import itertools
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from backend.storage import sqlite_store
+from backend.storage.locks import file_lock
+from config.config import APPEND_LOG_COMPACT_BYTES, DATA_DIR, STORAGE_BACKEND
+
+PathLike = Union[str, Path]
+
+_MISSING = object()
+
+
+class _Entry:
+    """Parsed contents of one file plus everything derived from that exact version."""
+
+    __slots__ = ("key", "signature", "data", "version", "log_offset", "derived")
+
+    def __init__(
+        self, key: str, signature: tuple, data: Any, version: int, log_offset: int = 0
+    ) -> None:
+        self.key = key
+        self.signature = signature
+        self.data = data
+        self.version = version
+        self.log_offset = log_offset
+        self.derived: dict[str, Any] = {}
+
+
+_entries: dict[str, _Entry] = {}
+_lock = threading.Lock()
+_versions = itertools.count(1)
+
+
+def _key(path: PathLike) -> str:
+    return str(Path(path).resolve())
+
+
+def _collection(key: str) -> Optional[str]:
+    """
+    Name of the SQLite collection that backs a data file, or None when the file is served from
+    disk (JSON backend, or a file outside DATA_DIR).
+    """
+    if STORAGE_BACKEND != "sqlite":
+        return None
+    path = Path(key)
+    if path.suffix != ".json" or path.parent != DATA_DIR.resolve():
+        return None
+    return path.stem
+
+
+def _signature(path: str) -> Optional[tuple]:
+    """
+    Cheap fingerprint of a file on disk. mtime and size alone miss a same-size rewrite within the
+    filesystem's timestamp granularity; the inode catches it, since every snapshot write renames a
+    new file into place (_write_atomic).
+
+    Returns:
+        Optional[tuple]: (mtime_ns, size, inode), or None if the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _log_path(key: str) -> str:
+    """
+    Path of the append-only JSON-Lines log that sits next to a dataset (reviews.json ->
+    reviews.jsonl).
+    """
+    return os.path.splitext(key)[0] + ".jsonl"
+
+
+def _read(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_temp(path: str, data: Any, **dump_kwargs: Any) -> str:
+    """
+    Writes JSON to a new temporary file next to path (flushed to disk) and returns its path.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)  # mkstemp creates files as 0600
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def _write_atomic(path: str, data: Any, **dump_kwargs: Any) -> None:
+    """
+    Writes JSON to a temporary file in the same directory and renames it over the target, so a
+    reader sees either the old file or the new one, never a half-written file.
+    """
+    tmp_path = _write_temp(path, data, **dump_kwargs)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _retired_logs(key: str) -> list[str]:
+    """
+    Logs that save() moved aside and has not deleted yet (see save). Named
+    "<log>.compacting-<inode of the snapshot that includes them>".
+    """
+    return glob.glob(glob.escape(_log_path(key)) + ".compacting-*")
+
+
+def _recover_log(key: str) -> None:
+    """
+    Finishes a save() that stopped between moving the log aside and deleting it. If the snapshot
+    on disk is the one the log was folded into, the log is deleted; otherwise the snapshot was
+    never replaced and the log is put back. Must be called under the file's lock.
+    """
+    for retired in _retired_logs(key):
+        snapshot = _signature(key)
+        if snapshot is not None and str(snapshot[2]) == retired.rsplit("-", 1)[1]:
+            os.remove(retired)
+        else:
+            # No new log can exist: every writer runs this first, under the same lock
+            os.replace(retired, _log_path(key))
+
+
+def _read_log(log_path: str, offset: int = 0) -> tuple[list, int]:
+    """
+    Parses the complete lines of an append log, starting at a byte offset. A trailing line without
+    a newline is still being written and is left for the next read.
+
+    Returns:
+        tuple[list, int]: Parsed records and the offset just past the last complete line.
+    """
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return [], offset
+
+    end = chunk.rfind(b"\n") + 1
+    records = [json.loads(line) for line in chunk[:end].splitlines() if line.strip()]
+    return records, offset + end
+
+
+def _read_with_log(key: str) -> tuple[Any, int]:
+    """
+    Reads a snapshot and replays its append log on top of it, after finishing any interrupted
+    save (see _recover_log).
+
+    Returns:
+        tuple[Any, int]: Parsed data and the log offset that was consumed.
+    """
+    if _retired_logs(key):
+        with file_lock(key):
+            _recover_log(key)
+
+    log_records, log_offset = _read_log(_log_path(key))
+    try:
+        data = _read(key)
+    except FileNotFoundError:
+        if not log_records:
+            raise
+        data = []  # Nothing compacted yet: the log is the whole dataset
+
+    if log_records:
+        data.extend(log_records)
+    return data, log_offset
+
+
+def load(path: PathLike, default: Any = _MISSING, for_update: bool = False) -> Any:
+    """
+    Returns the parsed contents of a JSON data file (plus any records appended to its log),
+    reusing the cached copy while the files are unchanged on disk.
+
+    The cached object is shared between every caller, so it must be treated as read-only. Code that
+    mutates what it loads (load -> modify -> save) must pass for_update=True to get a private copy.
+
+    Args:
+        path (PathLike): Path to the JSON file.
+        default (Any, optional): Returned when the file is missing or not valid JSON. If omitted, the
+            underlying FileNotFoundError / JSONDecodeError is raised instead.
+        for_update (bool, optional): Read a private, mutable copy straight from disk. Defaults to False.
+
+    Returns:
+        Any: Parsed JSON contents (normally a list of dicts).
+    """
+    key = _key(path)
+    collection = _collection(key)
+
+    if for_update:
+        try:
+            if collection is not None:
+                return sqlite_store.load_collection(collection)
+            with file_lock(key):
+                return _read_with_log(key)[0]
+        except (FileNotFoundError, json.JSONDecodeError):
+            if default is _MISSING:
+                raise
+            return type(default)(default) if isinstance(default, (list, dict)) else default
+
+    if collection is not None:
+        return _load_sqlite(key, collection, default)
+
+    # Stat before reading: if a file is replaced mid-read the stored signature is the older one,
+    # so the next call reloads instead of serving stale data forever.
+    signature = (_signature(key), _signature(_log_path(key)))
+    with _lock:
+        entry = _entries.get(key)
+    if entry is not None and entry.signature == signature and signature != (None, None):
+        return entry.data
+
+    try:
+        if signature[1] is None:
+            data, log_offset = _read_with_log(key)  # Atomic renames make a lone snapshot safe to read
+        else:
+            # Snapshot + log must come from the same moment: compaction rewrites one, then empties
+            # the other
+            with file_lock(key):
+                if (
+                    entry is not None
+                    and entry.signature[0] == signature[0]
+                    and signature[1][1] >= entry.log_offset
+                ):
+                    # Only the log grew: parse just the new lines and keep the parsed snapshot
+                    new_records, log_offset = _read_log(_log_path(key), entry.log_offset)
+                    data = entry.data + new_records
+                else:
+                    data, log_offset = _read_with_log(key)
+    except (FileNotFoundError, json.JSONDecodeError):
+        if default is _MISSING:
+            raise
+        return default
+
+    with _lock:
+        current = _entries.get(key)
+        if current is None or current is entry:
+            current = _Entry(key, signature, data, next(_versions), log_offset)
+            _entries[key] = current
+        return current.data
+
+
+def _load_sqlite(key: str, collection: str, default: Any) -> Any:
+    """
+    Cached load of a SQLite collection. The collection's write counter plays the role of the file
+    signature, so every process sees the others' writes.
+    """
+    db_version = sqlite_store.collection_version(collection)
+    signature = ("sqlite", db_version)
+    with _lock:
+        entry = _entries.get(key)
+    if entry is not None and entry.signature == signature and db_version is not None:
+        return entry.data
+
+    try:
+        data = sqlite_store.load_collection(collection)
+    except FileNotFoundError:
+        if default is _MISSING:
+            raise
+        return default
+
+    with _lock:
+        current = _entries.get(key)
+        if current is None or current is entry:
+            current = _Entry(key, signature, data, next(_versions))
+            _entries[key] = current
+        return current.data
+
+
+def save(path: PathLike, data: Any, **dump_kwargs: Any) -> None:
+    """
+    Writes a dataset back to disk, empties its append log and drops the cached copy. The file is
+    replaced atomically under the file's lock; callers doing load -> modify -> save should hold
+    the same lock (locks.locked) for the whole sequence.
+
+    Replacing the snapshot and emptying the log cannot be one atomic step, so the log is first
+    renamed aside under a name holding the new snapshot's inode, and deleted once the snapshot is
+    in place. After a crash in between, the next load or write sees from the inode whether the
+    snapshot was replaced, and deletes the old log (its records are in the snapshot) or restores
+    it (they are not). Records are never lost or replayed twice.
+
+    Args:
+        path (PathLike): Path to the JSON file.
+        data (Any): Data to serialize.
+        **dump_kwargs: Forwarded to json.dump (e.g. indent=4). Defaults to indent=4.
+    """
+    key = _key(path)
+    dump_kwargs.setdefault("indent", 4)
+
+    collection = _collection(key)
+    if collection is not None:
+        sqlite_store.save_collection(collection, data)
+        invalidate(key)
+        return
+
+    with file_lock(key):
+        _recover_log(key)
+        tmp_path = _write_temp(key, data, **dump_kwargs)
+        try:
+            retired = None
+            if os.path.exists(_log_path(key)):
+                # Everything in the log is now part of the new snapshot
+                retired = f"{_log_path(key)}.compacting-{os.stat(tmp_path).st_ino}"
+                os.replace(_log_path(key), retired)
+            os.replace(tmp_path, key)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if retired is not None:
+            os.remove(retired)
+
+    invalidate(key)
+
+
+def append(path: PathLike, records: list, **dump_kwargs: Any) -> None:
+    """
+    Adds records to a dataset by appending them to its JSON-Lines log, so an insert costs one small
+    write instead of rewriting the whole file. The log is folded back into the snapshot once it
+    grows past APPEND_LOG_COMPACT_BYTES.
+
+    Args:
+        path (PathLike): Path to the JSON file (the log lives next to it).
+        records (list): Records to add.
+        **dump_kwargs: Forwarded to json.dump when the log is compacted. Defaults to indent=4.
+    """
+    key = _key(path)
+
+    collection = _collection(key)
+    if collection is not None:
+        sqlite_store.append_records(collection, records)
+        return
+
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+
+    with file_lock(key):
+        _recover_log(key)
+        with open(_log_path(key), "a", encoding="utf-8") as f:
+            f.write(lines)
+        log_size = os.path.getsize(_log_path(key))
+
+    if log_size > APPEND_LOG_COMPACT_BYTES:
+        compact(key, **dump_kwargs)
+
+
+def compact(path: PathLike, **dump_kwargs: Any) -> None:
+    """
+    Folds a dataset's append log into its snapshot and empties the log.
+
+    Args:
+        path (PathLike): Path to the JSON file.
+        **dump_kwargs: Forwarded to json.dump. Defaults to indent=4.
+    """
+    key = _key(path)
+    if _collection(key) is not None:
+        return  # SQLite appends go straight into the table: nothing to fold
+
+    with file_lock(key):
+        save(key, load(key, default=[], for_update=True), **dump_kwargs)
+
+
+def find(path: PathLike, field: str, value: Any) -> list:
+    """
+    Returns every record of a dataset whose field equals value. With the SQLite backend this is an
+    indexed query; with JSON files it uses a field -> records lookup table built once per version.
+    Like load(), the returned records are shared and must be treated as read-only.
+
+    Args:
+        path (PathLike): Path to the JSON file.
+        field (str): Field to match (e.g. "businessID").
+        value (Any): Value to match.
+
+    Returns:
+        list: Matching records, in dataset order (empty if the dataset does not exist).
+    """
+    key = _key(path)
+    collection = _collection(key)
+    if collection is not None:
+        return sqlite_store.find(collection, field, value)
+
+    def build(records: list) -> dict:
+        groups: dict[Any, list] = {}
+        for record in records:
+            groups.setdefault(record.get(field), []).append(record)
+        return groups
+
+    data = load(key, default=[])
+    return derived(data, f"find:{field}", build).get(value, [])
+
+
+def load_json_files(data_dir: PathLike = DATA_DIR):
+    """
+    Reads every *.json dataset in a directory straight from disk (snapshot plus append log),
+    skipping anything that is not a list of records. Used to migrate between backends.
+
+    Args:
+        data_dir (PathLike, optional): Directory to scan. Defaults to config DATA_DIR.
+
+    Yields:
+        tuple[str, list]: Dataset name (file stem) and its records.
+    """
+    for path in sorted(Path(data_dir).glob("*.json")):
+        data = _read_with_log(str(path.resolve()))[0]
+        if isinstance(data, list):
+            yield path.stem, data
+
+
+def invalidate(path: PathLike) -> None:
+    """
+    Forgets the cached copy of a file. Needed after in-process writes, since two writes within the
+    filesystem's timestamp granularity can leave mtime and size unchanged.
+
+    Args:
+        path (PathLike): Path to the JSON file.
+    """
+    with _lock:
+        _entries.pop(_key(path), None)
+
+
+def signature(path: PathLike) -> tuple:
+    """
+    Fingerprint of a dataset's current contents that every process computes identically: the
+    (mtime_ns, size, inode) of the snapshot and its append log, or the SQLite write counter.
+
+    Args:
+        path (PathLike): Path to the JSON file.
+
+    Returns:
+        tuple: Fingerprint that changes whenever the dataset is written.
+    """
+    key = _key(path)
+    collection = _collection(key)
+    if collection is not None:
+        return ("sqlite", sqlite_store.collection_version(collection))
+    return (_signature(key), _signature(_log_path(key)))
+
+
+def version(path: PathLike) -> Optional[int]:
+    """
+    Returns the in-process version number of the cached copy of a file. Versions increase every
+    time the file is re-parsed.
+
+    Args:
+        path (PathLike): Path to the JSON file.
+
+    Returns:
+        Optional[int]: Version of the cached copy, or None if the file is not cached.
+    """
+    with _lock:
+        entry = _entries.get(_key(path))
+        return entry.version if entry is not None else None
+
+
+def source(data: Any) -> Optional[tuple[str, tuple]]:
+    """
+    Finds which file version an object returned by load() came from, e.g. to name files derived
+    from it on disk.
+
+    Args:
+        data (Any): Object previously returned by load().
+
+    Returns:
+        Optional[tuple[str, tuple]]: Resolved path and signature (as returned by signature()) of
+            the cached copy holding data, or None if data is not a cached dataset.
+    """
+    with _lock:
+        entry = next((e for e in _entries.values() if e.data is data), None)
+        return (entry.key, entry.signature) if entry is not None else None
+
+
+def derived(data: Any, name: str, builder: Callable[[Any], Any]) -> Any:
+    """
+    Memoizes a structure built from a cached dataset (an index, lookup table, etc.) for as long as
+    that dataset version stays current. If data is not a cached dataset (e.g. an already filtered
+    list), the structure is built and returned without being stored.
+
+    Objects that carry their own derived_cache dict (e.g. columnar.BusinessColumns) memoize there
+    instead, for as long as the object itself lives.
+
+    Args:
+        data (Any): Object previously returned by load().
+        name (str): Name of the derived structure, unique per dataset.
+        builder (Callable[[Any], Any]): Builds the structure from data.
+
+    Returns:
+        Any: The derived structure.
+    """
+    own_cache = getattr(data, "derived_cache", None)
+    if own_cache is not None:
+        with _lock:
+            if name in own_cache:
+                return own_cache[name]
+        value = builder(data)
+        with _lock:
+            return own_cache.setdefault(name, value)
+
+    with _lock:
+        entry = next((e for e in _entries.values() if e.data is data), None)
+        if entry is not None and name in entry.derived:
+            return entry.derived[name]
+
+    value = builder(data)  # Built outside the lock; a concurrent duplicate build is harmless
+
+    if entry is not None:
+        with _lock:
+            if _entries.get(entry.key) is entry:
+                value = entry.derived.setdefault(name, value)
+    return value
+
+
+def clear() -> None:
+    """Drops every cached dataset."""
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,195 @@
+"""
+./backend/storage/sqlite_store.py
+
+Optional SQLite storage backend. Every JSON data file becomes one table of JSON documents (kept in
+their original order), with real indexes on the id fields the managers filter by. Enabled with
+CNLC_STORAGE_BACKEND=sqlite; the repository then routes loads, saves, appends and lookups here.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from config.config import DATA_DIR, SQLITE_DB
+
+# Fields each collection is looked up by. Every one gets an index on json_extract(doc, '$.field').
+INDEXED_FIELDS = {
+    "businesses": ["id"],
+    "users": ["id", "username"],
+    "reviews": ["reviewId", "businessID", "userID", "username"],
+    "sessions": ["session_id", "username"],
+    "deals": ["dealId", "businessId"],
+    "saved_deals": ["userId", "dealId"],
+    "friends": ["user1Id", "user2Id"],
+    "friend_requests": ["requestId", "fromUserId", "toUserId"],
+    "receipts": ["receiptId", "businessId", "userId"],
+    "trending_points": ["businessId"],
+    "collections": ["collectionId", "userId"],
+    "saved_businesses": ["savedId", "userId", "businessId"],
+    "reservations": ["reservationId", "userId", "businessId"],
+    "notifications": ["notificationId", "userId"],
+    "recommendations_cache": ["userId"],
+}
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Returns this thread's connection, opening it on first use.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(SQLITE_DB), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")  # Readers never block the single writer
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (collection TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+        )
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+
+def _table(collection: str) -> str:
+    if not collection.replace("_", "").isalnum():
+        raise ValueError(f"ERROR: Invalid collection name: {collection}")
+    return f'"{collection}"'
+
+
+def _create(conn: sqlite3.Connection, collection: str) -> None:
+    table = _table(collection)
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {table} "
+        "(pos INTEGER PRIMARY KEY AUTOINCREMENT, doc TEXT NOT NULL)"
+    )
+    for field in INDEXED_FIELDS.get(collection, []):
+        conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "ix_{collection}_{field}" '
+            f"ON {table} (json_extract(doc, '$.{field}'))"
+        )
+    conn.execute(
+        "INSERT OR IGNORE INTO meta (collection, version) VALUES (?, 0)", (collection,)
+    )
+
+
+def _bump(conn: sqlite3.Connection, collection: str) -> None:
+    conn.execute("UPDATE meta SET version = version + 1 WHERE collection = ?", (collection,))
+
+
+def collection_version(collection: str) -> Optional[int]:
+    """
+    Returns a counter that increases on every write to a collection, shared by every process using
+    the database.
+
+    Args:
+        collection (str): Collection name (the JSON file's stem, e.g. "reviews").
+
+    Returns:
+        Optional[int]: Current version, or None if the collection has not been created.
+    """
+    row = _connect().execute(
+        "SELECT version FROM meta WHERE collection = ?", (collection,)
+    ).fetchone()
+    return row[0] if row is not None else None
+
+
+def load_collection(collection: str) -> list:
+    """
+    Loads every document of a collection, in insertion order.
+
+    Args:
+        collection (str): Collection name.
+
+    Raises:
+        FileNotFoundError: If the collection has not been created (mirrors a missing JSON file).
+
+    Returns:
+        list: Documents of the collection.
+    """
+    if collection_version(collection) is None:
+        raise FileNotFoundError(f"ERROR: Collection {collection} does not exist.")
+
+    rows = _connect().execute(f"SELECT doc FROM {_table(collection)} ORDER BY pos")
+    return [json.loads(doc) for (doc,) in rows]
+
+
+def save_collection(collection: str, records: list) -> None:
+    """
+    Replaces the whole contents of a collection.
+
+    Args:
+        collection (str): Collection name.
+        records (list): New documents, in order.
+    """
+    conn = _connect()
+    with conn:
+        _create(conn, collection)
+        conn.execute(f"DELETE FROM {_table(collection)}")
+        conn.executemany(
+            f"INSERT INTO {_table(collection)} (doc) VALUES (?)",
+            [(json.dumps(record),) for record in records],
+        )
+        _bump(conn, collection)
+
+
+def append_records(collection: str, records: list) -> None:
+    """
+    Adds documents to the end of a collection.
+
+    Args:
+        collection (str): Collection name.
+        records (list): Documents to add.
+    """
+    conn = _connect()
+    with conn:
+        _create(conn, collection)
+        conn.executemany(
+            f"INSERT INTO {_table(collection)} (doc) VALUES (?)",
+            [(json.dumps(record),) for record in records],
+        )
+        _bump(conn, collection)
+
+
+def find(collection: str, field: str, value: Any) -> list:
+    """
+    Returns every document whose field equals value, using the field's index.
+
+    Args:
+        collection (str): Collection name.
+        field (str): Field to match, ideally one of INDEXED_FIELDS[collection].
+        value (Any): Value to match.
+
+    Returns:
+        list: Matching documents, in insertion order.
+    """
+    if collection_version(collection) is None:
+        return []
+
+    rows = _connect().execute(
+        f"SELECT doc FROM {_table(collection)} "
+        f"WHERE json_extract(doc, '$.{field}') = ? ORDER BY pos",
+        (value,),
+    )
+    return [json.loads(doc) for (doc,) in rows]
+
+
+def migrate(data_dir: Union[str, Path] = DATA_DIR) -> dict[str, int]:
+    """
+    One-shot import of every data/*.json file (and any append log next to it) into the database.
+    Existing collections with the same names are replaced.
+
+    Args:
+        data_dir (Union[str, Path], optional): Directory holding the JSON files. Defaults to config DATA_DIR.
+
+    Returns:
+        dict[str, int]: Number of records imported per collection.
+    """
+    from backend.storage.repository import load_json_files
+
+    counts = {}
+    for collection, records in load_json_files(data_dir):
+        save_collection(collection, records)
+        counts[collection] = len(records)
+    return counts
@@ -0,0 +1,106 @@
+"""
+./backend/utils/cache.py
+
+Small in-memory LRU cache with a time-to-live, for query results that are cheap to keep and
+expensive to recompute. Hit/miss counters can be shared between caches so they survive a cache
+being replaced (e.g. when the dataset it was built from changes).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+MISSING = object()  # Returned by LRUCache.get when a key is absent or expired
+
+
+class CacheStats:
+    """
+    Thread-safe hit, miss, eviction and expiry counters.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_removal(self, expired: bool) -> None:
+        with self._lock:
+            if expired:
+                self.expirations += 1
+            else:
+                self.evictions += 1
+
+    def snapshot(self) -> dict:
+        """
+        Current counters plus the hit rate (hits / lookups, 0 before the first lookup).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class LRUCache:
+    """
+    Keeps at most max_entries values, dropping the least recently used first, and treats values
+    older than ttl seconds as absent.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, stats: Optional[CacheStats] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = stats if stats is not None else CacheStats()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Returns the value stored under key and marks it recently used, or default if the key is
+        absent or has expired. Counts as a hit or a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] >= self.ttl:
+                del self._entries[key]
+                self.stats.record_removal(expired=True)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        self.stats.record(hit=entry is not None)
+        return entry[1] if entry is not None else default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores value under key, evicting the least recently used entries if the cache is full.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.record_removal(expired=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -3,9 +3,72 @@
 
 Helper function with geolocation calculations and measurements using Haversine formula.
 """
-from typing import Any
+from typing import Any, Optional
+import heapq
 import math
 
+import numpy as np
+
+from config.config import SPATIAL_GRID_CELL_DEG
+
+EARTH_RADIUS_KM = 6371
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points, for one pair at a time.
+
+    Args:
+        lat1 (float): Latitude of the first point in degrees.
+        lon1 (float): Longitude of the first point in degrees.
+        lat2 (float): Latitude of the second point in degrees.
+        lon2 (float): Longitude of the second point in degrees.
+
+    Returns:
+        float: Distance in km.
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    a = math.sin((lat2_rad - lat1_rad) / 2) ** 2
+    a += math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def haversine_batch(lat: float, lon: float, lats: Any, lons: Any) -> np.ndarray:
+    """
+    Distances from one origin to many points at once.
+
+    Args:
+        lat (float): Origin latitude in degrees.
+        lon (float): Origin longitude in degrees.
+        lats (array-like): Latitudes of the other points in degrees.
+        lons (array-like): Longitudes of the other points in degrees.
+
+    Returns:
+        np.ndarray: Distance in km to each point (NaN where a coordinate is missing).
+    """
+    lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    lon_rad = np.radians(np.asarray(lons, dtype=np.float64))
+    return _haversine_rad(math.radians(lat), math.radians(lon), lat_rad, lon_rad, np.cos(lat_rad))
+
+
+def _haversine_rad(
+    lat_rad: float,
+    lon_rad: float,
+    lats_rad: np.ndarray,
+    lons_rad: np.ndarray,
+    cos_lats: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized haversine on coordinates already in radians, with cos(lat) precomputed for the
+    destination points.
+    """
+    a = np.sin((lats_rad - lat_rad) * 0.5) ** 2
+    a += math.cos(lat_rad) * cos_lats * np.sin((lons_rad - lon_rad) * 0.5) ** 2
+    np.clip(a, 0.0, 1.0, out=a)  # Float error can push a just past 1 for antipodal points
+    return (2 * EARTH_RADIUS_KM) * np.arcsin(np.sqrt(a))
+
+
 class Haversine:
     def __init__(
             self,
@@ -26,26 +89,12 @@ class Haversine:
         Returns:
             tuple: Contains all coordinates converted to radians and the differences between them.
         """
+        lat1_rad = math.radians(self.lat1)
+        lon1_rad = math.radians(self.lon1)
+        lat2_rad = math.radians(self.lat2)
+        lon2_rad = math.radians(self.lon2)
 
-        coords_deg = [[self.lat1, self.lon1], [self.lat2, self.lon2]]
-        coords_rad = []
-
-        for coord_set in coords_deg:
-            temp = []
-            for coord in coord_set:
-                coord_rad = coord * math.pi/180
-                temp.append(coord_rad)
-            coords_rad.append(temp)
-
-        lat1_rad = coords_rad[0][0]
-        lon1_rad = coords_rad[0][1]
-        lat2_rad = coords_rad[1][0]
-        lon2_rad = coords_rad[1][1]
-
-        delta_lat = lat2_rad - lat1_rad
-        delta_lon = lon2_rad - lon1_rad
-
-        return lat1_rad, lon1_rad, lat2_rad, lon2_rad, delta_lat, delta_lon
+        return lat1_rad, lon1_rad, lat2_rad, lon2_rad, lat2_rad - lat1_rad, lon2_rad - lon1_rad
 
     def haversine_of_central_ang(self) -> float:
         """
@@ -55,12 +104,7 @@ class Haversine:
         Returns:
             float: Returns the haversine of the central angle formed between the two coordinates.
         """
-        results = self.convert_to_radians()
-        lat1_rad = results[0]
-        lat2_rad = results[2]
-
-        delta_lat = results[4]
-        delta_lon = results[5]
+        lat1_rad, _, lat2_rad, _, delta_lat, delta_lon = self.convert_to_radians()
 
         a = (math.sin(delta_lat / 2)) ** 2
         a += math.cos(lat1_rad) * math.cos(lat2_rad) * (math.sin(delta_lon / 2)) ** 2
@@ -84,7 +128,381 @@ class Haversine:
         Returns:
             float: Final distance in km
         """
-        c = self.angular_distance()
-        r = 6371
-        d = r * c
-        return d
+        return haversine_km(self.lat1, self.lon1, self.lat2, self.lon2)
+
+
+class GeoColumns:
+    """
+    Coordinates of a list of businesses stored as NumPy columns, with radians and cos(lat)
+    precomputed once so every distance query is a single vectorized pass.
+    """
+
+    def __init__(self, businesses: list[dict]) -> None:
+        lats = np.array(
+            [b.get("latitude") for b in businesses], dtype=np.float64
+        )  # None becomes NaN
+        lons = np.array([b.get("longitude") for b in businesses], dtype=np.float64)
+        self.set_coordinates(lats, lons)
+
+    @classmethod
+    def from_arrays(cls, lats: np.ndarray, lons: np.ndarray) -> "GeoColumns":
+        """
+        Builds the columns from existing latitude/longitude arrays (in degrees).
+        """
+        columns = cls.__new__(cls)
+        columns.set_coordinates(np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64))
+        return columns
+
+    @classmethod
+    def from_precomputed(
+        cls,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        lat_rad: np.ndarray,
+        lon_rad: np.ndarray,
+        cos_lat: np.ndarray,
+    ) -> "GeoColumns":
+        """
+        Wraps columns whose radians and cos(lat) were computed ahead of time (e.g. memory-mapped
+        from a compiled business store), without copying them.
+        """
+        columns = cls.__new__(cls)
+        columns.lat = lats
+        columns.lon = lons
+        columns.lat_rad = lat_rad
+        columns.lon_rad = lon_rad
+        columns.cos_lat = cos_lat
+        columns.valid = ~(np.isnan(lats) | np.isnan(lons))
+        return columns
+
+    def set_coordinates(self, lats: np.ndarray, lons: np.ndarray) -> None:
+        self.lat = lats
+        self.lon = lons
+        self.lat_rad = np.radians(lats)
+        self.lon_rad = np.radians(lons)
+        self.cos_lat = np.cos(self.lat_rad)
+        self.valid = ~(np.isnan(lats) | np.isnan(lons))
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def distances(self, lat: float, lon: float, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Distances from a point to every business, or to the subset given by idx.
+
+        Args:
+            lat (float): Origin latitude in degrees.
+            lon (float): Origin longitude in degrees.
+            idx (np.ndarray, optional): Indices of the businesses to measure. Defaults to all.
+
+        Returns:
+            np.ndarray: Distance in km per business (NaN where coordinates are missing).
+        """
+        if idx is None:
+            return _haversine_rad(
+                math.radians(lat), math.radians(lon), self.lat_rad, self.lon_rad, self.cos_lat
+            )
+        return _haversine_rad(
+            math.radians(lat),
+            math.radians(lon),
+            self.lat_rad[idx],
+            self.lon_rad[idx],
+            self.cos_lat[idx],
+        )
+
+
+class SpatialGrid:
+    """
+    Uniform latitude/longitude grid over a list of businesses. Each cell holds the indices of the
+    businesses that fall inside it, so a radius query only needs to look at the cells overlapping
+    the search circle instead of every business.
+    """
+
+    def __init__(self, businesses: list[dict], cell_deg: float = SPATIAL_GRID_CELL_DEG) -> None:
+        self.build(GeoColumns(businesses), cell_deg)
+
+    @classmethod
+    def from_columns(
+        cls, columns: GeoColumns, cell_deg: float = SPATIAL_GRID_CELL_DEG
+    ) -> "SpatialGrid":
+        """
+        Builds a grid over precomputed coordinate columns.
+        """
+        grid = cls.__new__(cls)
+        grid.build(columns, cell_deg)
+        return grid
+
+    def build(self, columns: GeoColumns, cell_deg: float) -> None:
+        self.columns = columns
+        self.cell_deg = cell_deg
+        self.lon_cells = math.ceil(360 / cell_deg)
+        self.cells: dict[tuple[int, int], np.ndarray] = {}
+
+        valid_idx = np.flatnonzero(columns.valid)
+        rows = np.floor(columns.lat[valid_idx] / cell_deg).astype(np.int64)
+        cols = np.floor((columns.lon[valid_idx] + 180) / cell_deg).astype(np.int64) % self.lon_cells
+
+        keys = rows * self.lon_cells + cols
+        order = np.argsort(keys, kind="stable")  # Stable, so each cell stays in dataset order
+        sorted_keys = keys[order]
+        unique_keys, starts = np.unique(sorted_keys, return_index=True)
+
+        for key, members in zip(unique_keys.tolist(), np.split(valid_idx[order], starts[1:])):
+            row, col = divmod(key, self.lon_cells)
+            self.cells[(row, col)] = members
+
+        # Occupied cells as arrays, so nearest() can rank them by ring without probing empty ones
+        self.cell_keys = list(self.cells)
+        self.cell_rows = unique_keys // self.lon_cells
+        self.cell_cols = unique_keys % self.lon_cells
+
+    def cell_of(self, lat: float, lon: float) -> tuple[int, int]:
+        """
+        Returns the (row, column) of the cell containing a point.
+        """
+        row = math.floor(lat / self.cell_deg)
+        col = math.floor((lon + 180) / self.cell_deg) % self.lon_cells
+        return row, col
+
+    def candidate_cells(self, lat: float, lon: float, radius: float) -> list[tuple[int, int]]:
+        """
+        Returns every non-empty cell that overlaps the bounding box of the search circle.
+
+        The bounding box uses the exact spherical extent of the circle, so no business within the
+        radius can fall outside it (including near the poles and across the antimeridian).
+
+        Args:
+            lat (float): Latitude of the circle's centre.
+            lon (float): Longitude of the circle's centre.
+            radius (float): Radius in km.
+
+        Returns:
+            list[tuple[int, int]]: Keys of the cells to visit.
+        """
+        ang = radius / EARTH_RADIUS_KM
+        lat_min = lat - math.degrees(ang)
+        lat_max = lat + math.degrees(ang)
+
+        if lat_min <= -90 or lat_max >= 90 or math.sin(ang) >= math.cos(math.radians(lat)):
+            lon_span = 180.0  # Circle contains a pole: every longitude is reachable
+        else:
+            lon_span = math.degrees(math.asin(math.sin(ang) / math.cos(math.radians(lat))))
+
+        row_min = math.floor(max(lat_min, -90) / self.cell_deg)
+        row_max = math.floor(min(lat_max, 90) / self.cell_deg)
+
+        if lon_span >= 180:
+            cols = range(self.lon_cells)
+        else:
+            col_min = math.floor((lon - lon_span + 180) / self.cell_deg)
+            col_max = math.floor((lon + lon_span + 180) / self.cell_deg)
+            cols = range(col_min, min(col_max, col_min + self.lon_cells - 1) + 1)
+
+        box_size = (row_max - row_min + 1) * len(cols)
+        if box_size > len(self.cells):
+            # Huge radius: cheaper to walk the occupied cells than every cell in the box
+            col_set = {c % self.lon_cells for c in cols}
+            return [
+                key for key in self.cells
+                if row_min <= key[0] <= row_max and key[1] in col_set
+            ]
+
+        keys = []
+        for row in range(row_min, row_max + 1):
+            for col in cols:
+                key = (row, col % self.lon_cells)
+                if key in self.cells:
+                    keys.append(key)
+        return keys
+
+    def candidates(self, lat: float, lon: float, radius: float) -> np.ndarray:
+        """
+        Indices of every business in a cell overlapping the search circle (a superset of the
+        businesses actually within the radius).
+        """
+        keys = self.candidate_cells(lat, lon, radius)
+        if not keys:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.cells[key] for key in keys])
+
+    def query_radius(
+        self, lat: float, lon: float, radius: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds every business strictly within a radius of a point.
+
+        Args:
+            lat (float): User's latitude.
+            lon (float): User's longitude.
+            radius (float): Radius in km.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Indices into businesses (in dataset order) and their
+                distances in km.
+        """
+        idx = self.candidates(lat, lon, radius)
+        distances = self.columns.distances(lat, lon, idx)
+        inside = distances < radius
+
+        idx = idx[inside]
+        distances = distances[inside]
+        order = np.argsort(idx)
+        return idx[order], distances[order]
+
+    def query_bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ) -> np.ndarray:
+        """
+        Finds every business inside a latitude/longitude box (edges included). A box whose
+        min_lon is greater than its max_lon wraps across the antimeridian.
+
+        Args:
+            min_lat (float): Southern edge.
+            min_lon (float): Western edge.
+            max_lat (float): Northern edge.
+            max_lon (float): Eastern edge.
+
+        Returns:
+            np.ndarray: Indices into businesses, in dataset order.
+        """
+        if not self.cells or min_lat > max_lat:
+            return np.empty(0, dtype=np.int64)
+
+        row_min = math.floor(min_lat / self.cell_deg)
+        row_max = math.floor(max_lat / self.cell_deg)
+        col_min = min(math.floor((min_lon + 180) / self.cell_deg), self.lon_cells - 1)
+        col_max = min(math.floor((max_lon + 180) / self.cell_deg), self.lon_cells - 1)
+        wraps = min_lon > max_lon
+
+        # Pick occupied cells from the cell arrays, so a zoomed-out box never walks empty cells
+        in_rows = (self.cell_rows >= row_min) & (self.cell_rows <= row_max)
+        if wraps:
+            in_cols = (self.cell_cols >= col_min) | (self.cell_cols <= col_max)
+        else:
+            in_cols = (self.cell_cols >= col_min) & (self.cell_cols <= col_max)
+        keys = np.flatnonzero(in_rows & in_cols).tolist()
+        if not keys:
+            return np.empty(0, dtype=np.int64)
+
+        idx = np.concatenate([self.cells[self.cell_keys[k]] for k in keys])
+        lats, lons = self.columns.lat[idx], self.columns.lon[idx]
+        inside = (lats >= min_lat) & (lats <= max_lat)
+        if wraps:
+            inside &= (lons >= min_lon) | (lons <= max_lon)
+        else:
+            inside &= (lons >= min_lon) & (lons <= max_lon)
+        return np.sort(idx[inside])
+
+    def _ring_gap(self, lat: float, lon: float, row0: int, col0: int, ring: int) -> float:
+        """
+        Lower bound, in km, on the distance from a point to any business outside the cells within
+        `ring` steps of (row0, col0).
+        """
+        south = (row0 - ring) * self.cell_deg
+        north = (row0 + ring + 1) * self.cell_deg
+        gaps = []
+        if south > -90:
+            gaps.append(math.radians(lat - south) * EARTH_RADIUS_KM)
+        if north < 90:
+            gaps.append(math.radians(north - lat) * EARTH_RADIUS_KM)
+
+        if 2 * ring + 1 < self.lon_cells:
+            west = (col0 - ring) * self.cell_deg - 180
+            east = (col0 + ring + 1) * self.cell_deg - 180
+            delta = math.radians(min(lon - west, east - lon, 90))
+            # Closest approach to a meridian delta away is along the great circle crossing it
+            gaps.append(
+                EARTH_RADIUS_KM * math.asin(min(1.0, math.cos(math.radians(lat)) * math.sin(delta)))
+            )
+        return min(gaps) if gaps else math.inf
+
+    def nearest(self, lat: float, lon: float, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the k businesses closest to a point. Occupied cells are visited in rings moving
+        outward from the point's cell, with the k best so far kept in a bounded heap, until no
+        unvisited ring can be closer than the current k-th distance.
+
+        Args:
+            lat (float): User's latitude.
+            lon (float): User's longitude.
+            k (int): Number of businesses to return.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Indices into businesses and their distances in km,
+                closest first (ties broken by index). Fewer than k if the grid holds fewer.
+        """
+        if k <= 0 or not self.cells:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        row0, col0 = self.cell_of(lat, lon)
+        col_steps = np.abs(self.cell_cols - col0)
+        col_steps = np.minimum(col_steps, self.lon_cells - col_steps)  # Wrap across the antimeridian
+        rings = np.maximum(np.abs(self.cell_rows - row0), col_steps)
+        order = np.argsort(rings, kind="stable")
+        sorted_rings = rings[order]
+
+        heap: list[tuple[float, int]] = []  # (-distance, -index): the root is the worst kept
+        start = 0
+        while start < len(order):
+            ring = int(sorted_rings[start])
+            if len(heap) == k and -heap[0][0] <= self._ring_gap(lat, lon, row0, col0, ring - 1):
+                break  # Everything from this ring on is at least as far as the current k-th
+
+            end = int(np.searchsorted(sorted_rings, ring, side="right"))
+            members = order[start:end].tolist()
+            start = end
+
+            idx = np.concatenate([self.cells[self.cell_keys[m]] for m in members])
+            distances = self.columns.distances(lat, lon, idx)
+            if len(distances) > k:
+                # At most the k closest of this ring (plus ties) can make it into the heap
+                kth = np.partition(distances, k - 1)[k - 1]
+                keep = distances <= kth
+                idx, distances = idx[keep], distances[keep]
+            if len(heap) == k:
+                keep = distances <= -heap[0][0]  # Only candidates that can beat the current k-th
+                idx, distances = idx[keep], distances[keep]
+            for i, d in zip(idx.tolist(), distances.tolist()):
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d, -i))
+                elif (-d, -i) > heap[0]:
+                    heapq.heappushpop(heap, (-d, -i))
+
+        best = sorted((-d, -i) for d, i in heap)
+        return (
+            np.array([i for _, i in best], dtype=np.int64),
+            np.array([d for d, _ in best], dtype=np.float64),
+        )
+
+
+def cluster_points(columns: GeoColumns, idx: np.ndarray, cell_deg: float) -> list[dict]:
+    """
+    Groups businesses into square lat/lon cells and summarizes each occupied cell by its number
+    of businesses and their centroid.
+
+    Args:
+        columns (GeoColumns): Coordinate columns the indices point into.
+        idx (np.ndarray): Indices of the businesses to group (all with coordinates).
+        cell_deg (float): Side of one cluster cell in degrees.
+
+    Returns:
+        list[dict]: One {"lat", "lon", "count"} per cluster, largest first.
+    """
+    if len(idx) == 0:
+        return []
+    lats, lons = columns.lat[idx], columns.lon[idx]
+    rows = np.floor(lats / cell_deg).astype(np.int64)
+    cols = np.floor((lons + 180) / cell_deg).astype(np.int64)
+    keys = rows * (math.ceil(360 / cell_deg) + 1) + cols
+
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    mean_lats = np.bincount(inverse, weights=lats) / counts
+    mean_lons = np.bincount(inverse, weights=lons) / counts
+
+    order = np.argsort(-counts, kind="stable")
+    return [
+        {"lat": round(lat, 6), "lon": round(lon, 6), "count": count}
+        for lat, lon, count in zip(
+            mean_lats[order].tolist(), mean_lons[order].tolist(), counts[order].tolist()
+        )
+    ]
@@ -0,0 +1,127 @@
+"""
+./backend/utils/pagination.py
+
+Cursor pagination for list endpoints. A cursor is an opaque string holding the dataset version,
+the query and a position in the query's ordered results. The first page stores those ordered
+results server-side for CURSOR_TTL seconds, so every later page is a slice of that snapshot
+instead of a rerun of the query. Pages therefore stay consistent with each other (no repeats or
+gaps) even when the data is written to in between.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, Callable, Optional
+
+from backend.utils.cache import MISSING, CacheStats, LRUCache
+from config.config import CURSOR_CACHE_SIZE, CURSOR_TTL
+
+snapshot_stats = CacheStats()
+_snapshots = LRUCache(CURSOR_CACHE_SIZE, CURSOR_TTL, stats=snapshot_stats)
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not produced by this server (or was altered)."""
+
+
+class ExpiredCursor(ValueError):
+    """The cursor's snapshot is gone and the data has changed since, so it cannot be resumed."""
+
+
+def version_token(signature: Any) -> str:
+    """
+    Short, stable string for a dataset signature (see repository.signature).
+    """
+    return hashlib.sha1(repr(signature).encode()).hexdigest()[:16]
+
+
+def encode_cursor(kind: str, version: str, query: list, position: int) -> str:
+    payload = json.dumps([kind, version, query, position], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(kind: str, cursor: str) -> tuple[str, list, int]:
+    """
+    Reads a cursor made by encode_cursor for the same kind of listing.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or belongs to another listing.
+
+    Returns:
+        tuple[str, list, int]: Dataset version, query and position.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_kind, version, query, position = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor("ERROR: Invalid cursor.")
+
+    if (
+        cursor_kind != kind
+        or not isinstance(version, str)
+        or not isinstance(query, list)
+        or not isinstance(position, int)
+        or position < 0
+    ):
+        raise InvalidCursor("ERROR: Invalid cursor.")
+    return version, query, position
+
+
+def paginate(
+    kind: str,
+    version: str,
+    query: Optional[list],
+    build: Callable[[list], Any],
+    cursor: Optional[str],
+    limit: int,
+    size: Callable[[Any], int] = len,
+) -> tuple[Any, slice, Optional[str], list]:
+    """
+    Resolves one page of a cursor-paginated listing.
+
+    Without a cursor, build(query) is run for the current version and its result cached. With a
+    cursor, the cached result for the cursor's version and query is reused. If that has expired,
+    it is rebuilt, as long as the data is still at the cursor's version.
+
+    Args:
+        kind (str): Name of the listing, e.g. "reviews" (cursors only work for their own kind).
+        version (str): Current dataset version (see version_token).
+        query (list, optional): JSON-serializable parameters the results depend on. Required for
+            the first page; when resuming, None means "whatever the cursor was made for", and
+            anything else must match the cursor.
+        build (Callable[[list], Any]): Computes the ordered results from a query.
+        cursor (str, optional): Cursor from the previous page, or None for the first page.
+        limit (int): Page size.
+        size (Callable[[Any], int], optional): Number of items in a built result. Defaults to len.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or was made for a different query.
+        ExpiredCursor: If the snapshot expired and the data has changed since the cursor was made.
+
+    Returns:
+        tuple[Any, slice, Optional[str], list]: The full built result, the slice of it forming
+            this page, the cursor for the next page (None on the last page), and the query in
+            effect (the cursor's, when resuming).
+    """
+    position = 0
+    if cursor:
+        cursor_version, cursor_query, position = decode_cursor(kind, cursor)
+        # Round-trip through JSON so e.g. tuples compare equal to the lists they decode to
+        if query is not None and json.loads(json.dumps(query)) != cursor_query:
+            raise InvalidCursor("ERROR: Cursor belongs to a different query.")
+        query = cursor_query
+    else:
+        cursor_version = version
+
+    key = (kind, cursor_version, json.dumps(query, separators=(",", ":")))
+    results = _snapshots.get(key)
+    if results is MISSING:
+        if cursor_version != version:
+            raise ExpiredCursor("ERROR: Cursor has expired, reload the list.")
+        results = build(query)
+        _snapshots.put(key, results)
+
+    end = position + limit
+    next_cursor = encode_cursor(kind, cursor_version, query, end) if end < size(results) else None
+    return results, slice(position, end), next_cursor, query
@@ -0,0 +1,88 @@
+"""
+./backend/utils/projection.py
+
+Field projection for list endpoints (`?fields=id,name,address.city`): builds records holding only
+the requested keys, so map and card views do not pay for serializing and sending full records.
+"""
+
+import re
+from typing import Any, Optional
+
+FIELD_PATH = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+FieldSpec = dict[str, "FieldSpec"]  # key -> spec of its sub-fields ({} means the whole value)
+
+
+def parse_fields(raw: Optional[str]) -> Optional[FieldSpec]:
+    """
+    Parses a comma-separated list of field paths. Dots select keys inside nested objects (or
+    inside each object of a nested list), e.g. "address.city" or "replies.username".
+
+    Args:
+        raw (str, optional): Value of the fields parameter.
+
+    Raises:
+        ValueError: If a path is not made of dot-separated identifiers.
+
+    Returns:
+        Optional[FieldSpec]: Nested spec for project, or None when no fields were asked for
+            (return full records).
+    """
+    if raw is None:
+        return None
+    paths = [path.strip() for path in raw.split(",") if path.strip()]
+    if not paths:
+        return None
+
+    spec: FieldSpec = {}
+    whole: set[tuple[str, ...]] = set()
+    for path in paths:
+        if not FIELD_PATH.match(path):
+            raise ValueError(f"ERROR: Invalid field '{path}'.")
+        keys = tuple(path.split("."))
+        whole.add(keys)
+        node = spec
+        for key in keys:
+            node = node.setdefault(key, {})
+
+    # Asking for "address" and "address.city" returns the whole address
+    for keys in sorted(whole, key=len, reverse=True):  # Prefixes last, so they override
+        node = spec
+        for key in keys[:-1]:
+            node = node[key]
+        node[keys[-1]] = {}
+    return spec
+
+
+def project(record: Any, spec: Optional[FieldSpec]) -> Any:
+    """
+    Copy of record with only the keys in spec. Keys the record does not have are left out, and
+    sub-fields of values that are not objects (or lists of objects) return the value as is.
+
+    Args:
+        record (Any): Record to project (normally a dict).
+        spec (FieldSpec, optional): Output of parse_fields. None returns record unchanged.
+
+    Returns:
+        Any: The projected record.
+    """
+    if not spec:
+        return record
+    if isinstance(record, dict):
+        return {
+            key: project(record[key], sub) if sub else record[key]
+            for key, sub in spec.items()
+            if key in record
+        }
+    if isinstance(record, list):
+        return [project(item, spec) for item in record]
+    return record
+
+
+def project_all(records: list[Any], spec: Optional[FieldSpec]) -> list[Any]:
+    """
+    project applied to every record of a list (the list itself when spec is None).
+    """
+    if not spec:
+        return records
+    return [project(record, spec) for record in records]
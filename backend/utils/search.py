@@ -4,10 +4,179 @@
 Helper functions for backend; DRY principle and modularity.
 """
 
+import bisect
+import heapq
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+import numpy as np
 from fuzzywuzzy import fuzz, process
 
+import backend.storage.repository as repo
+from backend.storage.columnar import CODED_FIELDS, BusinessColumns
 from backend.storage.json_handler import load_businesses
 
+MATCH_THRESHOLD = 85  # Both fuzzy scores must be strictly above this for a match
+# Part of every cache key and ETag that holds name matches. Bump it whenever the matching rules or
+# the name index change, so results computed by the old code are never served again.
+NAME_MATCH_VERSION = 2
+_NEVER = np.iinfo(np.int32).max  # Shared-gram count no name reaches
+
+
+def _qgrams(text: str, q: int) -> set[str]:
+    return {text[i : i + q] for i in range(len(text) - q + 1)}
+
+
+@lru_cache(maxsize=None)
+def _max_lost(length: int, q: int) -> int:
+    """
+    Most distinct q-grams a string of this length can fail to share with a string it still
+    partial_ratio-matches (see NameIndex).
+    """
+    worst = 0
+    for window in range(1, length + 1):
+        for common in range(min(length, window) + 1):
+            # partial_ratio is round(100 * 2 * common / (length + window)) at best; >= 85% keeps
+            # every alignment that could round above MATCH_THRESHOLD
+            if 200 * common < MATCH_THRESHOLD * (length + window):
+                continue
+            worst = max(worst, q * (length - common) + (q - 1) * (window - common))
+    return min(worst, max(length - q + 1, 0))
+
+
+class NameIndex:
+    """
+    Inverted bigram and trigram index over lowercased business names, used to narrow a fuzzy search
+    down to a candidate set before any Levenshtein scoring runs. It never drops a name that
+    match_indices would accept.
+
+    A match needs partial_ratio above MATCH_THRESHOLD, and partial_ratio scores the shorter string
+    s (the exact lowercased text, spaces included) against windows of the longer one that are at
+    most len(s) long. Its ratio is at most 2 * common / (len(s) + len(window)), where common is the
+    longest common subsequence, so only a few characters of s can be left out of the alignment
+    and only a few extra characters can be inserted from the window. Each character of s left out
+    breaks up to q of its q-grams, and each insertion (a transposition is one of each) splits
+    another q - 1. _max_lost takes the worst case over every window length and alignment the
+    threshold allows, so a real match shares at least (distinct q-grams of s - _max_lost) q-grams
+    with the other string. When that number is zero or less (short strings) nothing is filtered.
+    Bigrams keep the bound useful for short queries, trigrams are more selective on long ones,
+    and a name must pass both.
+    """
+
+    GRAM_SIZES = (2, 3)
+
+    def __init__(self, businesses: Union[list[dict], BusinessColumns]) -> None:
+        self.names: list[Optional[str]] = []
+        postings: dict[int, dict[str, list[int]]] = {q: {} for q in self.GRAM_SIZES}
+        need: dict[int, list[int]] = {q: [] for q in self.GRAM_SIZES}
+        lengths = []
+
+        if isinstance(businesses, BusinessColumns):
+            raw_names = businesses.names()
+        else:
+            raw_names = [business.get("name") for business in businesses]
+
+        for idx, name in enumerate(raw_names):
+            name = name.lower() if name is not None else None
+            self.names.append(name)
+
+            if name is None:
+                lengths.append(0)  # Compared with its own (unreachable) need, see candidates
+                for q in self.GRAM_SIZES:
+                    need[q].append(_NEVER)
+                continue
+
+            lengths.append(len(name))
+            for q in self.GRAM_SIZES:
+                grams = _qgrams(name, q)
+                for gram in grams:
+                    postings[q].setdefault(gram, []).append(idx)
+                need[q].append(len(grams) - _max_lost(len(name), q))
+
+        self.postings = {
+            q: {gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()}
+            for q, grams in postings.items()
+        }
+        self.need = {q: np.array(values, dtype=np.int32) for q, values in need.items()}
+        self.lengths = np.array(lengths, dtype=np.int32)
+
+    def candidates(self, query: str) -> list[int]:
+        """
+        Indices of the names that could score above MATCH_THRESHOLD for a query, in dataset order.
+
+        Args:
+            query (str): Lowercased search query.
+
+        Returns:
+            list[int]: Candidate indices into the indexed business list.
+        """
+        if len(query) <= 2:
+            # One or two characters: a match needs the query as an exact substring
+            return [
+                idx for idx, name in enumerate(self.names)
+                if name is not None and (query in name or len(name) < len(query))
+            ]
+
+        # The bound comes from whichever string partial_ratio treats as the shorter one
+        query_is_shorter = self.lengths >= len(query)
+        keep = np.ones(len(self.names), dtype=bool)
+        for q in self.GRAM_SIZES:
+            grams = _qgrams(query, q)
+            lists = [self.postings[q][gram] for gram in grams if gram in self.postings[q]]
+            shared = np.bincount(
+                np.concatenate(lists) if lists else np.empty(0, dtype=np.int32),
+                minlength=len(self.names),
+            )
+            need_query = len(grams) - _max_lost(len(query), q)
+            keep &= shared >= np.where(query_is_shorter, need_query, self.need[q])
+        return np.flatnonzero(keep).tolist()
+
+
+def name_index(businesses: list[dict]) -> NameIndex:
+    """
+    Bigram and trigram name index for a business list, built once per dataset version.
+    """
+    return repo.derived(businesses, "name_index", NameIndex)
+
+
+def match_indices(
+    businesses: list[dict], query: str, within: Optional[np.ndarray] = None
+) -> list[int]:
+    """
+    Indices of the businesses whose name fuzzy-matches a query. Only the candidates returned by the
+    name index are scored (it never drops a real match, see NameIndex).
+
+    Args:
+        businesses (list[dict]): Businesses searched through.
+        query (str): User query (the name of the business searched for).
+        within (np.ndarray, optional): Sorted indices to restrict the search to. Defaults to all.
+
+    Returns:
+        list[int]: Indices of the matching businesses, in dataset order.
+    """
+    results = []
+    index = name_index(businesses)
+    query = query.lower()
+
+    candidates = index.candidates(query)
+    if within is not None:
+        candidates = np.intersect1d(candidates, within, assume_unique=True).tolist()
+
+    for idx in candidates:
+        business_name = index.names[idx]
+        partial_ratio = fuzz.partial_ratio(query, business_name)
+        # Partial ratio: partial matches within string
+        if partial_ratio <= MATCH_THRESHOLD:
+            continue
+        token_set_ratio = fuzz.token_set_ratio(query, business_name)
+        # Token set ratio: For word order changes
+        if token_set_ratio > MATCH_THRESHOLD:
+            results.append(idx)
+
+    return results
+
 
 def search_by_text(businesses: list[dict], query: str) -> list[dict]:
     """
@@ -23,29 +192,359 @@ def search_by_text(businesses: list[dict], query: str) -> list[dict]:
     Returns:
         list[dict]: Contains the info for all businesses that were matched to the query.
     """
-    results = []
+    results = [businesses[idx] for idx in match_indices(businesses, query)]
 
-    for business in businesses:
-        business_name = business.get("name")
-        if (
-            business_name is not None
-        ):  # Check if None so that .lower() can be used without error
-            partial_ratio = fuzz.partial_ratio(query.lower(), business_name.lower())
-            # Partial ratio: partial matches within string
-            token_set_ratio = fuzz.token_set_ratio(query.lower(), business_name.lower())
-            # Token set ratio: For word order changes
-            if partial_ratio > 85 and token_set_ratio > 85:
-                results.append(business)
-        else:
+    if not results:
+        raise ValueError("ERROR: Query did not match any businesses.")
+        # Will be caught later and displayed in electron
+
+    return results
+
+
+def _rank(
+    businesses: list[dict],
+    query: str,
+    k: int,
+    within: Optional[np.ndarray],
+    matches: Optional[list[int]],
+) -> list[tuple[int, float]]:
+    """
+    Shared loop of top_k_indices and rank_matches. When matches is a list, every matching index is
+    appended to it (in dataset order), so token_set_ratio can no longer be skipped for names that
+    cannot enter the top k.
+    """
+    heap: list[tuple[float, int]] = []  # (score, -idx): heap[0] is the weakest kept match
+    index = name_index(businesses)
+    query = query.lower()
+
+    candidates = index.candidates(query) if k > 0 or matches is not None else []
+    if within is not None:
+        candidates = np.intersect1d(candidates, within, assume_unique=True).tolist()
+
+    for idx in candidates:
+        business_name = index.names[idx]
+        partial_ratio = fuzz.partial_ratio(query, business_name)
+        if partial_ratio <= MATCH_THRESHOLD:
             continue
+        if matches is None and len(heap) == k and (partial_ratio + 100) / 2 <= heap[0][0]:
+            continue  # Even a perfect token_set_ratio could not beat the weakest kept match
+
+        token_set_ratio = fuzz.token_set_ratio(query, business_name)
+        if token_set_ratio <= MATCH_THRESHOLD:
+            continue
+        if matches is not None:
+            matches.append(idx)
+
+        item = ((partial_ratio + token_set_ratio) / 2, -idx)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif k > 0 and item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    return [(-neg_idx, score) for score, neg_idx in sorted(heap, reverse=True)]
+
+
+def top_k_indices(
+    businesses: list[dict], query: str, k: int, within: Optional[np.ndarray] = None
+) -> list[tuple[int, float]]:
+    """
+    Ranked fuzzy search: keeps only the k best matches in a bounded heap instead of collecting
+    every match. The score is the mean of partial_ratio and token_set_ratio, and token_set_ratio is
+    skipped whenever partial_ratio alone shows the name cannot match or cannot enter the top k.
+    Candidates come from the same name index as match_indices, so the result equals sorting every
+    match.
+
+    Args:
+        businesses (list[dict]): Businesses searched through.
+        query (str): User query (the name of the business searched for).
+        k (int): Maximum number of results.
+        within (np.ndarray, optional): Sorted indices to restrict the search to. Defaults to all.
+
+    Returns:
+        list[tuple[int, float]]: (index, score) pairs, best first. Ties keep dataset order.
+    """
+    return _rank(businesses, query, k, within, None)
+
+
+def rank_matches(
+    businesses: list[dict], query: str, k: int, within: Optional[np.ndarray] = None
+) -> tuple[list[tuple[int, float]], list[int]]:
+    """
+    top_k_indices plus every match, for callers that also need the full result set (its size,
+    facet counts). The heap still holds only k entries.
+
+    Args:
+        businesses (list[dict]): Businesses searched through.
+        query (str): User query (the name of the business searched for).
+        k (int): Maximum number of ranked results.
+        within (np.ndarray, optional): Sorted indices to restrict the search to. Defaults to all.
+
+    Returns:
+        tuple[list[tuple[int, float]], list[int]]: The k best (index, score) pairs as
+            top_k_indices returns them, and the indices of every match, as match_indices
+            returns them.
+    """
+    matches: list[int] = []
+    ranked = _rank(businesses, query, k, within, matches)
+    return ranked, matches
+
+
+def search_top_k(businesses: list[dict], query: str, k: int) -> list[tuple[dict, float]]:
+    """
+    Ranked version of search_by_text that only keeps the k best matches.
+
+    Args:
+        businesses (list[dict]): Businesses searched through.
+        query (str): User query (the name of the business searched for).
+        k (int): Maximum number of results.
+
+    Raises:
+        ValueError: If the business was never found.
+
+    Returns:
+        list[tuple[dict, float]]: (business, score) pairs, best first. Ties keep dataset order.
+    """
+    results = [(businesses[idx], score) for idx, score in top_k_indices(businesses, query, k)]
 
     if not results:
         raise ValueError("ERROR: Query did not match any businesses.")
-        # Will be caught later and displayed in electron
 
     return results
 
 
+class FieldIndex:
+    """
+    Inverted index from each value of one field to the (sorted) indices of the businesses that
+    have it, plus a per-business value code for counting. Businesses without the field are grouped
+    under None.
+    """
+
+    def __init__(self, businesses: Union[list[dict], BusinessColumns], field: str) -> None:
+        if isinstance(businesses, BusinessColumns):
+            if field in CODED_FIELDS:
+                # Precompiled, no scan needed (code 0 is "missing")
+                self.values = [None] + businesses.vocabularies[field]
+                self.codes = businesses.codes[field]
+                self.groups = businesses.postings(field)
+                return
+            businesses = businesses.records(range(len(businesses)))
+
+        codes_by_value: dict = {}
+        codes = np.empty(len(businesses), dtype=np.int32)
+        groups: dict = {}
+        for idx, business in enumerate(businesses):
+            value = business.get(field)
+            codes[idx] = codes_by_value.setdefault(value, len(codes_by_value))
+            groups.setdefault(value, []).append(idx)
+
+        self.values = list(codes_by_value)
+        self.codes = codes
+        self.groups = {
+            value: np.array(ids, dtype=np.int64) for value, ids in groups.items()
+        }
+
+    def lookup(self, value) -> np.ndarray:
+        """
+        Sorted indices of the businesses whose field equals value (empty if there are none).
+        """
+        return self.groups.get(value, np.empty(0, dtype=np.int64))
+
+    def counts(self, indices: Optional[Sequence[int]] = None) -> dict:
+        """
+        Number of businesses per value of the field, most common first. Missing values are left
+        out.
+
+        Args:
+            indices (Sequence[int], optional): Businesses to count. Defaults to all.
+
+        Returns:
+            dict: Value -> count.
+        """
+        codes = self.codes if indices is None else self.codes[np.asarray(indices, dtype=np.int64)]
+        totals = np.bincount(codes, minlength=len(self.values))
+        present = [
+            (int(totals[code]), self.values[code])
+            for code in np.flatnonzero(totals).tolist()
+            if self.values[code] is not None
+        ]
+        present.sort(key=lambda item: -item[0])  # Stable: ties keep first-seen order
+        return {value: count for count, value in present}
+
+
+def field_index(businesses: list[dict], field: str) -> FieldIndex:
+    """
+    Inverted index over one field of a business list, built once per dataset version.
+    """
+    return repo.derived(businesses, f"field_index:{field}", lambda data: FieldIndex(data, field))
+
+
+class RatingIndex:
+    """
+    Business indices sorted by rating, so "rating >= x" is a binary search. Businesses without a
+    rating (or with a rating of 0) are left out, matching filter_by_min_rating.
+    """
+
+    def __init__(self, businesses: Union[list[dict], BusinessColumns]) -> None:
+        if isinstance(businesses, BusinessColumns):
+            ratings = np.asarray(businesses.rating)
+            rated_idx = np.flatnonzero(~np.isnan(ratings) & (ratings != 0))
+            # Stable sort of ascending indices: same (rating, index) order as below
+            self.order = rated_idx[np.argsort(ratings[rated_idx], kind="stable")]
+            self.ratings = ratings[self.order]
+            return
+
+        rated = []
+        for idx, business in enumerate(businesses):
+            rating = business.get("rating")
+            if rating and isinstance(rating, (int, float)):
+                rated.append((rating, idx))
+        rated.sort()
+
+        self.ratings = np.array([rating for rating, _ in rated], dtype=np.float64)
+        self.order = np.array([idx for _, idx in rated], dtype=np.int64)
+
+    def at_least(self, min_rating: float) -> np.ndarray:
+        """
+        Sorted indices of the businesses rated at least min_rating.
+        """
+        start = np.searchsorted(self.ratings, self._key(min_rating), side="left")
+        return np.sort(self.order[start:])
+
+    def count_at_least(self, min_rating: float) -> int:
+        return len(self.ratings) - int(np.searchsorted(self.ratings, self._key(min_rating), side="left"))
+
+    def _key(self, min_rating: float) -> np.ndarray:
+        # Compare in the ratings' own precision (float32 for columnar data), so 3.3 >= 3.3 holds
+        return np.asarray(min_rating, dtype=self.ratings.dtype)
+
+
+def rating_index(businesses: list[dict]) -> RatingIndex:
+    """
+    Rating index for a business list, built once per dataset version.
+    """
+    return repo.derived(businesses, "rating_index", RatingIndex)
+
+
+def normalize_name(text: str) -> str:
+    """
+    Lowercases a name, strips accents and turns every run of punctuation or whitespace into one
+    space, so "Café  d'Orsay" and "cafe d orsay" compare equal.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.split(r"[\W_]+", text)).strip()
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized business names and of every name suffix starting at a word (so
+    "garden ca" finds "Maple Garden Cafe"), searched with bisect for search-as-you-type.
+    """
+
+    def __init__(
+        self, businesses: Union[list[dict], BusinessColumns], busy_prefix_matches: int = 200
+    ) -> None:
+        if isinstance(businesses, BusinessColumns):
+            raw_names = businesses.names()
+        else:
+            raw_names = [business.get("name") for business in businesses]
+
+        entries = []
+        for idx, name in enumerate(raw_names):
+            if not isinstance(name, str):
+                continue
+            words = normalize_name(name).split(" ")
+            for start in range(len(words)):
+                if words[start]:
+                    entries.append((" ".join(words[start:]), idx))
+        entries.sort()
+
+        self.keys = [key for key, _ in entries]
+        self.owners = np.array([idx for _, idx in entries], dtype=np.int64)
+        self.busy_prefixes = self._find_busy_prefixes(busy_prefix_matches)
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect.bisect_left(self.keys, prefix)
+        return lo, bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo)
+
+    def _find_busy_prefixes(self, min_matches: int) -> list[str]:
+        """
+        Every prefix with more than min_matches entries. Each one extends a shorter busy prefix, so
+        the search walks down one character at a time and stops where prefixes get rare.
+        """
+        busy = []
+        level = [("", 0, len(self.keys))]
+        length = 0
+        while level:
+            length += 1
+            next_level = []
+            for _, lo, hi in level:
+                start = lo
+                while start < hi:
+                    key = self.keys[start]
+                    if len(key) < length:
+                        start += 1
+                        continue
+                    prefix = key[:length]
+                    end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start, hi)
+                    if end - start > min_matches:
+                        busy.append(prefix)
+                        next_level.append((prefix, start, end))
+                    start = end
+            level = next_level
+        return busy
+
+    def matches(self, prefix: str) -> np.ndarray:
+        """
+        Indices of the businesses with a name or name suffix starting with prefix (already
+        normalized), each once, in dataset order.
+        """
+        lo, hi = self._range(prefix)
+        return np.unique(self.owners[lo:hi])
+
+    def top(self, prefix: str, popularity: np.ndarray, limit: int) -> np.ndarray:
+        """
+        The limit most popular matches for a prefix, most popular first (ties by index).
+
+        Args:
+            prefix (str): Normalized prefix.
+            popularity (np.ndarray): Popularity per business, aligned with the indexed list.
+            limit (int): Maximum number of matches.
+
+        Returns:
+            np.ndarray: Business indices.
+        """
+        return _most_popular(self.matches(prefix), popularity, limit)
+
+    def busy_prefix_tops(self, popularity: np.ndarray, limit: int) -> dict[str, np.ndarray]:
+        """
+        Precomputes top() for every busy prefix (the ones with the most matches, which would
+        otherwise be the slowest to answer).
+        """
+        return {prefix: self.top(prefix, popularity, limit) for prefix in self.busy_prefixes}
+
+
+def _most_popular(indices: np.ndarray, popularity: np.ndarray, limit: int) -> np.ndarray:
+    if limit <= 0:
+        return indices[:0]
+    scores = popularity[indices]
+    if len(indices) > limit:
+        # Partial sort first; ties with the limit-th score stay in for the tie-break
+        kth = np.partition(-scores, limit - 1)[limit - 1]
+        keep = -scores <= kth
+        indices, scores = indices[keep], scores[keep]
+    return indices[np.lexsort((indices, -scores))][:limit]
+
+
+def prefix_index(businesses: list[dict], busy_prefix_matches: int = 200) -> PrefixIndex:
+    """
+    Prefix index over business names, built once per dataset version.
+    """
+    return repo.derived(
+        businesses, "prefix_index", lambda data: PrefixIndex(data, busy_prefix_matches)
+    )
+
+
 def filter_by_field(businesses: list[dict], field: str, value: str) -> list[dict]:
     """
     Generic filtering by field for more reusability in other code.
@@ -64,7 +563,7 @@ def filter_by_field(businesses: list[dict], field: str, value: str) -> list[dict
     results = []
 
     for business in businesses:
-        if business[field] == value:
+        if business.get(field) == value:  # Records without the field simply don't match
             results.append(business)
         else:
             continue
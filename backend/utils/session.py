@@ -5,11 +5,12 @@ This module provides utility functions for managing user sessions.
 """
 
 import datetime
-import json
 import secrets
 from typing import Optional
 
 import backend.storage.json_handler as jh
+import backend.storage.repository as repo
+from backend.storage.locks import locked
 from config.config import SESSIONS_JSON
 
 
@@ -87,6 +88,7 @@ class SessionManager:
 
         return session_info
 
+    @locked(SESSIONS_JSON)
     def destroy_session(self) -> None:
         """
         Deactivates all active sessions for this user.
@@ -94,7 +96,7 @@ class SessionManager:
         Raises:
             ValueError: If no active sessions are found for this user.
         """
-        sessions = jh.load_sessions()
+        sessions = jh.load_sessions(for_update=True)
 
         found_any = False
         for session in sessions:
@@ -106,10 +108,10 @@ class SessionManager:
         if not found_any:
             raise ValueError("ERROR: No active sessions found.")
 
-        with open(str(SESSIONS_JSON), "w") as f:
-            json.dump(sessions, f, indent=4)
+        repo.save(SESSIONS_JSON, sessions, indent=4)
 
     @staticmethod
+    @locked(SESSIONS_JSON)
     def cleanup_expired_sessions(days_to_keep: int = 5) -> int:
         """
         Removes inactive sessions older than the specified number of days.
@@ -120,7 +122,7 @@ class SessionManager:
         Returns:
             int: Number of sessions cleaned up.
         """
-        sessions = jh.load_sessions()
+        sessions = jh.load_sessions(for_update=True)
         cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days_to_keep)
 
         sessions_to_keep = []
@@ -136,7 +138,6 @@ class SessionManager:
                 cleanup_count += 1
 
         if cleanup_count > 0:
-            with open(str(SESSIONS_JSON), "w") as f:
-                json.dump(sessions_to_keep, f, indent=4)
+            repo.save(SESSIONS_JSON, sessions_to_keep, indent=4)
 
         return cleanup_count
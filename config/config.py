@@ -4,13 +4,14 @@
 Central configuration file for all paths and settings.
 """
 
+import os
 from pathlib import Path
 
 # Get project root (one level up from config directory)
 PROJECT_ROOT = Path(__file__).parent.parent
 
-# Data directory
-DATA_DIR = PROJECT_ROOT / "data"
+# Data directory (CNLC_DATA_DIR points the app at another dataset, e.g. one from tests/load)
+DATA_DIR = Path(os.environ.get("CNLC_DATA_DIR", PROJECT_ROOT / "data"))
 
 # All data file paths
 BUSINESSES_JSON = DATA_DIR / "businesses.json"
@@ -29,6 +30,20 @@ RESERVATIONS_JSON = DATA_DIR / "reservations.json"
 NOTIFICATIONS_JSON = DATA_DIR / "notifications.json"
 RECOMMENDATIONS_CACHE_JSON = DATA_DIR / "recommendations_cache.json"
 
+# Compiled, memory-mapped columns of businesses.json (backend/storage/columnar.py). Set
+# CNLC_COLUMNAR=0 to query the JSON list directly instead.
+BUSINESS_COLUMNS_DIR = DATA_DIR / "businesses.columns"
+COLUMNAR_BUSINESSES = os.environ.get("CNLC_COLUMNAR", "1") != "0"
+# Persistent business id -> position index for the JSON list (backend/storage/id_index.py)
+BUSINESS_ID_INDEX_DIR = DATA_DIR / "businesses.ids"
+
+# Append-only logs (reviews.jsonl, receipts.jsonl, ...) are folded into their snapshot past this size
+APPEND_LOG_COMPACT_BYTES = 1_000_000
+
+# Storage backend: "json" (files in DATA_DIR) or "sqlite" (SQLITE_DB, see scripts/migrate_to_sqlite.py)
+STORAGE_BACKEND = os.environ.get("CNLC_STORAGE_BACKEND", "json").lower()
+SQLITE_DB = Path(os.environ.get("CNLC_SQLITE_DB", DATA_DIR / "cnlc.sqlite3"))
+
 # Backend directories
 BACKEND_DIR = PROJECT_ROOT / "backend"
 MODELS_DIR = BACKEND_DIR / "models"
@@ -53,6 +68,30 @@ CORS_ORIGINS = "*"  # Change to specific origins in production
 # Session configuration
 SESSION_EXPIRY_DAYS = 7
 
+# Geo configuration
+SPATIAL_GRID_CELL_DEG = 0.05  # Side of one spatial index cell in degrees (~5.5 km of latitude)
+BATCH_MAX_IDS = 200  # Most businesses one /api/businesses/batch request can fetch
+NEAREST_MAX_K = 100  # Most businesses GET /api/businesses/nearest returns at once
+VIEWPORT_CLUSTER_ZOOM = 14  # Map zoom from which the viewport endpoint returns single businesses
+VIEWPORT_MAX_MARKERS = 300  # Above this many businesses in view, cluster even when zoomed in
+VIEWPORT_CLUSTER_PX = 60  # Side of one marker cluster on screen, in pixels
+QUERY_CACHE_ENABLED = os.environ.get("CNLC_QUERY_CACHE", "1") != "0"
+QUERY_CACHE_GRID_DEG = float(os.environ.get("CNLC_QUERY_CACHE_GRID_DEG", 0.01))  # Snap lat/lon to this grid (~1 km)
+QUERY_CACHE_SIZE = 512  # Cached business queries kept per dataset version
+QUERY_CACHE_TTL = 60  # Seconds a cached business query stays valid
+JSON_ENCODER = os.environ.get("CNLC_JSON_ENCODER", "orjson")  # "orjson" (stdlib if not installed) or "stdlib"
+COMPRESSION_MIN_BYTES = 1024  # Smaller response bodies are sent uncompressed
+COMPRESSION_GZIP_LEVEL = 6  # 1 (fastest) to 9 (smallest)
+COMPRESSION_BROTLI_QUALITY = 5  # 0 (fastest) to 11 (smallest); 4-6 suits on-the-fly compression
+COMPRESSION_CACHE_SIZE = 256  # Compressed bodies of ETag-carrying responses kept in memory
+COMPRESSION_CACHE_TTL = 300  # Seconds a compressed body stays cached
+CURSOR_TTL = 300  # Seconds the results behind a pagination cursor are kept server-side
+CURSOR_CACHE_SIZE = 256  # Paginated result snapshots kept at once
+CURSOR_PAGE_SIZE = 20  # Default limit for cursor-paginated reviews, notifications and deals
+SUGGEST_MAX_LIMIT = 20  # Most suggestions GET /api/businesses/suggest returns
+SUGGEST_PRECOMPUTE_MATCHES = 200  # Prefixes matching more names than this have suggestions precomputed
+SUGGEST_POPULARITY_TTL = 300  # Seconds before suggestion popularity (review/receipt counts) is recounted
+
 # Review configuration
 MAX_REVIEW_LENGTH = 1000
 MIN_RATING = 1
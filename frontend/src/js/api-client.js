@@ -129,12 +129,66 @@ export async function filterBusinesses(search, category, lat1, lon1, radius, min
     }
 }
 
+export async function suggestBusinesses(query, limit = 8) {
+    const params = new URLSearchParams({ q: query, limit: limit });
+    const url = `http://127.0.0.1:5001/api/businesses/suggest?${params.toString()}`;
+    const response = await fetch(url);
+    return await response.json();
+}
+
+export async function getBusinessesInViewport(bounds, zoom, category = null) {
+    const params = new URLSearchParams({
+        min_lat: bounds.getSouth(),
+        min_lon: bounds.getWest(),
+        max_lat: bounds.getNorth(),
+        max_lon: bounds.getEast(),
+        zoom: zoom,
+    });
+    if (category) {
+        params.append('category', category);
+    }
+
+    const url = `http://127.0.0.1:5001/api/businesses/viewport?${params.toString()}`;
+    const response = await fetch(url);
+    return await response.json();
+}
+
 export async function getBusinessById(businessId) {
     const url = `http://127.0.0.1:5001/api/businesses/${businessId}`;
     const response = await fetch(url);
     return await response.json();
 }
 
+const BATCH_MAX_IDS = 200; // Matches BATCH_MAX_IDS in config.py
+
+export async function getBusinessesByIds(businessIds, fields = null) {
+    const merged = { status: "success", businesses: [], count: 0, missing: [] };
+
+    for (let start = 0; start < businessIds.length; start += BATCH_MAX_IDS) {
+        const body = { ids: businessIds.slice(start, start + BATCH_MAX_IDS) };
+        if (fields) {
+            body.fields = fields;
+        }
+
+        const response = await fetch("http://127.0.0.1:5001/api/businesses/batch", {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+            },
+            body: JSON.stringify(body),
+        });
+        const result = await response.json();
+        if (result.status !== "success") {
+            return result;
+        }
+        merged.businesses.push(...result.businesses);
+        merged.missing.push(...result.missing);
+    }
+
+    merged.count = merged.businesses.length;
+    return merged;
+}
+
 export async function getReviewsForBusiness(businessId) {
     const url = `http://127.0.0.1:5001/api/reviews?business_id=${businessId}`;
     const response = await fetch(url);
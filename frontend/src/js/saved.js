@@ -10,7 +10,7 @@ import {
     getSavedBusinesses,
     unsaveBusiness,
     moveBusinessToCollection,
-    getBusinessById,
+    getBusinessesByIds,
 } from "./api-client.js";
 import { initNotifications } from "./notifications.js";
 
@@ -152,23 +152,23 @@ async function loadSavedBusinesses() {
         if (result.status === "success") {
             savedBusinesses = result.savedBusinesses;
 
-            // Fetch full business details
-            allBusinessDetails = await Promise.all(
-                savedBusinesses.map(async (saved) => {
-                    const businessResult = await getBusinessById(saved.businessId);
-                    if (businessResult.status === "success") {
-                        return {
-                            ...businessResult.business,
-                            dateSaved: saved.dateSaved,
-                            savedId: saved.savedId,
-                            collectionId: saved.collectionId,
-                        };
-                    }
-                    return null;
-                })
-            );
-
-            allBusinessDetails = allBusinessDetails.filter(b => b !== null);
+            // Fetch full business details in one request
+            const businessesById = {};
+            if (savedBusinesses.length > 0) {
+                const batch = await getBusinessesByIds(savedBusinesses.map(saved => saved.businessId));
+                if (batch.status === "success") {
+                    batch.businesses.forEach(business => { businessesById[business.id] = business; });
+                }
+            }
+
+            allBusinessDetails = savedBusinesses
+                .filter(saved => businessesById[saved.businessId])
+                .map(saved => ({
+                    ...businessesById[saved.businessId],
+                    dateSaved: saved.dateSaved,
+                    savedId: saved.savedId,
+                    collectionId: saved.collectionId,
+                }));
 
             // Update "All Saved" count
             if (currentCollectionId === "all") {
@@ -1,4 +1,4 @@
-import { requireAuth, logout, getSession, getTrending, uploadReceipt, getBusinessById, filterBusinesses } from "./api-client.js";
+import { requireAuth, logout, getSession, getTrending, uploadReceipt, getBusinessById, getBusinessesByIds, filterBusinesses } from "./api-client.js";
 import { initNotifications } from "./notifications.js";
 
 if (!requireAuth()) {
@@ -40,6 +40,18 @@ async function getBusinessName(businessId) {
     return null;
 }
 
+// Fill the cache for many businesses with one request
+async function cacheBusinesses(businessIds) {
+    const uncached = businessIds.filter(id => !businessNameCache[id]);
+    if (uncached.length === 0) return;
+    try {
+        const result = await getBusinessesByIds(uncached, "id,name,category");
+        if (result.status === "success") {
+            result.businesses.forEach(business => { businessNameCache[business.id] = business; });
+        }
+    } catch (e) { /* ignore */ }
+}
+
 // Populate the top 3 podium cards
 function populatePodiumCard(rank, trending, business) {
     const card = document.getElementById(`podium-${rank}`);
@@ -66,6 +78,8 @@ async function loadTrending() {
             return;
         }
 
+        await cacheBusinesses(result.trending.map(t => t.businessId));
+
         // Find max points for bar scaling
         const maxPoints = Math.max(...result.trending.map(t => t.points), 1);
 
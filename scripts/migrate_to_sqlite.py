@@ -0,0 +1,28 @@
+"""
+./scripts/migrate_to_sqlite.py
+
+One-shot migration of every data/*.json file into the SQLite database used when
+CNLC_STORAGE_BACKEND=sqlite. Safe to re-run: each collection is replaced with the current JSON
+contents.
+
+Usage: python scripts/migrate_to_sqlite.py [data_dir]
+"""
+
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.storage import sqlite_store
+from config.config import DATA_DIR, SQLITE_DB
+
+data_dir = sys.argv[1] if len(sys.argv) > 1 else DATA_DIR
+counts = sqlite_store.migrate(data_dir)
+
+print("=" * 60)
+for collection, count in counts.items():
+    print(f"{collection:<25} {count:>8} records")
+print(f"Migrated {len(counts)} collections into {SQLITE_DB}")
+print("=" * 60)
@@ -0,0 +1,51 @@
+"""
+./tests/benchmarks/conftest.py
+
+Fixtures for the microbenchmark suite. Every benchmark runs once per dataset size; each size is a
+synthetic dataset from tests/load/generate_data.py written into a scratch data directory that the
+app is pointed at through CNLC_DATA_DIR, so the real data/ folder is never touched.
+
+Sizes (number of businesses; reviews are 10x, users 1/2) default to 1000 and 10000 and can be
+overridden with CNLC_BENCH_SIZES=1000,10000,100000.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+if "CNLC_DATA_DIR" not in os.environ:
+    # Must happen before anything imports config
+    os.environ["CNLC_DATA_DIR"] = tempfile.mkdtemp(prefix="cnlc_bench_")
+
+SIZES = [int(s) for s in os.environ.get("CNLC_BENCH_SIZES", "1000,10000").split(",")]
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:  # The suite needs the benchmark fixture; skip it instead of erroring
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}biz")
+def dataset(request) -> dict:
+    """
+    Generates the dataset for one size into CNLC_DATA_DIR and returns its manifest. Session-scoped
+    and parametrized, so pytest runs every benchmark for one size before generating the next.
+    """
+    import backend.storage.repository as repo
+    from tests.load.generate_data import generate
+
+    size = request.param
+    manifest = generate(
+        os.environ["CNLC_DATA_DIR"],
+        businesses=size,
+        users=max(size // 2, 10),
+        reviews=size * 10,
+        receipts=size,
+        sessions=size // 2,
+        saved=size,
+        notifications=size * 2,
+        seed=size,
+    )
+    repo.clear()
+    return manifest
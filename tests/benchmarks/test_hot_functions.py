@@ -0,0 +1,168 @@
+"""
+./tests/benchmarks/test_hot_functions.py
+
+Microbenchmarks for the backend's hot paths, run with pytest-benchmark on every dataset size from
+conftest.py. "warm" benchmarks measure the steady state of a running server (dataset and indexes
+already cached); "cold" ones clear the storage cache before every round.
+
+Save a baseline, then compare later runs against it and fail on regressions:
+    pytest tests/benchmarks --benchmark-only --benchmark-save=baseline
+    pytest tests/benchmarks --benchmark-only --benchmark-compare --benchmark-compare-fail=median:15%
+"""
+
+import pytest
+
+import backend.core.business_manager as bm
+import backend.core.review_manager as rm
+import backend.core.saved_manager as sm
+import backend.core.trending_manager as tm
+import backend.storage.json_handler as jh
+import backend.storage.repository as repo
+import backend.utils.search as search
+from backend.utils.geo import Haversine
+
+OTTAWA = (45.4215, -75.6972)
+
+
+@pytest.fixture
+def businesses(dataset) -> list[dict]:
+    return jh.load_businesses()
+
+
+def test_haversine_final_distance(benchmark) -> None:
+    benchmark(Haversine(45.4215, -75.6972, 45.5019, -73.5674).final_distance)
+
+
+def test_filter_by_radius(benchmark, businesses) -> None:
+    bm.filter_by_radius(businesses, 5, *OTTAWA)  # Build the spatial index outside the timing
+    result = benchmark(bm.filter_by_radius, businesses, 5, *OTTAWA)
+    assert result
+
+
+def test_nearest_businesses(benchmark, businesses) -> None:
+    bm.nearest_businesses(businesses, *OTTAWA, 20)
+    result = benchmark(bm.nearest_businesses, businesses, *OTTAWA, 20)
+    assert len(result) == 20
+
+
+def test_search_by_text(benchmark, businesses) -> None:
+    benchmark(search.search_by_text, businesses, "maple garden")
+
+
+def test_filter_by_field(benchmark, businesses) -> None:
+    result = benchmark(search.filter_by_field, businesses, "category", "restaurant")
+    assert result
+
+
+def test_calculate_average_rating(benchmark, dataset) -> None:
+    business_id = dataset["business_ids"][0]  # The most-reviewed business
+    rm.calculate_average_rating(business_id)
+    assert benchmark(rm.calculate_average_rating, business_id) is not None
+
+
+def test_recalculate_all_points(benchmark, dataset) -> None:
+    benchmark(tm.recalculate_all_points)
+
+
+def test_get_collection_stats(benchmark, dataset) -> None:
+    user_id = dataset["user_ids"][0]
+    assert benchmark(sm.get_collection_stats, user_id)
+
+
+@pytest.mark.parametrize("loader", [jh.load_businesses, jh.load_users, jh.load_reviews, jh.load_sessions])
+def test_load_cold(benchmark, dataset, loader) -> None:
+    benchmark.pedantic(loader, setup=repo.clear, rounds=5)
+
+
+@pytest.mark.parametrize("loader", [jh.load_businesses, jh.load_users, jh.load_reviews, jh.load_sessions])
+def test_load_warm(benchmark, dataset, loader) -> None:
+    loader()
+    benchmark(loader)
+
+
+def test_save_users(benchmark, dataset) -> None:
+    users = jh.load_users(for_update=True)
+    benchmark.pedantic(jh.save_users, args=(users,), kwargs={"io_type": "w"}, rounds=5)
+
+
+def test_save_reviews(benchmark, dataset) -> None:
+    reviews = jh.load_reviews(for_update=True)
+    benchmark.pedantic(jh.save_reviews, args=(reviews,), kwargs={"io_type": "w"}, rounds=5)
+
+
+def test_append_review(benchmark, dataset) -> None:
+    review = dict(jh.load_reviews()[0])
+    benchmark(jh.save_reviews, [review], io_type="a")
+
+
+def test_load_save_sessions_roundtrip(benchmark, dataset) -> None:
+    def roundtrip() -> None:
+        sessions = jh.load_sessions(for_update=True)
+        jh.save_session(sessions[0], io_type="a")
+
+    benchmark.pedantic(roundtrip, rounds=5)
+
+
+@pytest.mark.parametrize("source", ["list", "columns"])
+def test_query_page(benchmark, dataset, source) -> None:
+    import backend.storage.columnar as columnar
+
+    businesses = jh.load_businesses() if source == "list" else columnar.load_columns()
+    kwargs = {"category": "restaurant", "lat": OTTAWA[0], "lon": OTTAWA[1], "radius": 5}
+    bm.query_page(businesses, 0, 30, **kwargs)
+    page, total, _, _ = benchmark(bm.query_page, businesses, 0, 30, **kwargs)
+    assert len(page) <= 30 and total
+
+
+def test_query_page_cached(benchmark, dataset) -> None:
+    import backend.storage.columnar as columnar
+
+    businesses = columnar.load_columns()
+    kwargs = {"category": "restaurant", "lat": OTTAWA[0], "lon": OTTAWA[1], "radius": 5, "use_cache": True}
+    bm.query_page(businesses, 0, 30, **kwargs)  # Fill the cache; every timed call is a hit
+    page, total, plan, _ = benchmark(bm.query_page, businesses, 0, 30, **kwargs)
+    assert plan.startswith("cache:hit") and len(page) <= 30 and total
+
+
+def test_businesses_by_ids(benchmark, dataset) -> None:
+    import random
+
+    import backend.storage.columnar as columnar
+
+    businesses = columnar.load_columns()
+    rng = random.Random(0)
+    ids = [int(businesses.ids[rng.randrange(len(businesses))]) for _ in range(50)]
+    bm.businesses_by_ids(businesses, ids)
+    found, missing = benchmark(bm.businesses_by_ids, businesses, ids)
+    assert len(found) == 50 and not missing
+
+
+def test_query_cursor_page_deep(benchmark, dataset) -> None:
+    import backend.storage.columnar as columnar
+
+    businesses = columnar.load_columns()
+    kwargs = {"lat": OTTAWA[0], "lon": OTTAWA[1], "radius": 10, "sort": "distance"}
+    _, _, cursor = bm.query_cursor_page(businesses, "bench", 30, **kwargs)
+    last = cursor
+    while cursor is not None:  # Walk to the last page; every timed call resumes there
+        last = cursor
+        _, _, cursor = bm.query_cursor_page(businesses, "bench", 30, cursor)
+    page, _, _ = benchmark(bm.query_cursor_page, businesses, "bench", 30, last)
+    assert page
+
+
+def test_query_page_by_distance(benchmark, dataset) -> None:
+    import backend.storage.columnar as columnar
+
+    businesses = columnar.load_columns()
+    kwargs = {"lat": OTTAWA[0], "lon": OTTAWA[1], "radius": 10, "sort_by_distance": True}
+    bm.query_page(businesses, 0, 30, **kwargs)
+    page, total, _, _ = benchmark(bm.query_page, businesses, 0, 30, **kwargs)
+    distances = [b["distance_km"] for b in page]
+    assert distances == sorted(distances) and total
+
+
+@pytest.mark.parametrize("query", ["m", "maple", "maple gar"])
+def test_suggest_businesses(benchmark, businesses, query) -> None:
+    bm.suggest_businesses(businesses, query)
+    benchmark(bm.suggest_businesses, businesses, query)
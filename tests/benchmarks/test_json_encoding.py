@@ -0,0 +1,37 @@
+"""
+./tests/benchmarks/test_json_encoding.py
+
+Response serialization with each encoder FastJSONProvider supports, on the two payload shapes that
+dominate traffic: a 30-business result page and a 1,000-review listing. Compare them with
+    pytest tests/benchmarks/test_json_encoding.py --benchmark-only --benchmark-group-by=param:payload
+"""
+
+import pytest
+
+import backend.core.business_manager as bm
+import backend.storage.repository as repo
+from backend.api.json_provider import FastJSONProvider, orjson
+from config.config import REVIEWS_JSON
+
+ENCODERS = ["stdlib", "orjson"] if orjson is not None else ["stdlib"]
+
+
+@pytest.fixture
+def payloads(dataset) -> dict:
+    page, total, _, _ = bm.query_page(bm.load_for_query(), 0, 30, lat=45.4215, lon=-75.6972)
+    reviews = repo.load(REVIEWS_JSON)[:1000]
+    return {
+        "business_page": {"status": "success", "businesses": page, "count": len(page), "total": total},
+        "reviews_1000": {"status": "success", "reviews": reviews, "count": len(reviews)},
+    }
+
+
+@pytest.mark.parametrize("payload", ["business_page", "reviews_1000"])
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_encode_response(benchmark, payloads, encoder, payload) -> None:
+    from backend.api.server import app
+
+    provider = FastJSONProvider(app, encoder)
+    obj = payloads[payload]
+    encoded = benchmark(provider.encode, obj)
+    assert provider.loads(encoded) == provider.loads(provider.dumps(obj))
@@ -0,0 +1,350 @@
+"""
+./tests/load/generate_data.py
+
+Generates a synthetic dataset (businesses, users, reviews, receipts, friends, sessions, ...) at a
+configurable scale, in the same format as data/*.json, for load testing. Also writes manifest.json
+with the id ranges and city centres that run_load.py uses to build realistic requests.
+
+Usage: python -m tests.load.generate_data --out /tmp/cnlc_load --businesses 100000 --reviews 1000000 --users 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from backend.core.trending_manager import calculate_points
+
+BUSINESS_ID_START = 1000000
+USER_ID_START = 10000000
+REVIEW_ID_START = 10000000
+LOAD_TEST_PASSWORD = "LoadTest123!"
+
+# (name, latitude, longitude, share of businesses, spread in degrees)
+CITIES = [
+    ("Ottawa", 45.4215, -75.6972, 0.35, 0.08),
+    ("Montreal", 45.5019, -73.5674, 0.30, 0.08),
+    ("Toronto", 43.6532, -79.3832, 0.25, 0.10),
+    ("Kingston", 44.2312, -76.4860, 0.10, 0.04),
+]
+CATEGORIES = [
+    ("restaurant", 0.30), ("cafe", 0.15), ("fast_food", 0.12), ("bar", 0.08), ("pub", 0.05),
+    ("clothes", 0.06), ("supermarket", 0.04), ("convenience", 0.05), ("bakery", 0.04),
+    ("hairdresser", 0.04), ("pharmacy", 0.03), ("books", 0.02), ("hardware", 0.02),
+]
+CUISINES = ["italian", "chinese", "indian", "pizza", "burger", "sushi", "mexican", "thai",
+            "vietnamese", "french", "greek", "lebanese", "coffee_shop", "sandwich", None]
+NAME_WORDS = ["Maple", "Golden", "Royal", "Garden", "Market", "Bistro", "Corner", "River", "Harbour",
+              "Urban", "Little", "Old", "Town", "House", "Kitchen", "Grill", "Spot", "Table", "Oak",
+              "Cedar", "Blue", "Red", "Green", "Sunny", "Lucky", "Happy", "North", "South", "Union"]
+STREETS = ["Bank St", "Rideau St", "Elgin St", "Somerset St", "Wellington St", "Queen St",
+           "King St", "Yonge St", "Rue Sainte-Catherine", "Boulevard Saint-Laurent", "Princess St"]
+REVIEW_TEXTS = ["Great business, really liked the vibe!", "Friendly staff and quick service.",
+                "Decent, but a bit overpriced.", "Would definitely come back.",
+                "Not my favourite, the wait was long.", "Hidden gem in the neighbourhood."]
+
+
+def _weighted(rng: random.Random, options: list[tuple]) -> str:
+    return rng.choices([o[0] for o in options], weights=[o[1] for o in options])[0]
+
+
+def _timestamp(rng: random.Random, days_back: int = 365) -> str:
+    return (datetime(2026, 1, 1) - timedelta(seconds=rng.randrange(days_back * 86400))).isoformat()
+
+
+def _write_json(path: Path, records: Iterable[dict]) -> int:
+    """
+    Streams records into a JSON array without holding the serialized file in memory.
+
+    Returns:
+        int: Number of records written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(record))
+            count += 1
+        f.write("\n]")
+    return count
+
+
+def generate_businesses(rng: random.Random, n: int) -> Iterator[dict]:
+    for i in range(n):
+        city, lat, lon, _, spread = rng.choices(CITIES, weights=[c[3] for c in CITIES])[0]
+        category = _weighted(rng, CATEGORIES)
+        yield {
+            "address": {
+                "city": city,
+                "country": "Canada",
+                "housenumber": str(rng.randint(1, 3000)),
+                "postcode": None,
+                "street": rng.choice(STREETS),
+            },
+            "category": category,
+            "cuisine": rng.choice(CUISINES) if category in ("restaurant", "fast_food", "cafe") else None,
+            "id": BUSINESS_ID_START + i,
+            "latitude": rng.gauss(lat, spread),
+            "longitude": rng.gauss(lon, spread * 1.4),
+            "name": " ".join(rng.sample(NAME_WORDS, rng.randint(1, 3))),
+            "opening_hours": rng.choice([None, "Mo-Fr 09:00-17:00", "Mo-Su 11:00-23:00"]),
+            "phone": None,
+            "website": None,
+            "rating": rng.choice([None, 1, 2, 3, 3, 4, 4, 4, 5, 5]),
+        }
+
+
+def generate_users(rng: random.Random, n: int, password_hash: str) -> Iterator[dict]:
+    for i in range(n):
+        city = rng.choices(CITIES, weights=[c[3] for c in CITIES])[0][0]
+        yield {
+            "id": USER_ID_START + i,
+            "username": f"loaduser{i}",
+            "email": f"loaduser{i}@example.com",
+            "phone": None,
+            "password_hash": password_hash,
+            "isActive": True,
+            "roles": ["user"],
+            "bookmarks": [],
+            "profile": {"firstName": "Load", "lastName": f"User{i}"},
+            "location": {"country": "Canada", "city": city},
+        }
+
+
+def _popular_business(rng: random.Random, n_businesses: int) -> int:
+    # Skewed towards low ids so a few businesses collect most of the activity, as in real traffic
+    return BUSINESS_ID_START + min(int(rng.paretovariate(1.2)) - 1, n_businesses - 1)
+
+
+def generate_reviews(rng: random.Random, n: int, n_businesses: int, n_users: int) -> Iterator[dict]:
+    for i in range(n):
+        user = rng.randrange(n_users)
+        yield {
+            "businessID": _popular_business(rng, n_businesses)
+            if rng.random() < 0.3
+            else BUSINESS_ID_START + rng.randrange(n_businesses),
+            "userID": USER_ID_START + user,
+            "username": f"loaduser{user}",
+            "rating": rng.randint(1, 5),
+            "review": rng.choice(REVIEW_TEXTS),
+            "helpful": rng.randint(0, 20),
+            "reviewId": REVIEW_ID_START + i,
+            "photos": [],
+            "replies": [],
+            "createdAt": _timestamp(rng),
+        }
+
+
+def generate_receipts(rng: random.Random, n: int, n_businesses: int, n_users: int) -> list[dict]:
+    return [
+        {
+            "receiptId": 40000000 + i,
+            "userId": USER_ID_START + rng.randrange(n_users),
+            "businessId": _popular_business(rng, n_businesses),
+            "amount": round(rng.uniform(5, 250), 2),
+            "receiptImagePath": f"receipts/load{i}.jpeg",
+            "submittedAt": _timestamp(rng, 30),
+            "verified": False,
+        }
+        for i in range(n)
+    ]
+
+
+def trending_from_receipts(receipts: list[dict]) -> list[dict]:
+    totals: dict[int, list] = {}
+    for r in receipts:
+        entry = totals.setdefault(r["businessId"], [0.0, 0])
+        entry[0] += r["amount"]
+        entry[1] += 1
+    return [
+        {
+            "businessId": business_id,
+            "totalSpent": round(spent, 2),
+            "points": calculate_points(spent),
+            "receiptCount": count,
+        }
+        for business_id, (spent, count) in totals.items()
+    ]
+
+
+def generate_friends(rng: random.Random, n_users: int, per_user: int) -> Iterator[dict]:
+    seen = set()
+    friendship_id = 50000000
+    for user in range(n_users):
+        for _ in range(per_user):
+            other = rng.randrange(n_users)
+            pair = (min(user, other), max(user, other))
+            if user == other or pair in seen:
+                continue
+            seen.add(pair)
+            friendship_id += 1
+            yield {
+                "friendshipId": friendship_id,
+                "user1Id": USER_ID_START + pair[0],
+                "user2Id": USER_ID_START + pair[1],
+                "since": _timestamp(rng),
+            }
+
+
+def generate_sessions(rng: random.Random, n_users: int, n: int) -> Iterator[dict]:
+    for i in range(n):
+        created = datetime(2026, 1, 1) - timedelta(hours=rng.randrange(24 * 30))
+        yield {
+            "username": f"loaduser{rng.randrange(n_users)}",
+            "session_id": f"loadsession{i:012d}",
+            "created_at": created.isoformat(),
+            "expiration": (created + timedelta(days=1)).isoformat(),
+            "is_active": rng.random() < 0.2,
+        }
+
+
+def generate_saved(rng: random.Random, n_users: int, n_businesses: int, n: int) -> tuple[list, list]:
+    collections = [
+        {"collectionId": i + 1, "userId": USER_ID_START + i, "name": "Saved", "createdAt": _timestamp(rng)}
+        for i in range(n_users)
+    ]
+    saved = []
+    for i in range(n):
+        user = rng.randrange(n_users)
+        saved.append({
+            "savedId": i + 1,
+            "userId": USER_ID_START + user,
+            "businessId": _popular_business(rng, n_businesses),
+            "collectionId": user + 1,
+            "dateSaved": _timestamp(rng),
+        })
+    return collections, saved
+
+
+def generate_notifications(rng: random.Random, n_users: int, n: int) -> Iterator[dict]:
+    for i in range(n):
+        yield {
+            "notificationId": 60000000 + i,
+            "userId": USER_ID_START + rng.randrange(n_users),
+            "type": rng.choice(["friend_request", "review_reply", "deal"]),
+            "title": "Load test notification",
+            "message": "Synthetic notification",
+            "relatedId": None,
+            "read": rng.random() < 0.5,
+            "createdAt": _timestamp(rng, 30),
+        }
+
+
+def generate(
+    out_dir: str,
+    businesses: int = 100_000,
+    users: int = 50_000,
+    reviews: int = 1_000_000,
+    receipts: int = 100_000,
+    friends_per_user: int = 5,
+    sessions: int = 50_000,
+    saved: int = 100_000,
+    notifications: int = 200_000,
+    seed: int = 42,
+) -> dict:
+    """
+    Writes a complete synthetic dataset to out_dir.
+
+    Args:
+        out_dir (str): Directory to write the JSON files into (created if missing).
+        businesses (int, optional): Number of businesses. Defaults to 100_000.
+        users (int, optional): Number of users. Defaults to 50_000.
+        reviews (int, optional): Number of reviews. Defaults to 1_000_000.
+        receipts (int, optional): Number of receipts. Defaults to 100_000.
+        friends_per_user (int, optional): Friendships started per user. Defaults to 5.
+        sessions (int, optional): Number of sessions. Defaults to 50_000.
+        saved (int, optional): Number of saved businesses. Defaults to 100_000.
+        notifications (int, optional): Number of notifications. Defaults to 200_000.
+        seed (int, optional): Random seed, so runs are reproducible. Defaults to 42.
+
+    Returns:
+        dict: The manifest (record counts, id ranges and city centres).
+    """
+    import backend.utils.password as pw
+
+    rng = random.Random(seed)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    password_hash = pw.hash_password(LOAD_TEST_PASSWORD)
+    receipt_records = generate_receipts(rng, receipts, businesses, users)
+    collection_records, saved_records = generate_saved(rng, users, businesses, saved)
+
+    counts = {}
+    for name, records in [
+        ("businesses", generate_businesses(rng, businesses)),
+        ("users", generate_users(rng, users, password_hash)),
+        ("reviews", generate_reviews(rng, reviews, businesses, users)),
+        ("receipts", receipt_records),
+        ("trending_points", trending_from_receipts(receipt_records)),
+        ("friends", generate_friends(rng, users, friends_per_user)),
+        ("friend_requests", []),
+        ("sessions", generate_sessions(rng, users, sessions)),
+        ("collections", collection_records),
+        ("saved_businesses", saved_records),
+        ("notifications", generate_notifications(rng, users, notifications)),
+        ("deals", []),
+        ("saved_deals", []),
+        ("reservations", []),
+        ("recommendations_cache", []),
+    ]:
+        start = time.perf_counter()
+        counts[name] = _write_json(out / f"{name}.json", records)
+        print(f"{name:<25} {counts[name]:>9} records  {time.perf_counter() - start:6.1f}s")
+
+    manifest = {
+        "seed": seed,
+        "counts": counts,
+        "business_ids": [BUSINESS_ID_START, BUSINESS_ID_START + businesses],
+        "user_ids": [USER_ID_START, USER_ID_START + users],
+        "review_ids": [REVIEW_ID_START, REVIEW_ID_START + reviews],
+        "cities": [{"name": c[0], "lat": c[1], "lon": c[2]} for c in CITIES],
+        "categories": [c[0] for c in CATEGORIES],
+        "name_words": NAME_WORDS,
+        "password": LOAD_TEST_PASSWORD,
+    }
+    with open(out / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic CNLC dataset for load testing.")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--businesses", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--receipts", type=int, default=100_000)
+    parser.add_argument("--friends-per-user", type=int, default=5)
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--saved", type=int, default=100_000)
+    parser.add_argument("--notifications", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generate(
+        args.out,
+        businesses=args.businesses,
+        users=args.users,
+        reviews=args.reviews,
+        receipts=args.receipts,
+        friends_per_user=args.friends_per_user,
+        sessions=args.sessions,
+        saved=args.saved,
+        notifications=args.notifications,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+./tests/load/run_load.py
+
+Drives the API with a mixed, weighted stream of realistic requests against a generated dataset and
+reports p50/p95/p99 latency and throughput per route. Requests go through Flask's test client
+in-process by default, or to a running server with --url.
+
+Usage:
+    python -m tests.load.generate_data --out /tmp/cnlc_load --businesses 100000 --reviews 1000000
+    python -m tests.load.run_load --data-dir /tmp/cnlc_load --requests 5000 --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Optional
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+Request = tuple[str, str]  # (method, path)
+
+
+def _business_id(rng: random.Random, manifest: dict) -> int:
+    start, end = manifest["business_ids"]
+    if rng.random() < 0.5:
+        return start + min(int(rng.paretovariate(1.2)) - 1, end - start - 1)  # Popular businesses
+    return rng.randrange(start, end)
+
+
+def _user_id(rng: random.Random, manifest: dict) -> int:
+    return rng.randrange(*manifest["user_ids"])
+
+
+def _near_city(rng: random.Random, manifest: dict) -> tuple[float, float]:
+    city = rng.choice(manifest["cities"])
+    return city["lat"] + rng.gauss(0, 0.03), city["lon"] + rng.gauss(0, 0.04)
+
+
+def build_mix(manifest: dict, writes: bool = True) -> list[tuple[str, float, Callable]]:
+    """
+    Returns the traffic mix: (route name, weight, factory(rng) -> (method, path)).
+
+    Args:
+        manifest (dict): Manifest written by generate_data.py.
+        writes (bool, optional): Include write traffic. Defaults to True.
+
+    Returns:
+        list[tuple[str, float, Callable]]: Weighted request factories.
+    """
+
+    def geo(rng):
+        lat, lon = _near_city(rng, manifest)
+        sort = "&sort=distance" if rng.random() < 0.5 else ""
+        return "GET", f"/api/businesses?lat1={lat:.5f}&lon1={lon:.5f}&radius={rng.choice([1, 2, 5, 10])}{sort}"
+
+    def nearest(rng):
+        lat, lon = _near_city(rng, manifest)
+        return "GET", f"/api/businesses/nearest?lat={lat:.5f}&lon={lon:.5f}&k={rng.choice([5, 10, 20])}"
+
+    def viewport(rng):
+        lat, lon = _near_city(rng, manifest)
+        zoom = rng.choice([11, 13, 15])
+        half = 180 / 2**zoom * 3  # Roughly a laptop screen at that zoom
+        return "GET", (
+            f"/api/businesses/viewport?min_lat={lat - half / 2:.5f}&min_lon={lon - half:.5f}"
+            f"&max_lat={lat + half / 2:.5f}&max_lon={lon + half:.5f}&zoom={zoom}"
+        )
+
+    def suggest(rng):
+        word = rng.choice(manifest["name_words"])
+        return "GET", f"/api/businesses/suggest?q={word[: rng.randint(1, len(word))]}"
+
+    def search(rng):
+        words = rng.sample(manifest["name_words"], rng.randint(1, 2))
+        return "GET", "/api/businesses?search=" + "%20".join(words)
+
+    def category(rng):
+        return "GET", (
+            f"/api/businesses?category={rng.choice(manifest['categories'])}"
+            f"&min_rating={rng.randint(1, 5)}"
+        )
+
+    def combined(rng):
+        lat, lon = _near_city(rng, manifest)
+        return "GET", (
+            f"/api/businesses?search={rng.choice(manifest['name_words'])}"
+            f"&category={rng.choice(manifest['categories'])}"
+            f"&lat1={lat:.5f}&lon1={lon:.5f}&radius=5"
+        )
+
+    mix = [
+        ("GET /api/businesses", 5, lambda rng: ("GET", f"/api/businesses?offset={rng.randrange(0, 300, 30)}")),
+        ("GET /api/businesses?geo", 20, geo),
+        ("GET /api/businesses/nearest", 6, nearest),
+        ("GET /api/businesses/viewport", 6, viewport),
+        ("GET /api/businesses/suggest", 10, suggest),
+        ("GET /api/businesses?search", 12, search),
+        ("GET /api/businesses?category", 8, category),
+        ("GET /api/businesses?combined", 5, combined),
+        ("GET /api/businesses/<id>", 10, lambda rng: ("GET", f"/api/businesses/{_business_id(rng, manifest)}")),
+        ("GET /api/businesses/batch", 4, lambda rng: ("GET", "/api/businesses/batch?ids=" + ",".join(
+            str(_business_id(rng, manifest)) for _ in range(rng.choice([10, 20, 50]))
+        ))),
+        ("GET /api/reviews", 15, lambda rng: ("GET", f"/api/reviews?business_id={_business_id(rng, manifest)}")),
+        ("GET /api/trending", 5, lambda rng: ("GET", "/api/trending")),
+        ("GET /api/notifications", 5, lambda rng: ("GET", f"/api/notifications/?user_id={_user_id(rng, manifest)}")),
+        ("GET /api/friends/activity", 3, lambda rng: ("GET", f"/api/friends/activity?user_id={_user_id(rng, manifest)}")),
+        ("GET /api/saved/businesses", 5, lambda rng: ("GET", f"/api/saved/businesses?user_id={_user_id(rng, manifest)}")),
+    ]
+    if writes:
+        mix.append((
+            "POST /api/reviews/<id>/helpful",
+            3,
+            lambda rng: ("POST", f"/api/reviews/{rng.randrange(*manifest['review_ids'])}/helpful"),
+        ))
+    return mix
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return float("nan")
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class TestClientTarget:
+    """Sends requests to the Flask app in-process, one test client per thread."""
+
+    def __init__(self) -> None:
+        from backend.api.server import app
+
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method: str, path: str) -> int:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.open(path, method=method).status_code
+
+    def get_json(self, path: str) -> dict:
+        return self.app.test_client().get(path).get_json()
+
+
+class HttpTarget:
+    """Sends requests to a running server."""
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, method: str, path: str) -> int:
+        req = urllib.request.Request(self.base_url + path, method=method, data=b"" if method != "GET" else None)
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def get_json(self, path: str) -> dict:
+        with urllib.request.urlopen(self.base_url + path, timeout=60) as resp:
+            return json.loads(resp.read())
+
+
+def run(
+    target,
+    mix: list[tuple[str, float, Callable]],
+    n_requests: int,
+    concurrency: int = 1,
+    warmup: int = 0,
+    seed: int = 0,
+) -> tuple[dict[str, list], dict[str, int], float]:
+    """
+    Sends n_requests drawn from the mix using concurrency worker threads.
+
+    Returns:
+        tuple[dict[str, list], dict[str, int], float]: Latencies in seconds per route, error count per
+            route (status >= 500 or transport failure), and wall-clock duration of the measured run.
+    """
+    names = [m[0] for m in mix]
+    weights = [m[1] for m in mix]
+    factories = {m[0]: m[2] for m in mix}
+
+    rng = random.Random(seed)
+    plan = [(name, factories[name](rng)) for name in rng.choices(names, weights=weights, k=warmup + n_requests)]
+
+    for _, (method, path) in plan[:warmup]:
+        target.send(method, path)  # Warm caches and indexes so the run measures steady state
+
+    latencies: dict[str, list] = {name: [] for name in names}
+    errors: dict[str, int] = {name: 0 for name in names}
+    results_lock = threading.Lock()
+    work = iter(plan[warmup:])
+    work_lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with work_lock:
+                item = next(work, None)
+            if item is None:
+                return
+            name, (method, path) = item
+            start = time.perf_counter()
+            try:
+                status = target.send(method, path)
+            except Exception:
+                status = 599
+            elapsed = time.perf_counter() - start
+            with results_lock:
+                latencies[name].append(elapsed)
+                if status >= 500:
+                    errors[name] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    wall_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.perf_counter() - wall_start
+
+
+def summarize(latencies: dict[str, list], errors: dict[str, int], wall: float) -> list[dict]:
+    """
+    Builds one report row per route plus an overall row (latencies in ms, throughput in req/s).
+    """
+    rows = []
+    everything = []
+    for name, values in latencies.items():
+        if not values:
+            continue
+        values = sorted(values)
+        everything.extend(values)
+        rows.append({
+            "route": name,
+            "requests": len(values),
+            "errors": errors[name],
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000,
+            "req_per_s": len(values) / wall,
+        })
+    everything.sort()
+    rows.append({
+        "route": "ALL",
+        "requests": len(everything),
+        "errors": sum(errors.values()),
+        "p50_ms": percentile(everything, 50) * 1000,
+        "p95_ms": percentile(everything, 95) * 1000,
+        "p99_ms": percentile(everything, 99) * 1000,
+        "max_ms": everything[-1] * 1000 if everything else float("nan"),
+        "req_per_s": len(everything) / wall,
+    })
+    return rows
+
+
+def print_report(rows: list[dict]) -> None:
+    header = f"{'route':<34} {'reqs':>6} {'errs':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'req/s':>8}"
+    print("=" * len(header))
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        if row["route"] == "ALL":
+            print("-" * len(header))
+        print(
+            f"{row['route']:<34} {row['requests']:>6} {row['errors']:>5} {row['p50_ms']:>9.2f} "
+            f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f} {row['req_per_s']:>8.1f}"
+        )
+    print("=" * len(header))
+
+
+def main(argv: Optional[list[str]] = None) -> list[dict]:
+    parser = argparse.ArgumentParser(description="Load-test the CNLC API against a generated dataset.")
+    parser.add_argument("--data-dir", required=True, help="Directory created by generate_data.py")
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests")
+    parser.add_argument("--concurrency", type=int, default=1, help="Worker threads")
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured requests sent first")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process test client)")
+    parser.add_argument("--read-only", action="store_true", help="Leave write traffic out of the mix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report rows to this JSON file")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if args.url:
+        target = HttpTarget(args.url)
+    else:
+        # Must be set before the app (and config) is imported
+        os.environ["CNLC_DATA_DIR"] = os.path.abspath(args.data_dir)
+        target = TestClientTarget()
+
+    latencies, errors, wall = run(
+        target,
+        build_mix(manifest, writes=not args.read_only),
+        args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        seed=args.seed,
+    )
+    rows = summarize(latencies, errors, wall)
+    print_report(rows)
+
+    try:
+        cache = target.get_json("/api/businesses/cache-stats")["cache"]
+        print(
+            f"Query cache (grid {cache['grid_deg']} deg): {cache['hits']} hits, {cache['misses']} misses, "
+            f"hit rate {cache['hit_rate']:.1%}, {cache['entries']} entries"
+        )
+    except Exception as e:
+        print(f"Query cache stats unavailable: {e}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=4)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+./tests/unit/conftest.py
+
+Fixtures for the correctness tests. They share one small synthetic dataset from
+tests/load/generate_data.py, written into a scratch data directory that the app is pointed at
+through CNLC_DATA_DIR, so the real data/ folder is never touched. Run them with
+    pytest tests/unit
+"""
+
+import os
+import tempfile
+
+import pytest
+
+if "CNLC_DATA_DIR" not in os.environ:
+    # Must happen before anything imports config
+    os.environ["CNLC_DATA_DIR"] = tempfile.mkdtemp(prefix="cnlc_unit_")
+
+DATASET_SIZE = 2000  # Businesses; large enough for every city and category to show up
+
+
+@pytest.fixture(scope="session")
+def dataset() -> dict:
+    """
+    Generates the dataset into CNLC_DATA_DIR once per session and returns its manifest.
+    """
+    import backend.storage.repository as repo
+    from tests.load.generate_data import generate
+
+    manifest = generate(
+        os.environ["CNLC_DATA_DIR"],
+        businesses=DATASET_SIZE,
+        users=DATASET_SIZE // 2,
+        reviews=DATASET_SIZE * 10,
+        receipts=DATASET_SIZE,
+        sessions=DATASET_SIZE // 2,
+        saved=DATASET_SIZE,
+        notifications=DATASET_SIZE * 2,
+        seed=DATASET_SIZE,
+    )
+    repo.clear()
+    return manifest
+
+
+@pytest.fixture
+def businesses(dataset) -> list[dict]:
+    import backend.storage.json_handler as jh
+
+    return jh.load_businesses()
+
+
+@pytest.fixture
+def client(dataset):
+    from backend.api.server import app
+
+    return app.test_client()
@@ -0,0 +1,148 @@
+"""
+./tests/unit/test_business_routes.py
+
+GET /api/businesses must return what the original filter chain returned: radius, then category,
+then minimum rating, each a full scan, then the fuzzy name search over what is left. Checked for
+the default business file (compiled columns, query cache) and for a custom file (JSON list).
+"""
+
+import itertools
+import json
+from collections import Counter
+
+import pytest
+from fuzzywuzzy import fuzz
+
+import backend.storage.json_handler as jh
+from backend.utils.geo import haversine_km
+from backend.utils.search import MATCH_THRESHOLD
+
+OTTAWA = (45.4215, -75.6972)
+
+SEARCHES = [None, "tim hotrons", "cafe pziza", "maple garden", "grill "]
+CATEGORIES = [None, "cafe", "restaurant"]
+AREAS = [None, (OTTAWA, 5), (OTTAWA, 50)]
+COMBINATIONS = list(itertools.product(SEARCHES, CATEGORIES, AREAS, [None])) + [
+    ("maple", "restaurant", (OTTAWA, 20), 4),
+    (None, None, (OTTAWA, 10), 3),
+]
+
+EXTRA_BUSINESSES = [
+    {"id": 1, "name": "Tim Hortons", "category": "cafe", "rating": 4.0},
+    {"id": 2, "name": "Cafe Pizza", "category": "restaurant", "rating": 3.5},
+    {"id": 3, "name": "Bakery Bistro Grill", "category": "restaurant", "rating": 4.5},
+    {"id": 4, "name": "Tim", "category": "cafe", "rating": 2.0},
+]
+
+
+def old_filter_chain(businesses, search, category, area, min_rating) -> tuple[int, list]:
+    """
+    (status, ids) of the original GET /api/businesses, before any index or query planner.
+    """
+    results = businesses
+    if area is not None:
+        (lat, lon), radius = area
+        results = [b for b in results if haversine_km(lat, lon, b["latitude"], b["longitude"]) < radius]
+        if not results:
+            return 404, []
+    if category:
+        results = [b for b in results if b["category"] == category]
+        if not results:
+            return 404, []
+    if min_rating:
+        results = [b for b in results if b.get("rating") and b["rating"] >= min_rating]
+    if search:
+        query = search.lower()
+        results = [
+            b for b in results
+            if b["name"] is not None
+            and fuzz.partial_ratio(query, b["name"].lower()) > MATCH_THRESHOLD
+            and fuzz.token_set_ratio(query, b["name"].lower()) > MATCH_THRESHOLD
+        ]
+        if not results:
+            return 404, []
+    return 200, [b["id"] for b in results]
+
+
+@pytest.fixture
+def custom_file(businesses, tmp_path) -> str:
+    businesses = businesses[:500]
+    for extra in EXTRA_BUSINESSES:
+        businesses.append({**businesses[extra["id"]], **extra})  # Placed where the others are
+    path = tmp_path / "businesses.json"
+    path.write_text(json.dumps(businesses))
+    return str(path)
+
+
+def request_args(search, category, area, min_rating) -> dict:
+    args = {"limit": 1_000_000}
+    if search:
+        args["search"] = search
+    if category:
+        args["category"] = category
+    if area is not None:
+        (args["lat1"], args["lon1"]), args["radius"] = area
+    if min_rating:
+        args["min_rating"] = min_rating
+    return args
+
+
+def assert_same_as_old_chain(client, businesses, combination, extra_args) -> None:
+    expected_status, expected_ids = old_filter_chain(businesses, *combination)
+    resp = client.get("/api/businesses", query_string={**request_args(*combination), **extra_args})
+
+    assert resp.status_code == expected_status, combination
+    if expected_status == 200:
+        body = resp.get_json()
+        assert body["total"] == len(expected_ids), combination
+        assert [b["id"] for b in body["businesses"]] == expected_ids, combination
+
+
+@pytest.mark.parametrize("combination", COMBINATIONS, ids=repr)
+def test_default_file_matches_old_chain(client, businesses, combination) -> None:
+    assert_same_as_old_chain(client, businesses, combination, {})
+
+
+@pytest.mark.parametrize("combination", COMBINATIONS, ids=repr)
+def test_custom_file_matches_old_chain(client, custom_file, combination) -> None:
+    businesses = jh.load_businesses(custom_file)
+    assert_same_as_old_chain(client, businesses, combination, {"filepath": custom_file})
+
+
+@pytest.mark.parametrize("search", ["river", "maple garden", "grill "])
+@pytest.mark.parametrize("use_filepath", [False, True], ids=["default_file", "custom_file"])
+def test_relevance_total_counts_every_match(client, businesses, custom_file, search, use_filepath) -> None:
+    args = {"search": search, "sort": "relevance", "limit": 5}
+    if use_filepath:
+        args["filepath"] = custom_file
+        businesses = jh.load_businesses(custom_file)
+    _, expected_ids = old_filter_chain(businesses, search, None, None, None)
+    assert len(expected_ids) > 10
+
+    first = client.get("/api/businesses", query_string=args).get_json()
+    second = client.get("/api/businesses", query_string={**args, "offset": 5}).get_json()
+    assert first["total"] == second["total"] == len(expected_ids)
+
+    # Offset pages rank the same way as cursor mode, which ranks every match at once
+    by_cursor = client.get("/api/businesses", query_string={**args, "cursor": "", "limit": 10}).get_json()
+    assert by_cursor["total"] == len(expected_ids)
+    assert [b["id"] for b in first["businesses"] + second["businesses"]] == [
+        b["id"] for b in by_cursor["businesses"]
+    ]
+
+
+@pytest.mark.parametrize("sort", [None, "relevance"])
+@pytest.mark.parametrize("area", [None, (OTTAWA, 20)])
+def test_facets_count_every_match(client, businesses, sort, area) -> None:
+    args = {**request_args("river", None, area, None), "limit": 5, "facets": 1}
+    if sort:
+        args["sort"] = sort
+    _, expected_ids = old_filter_chain(businesses, "river", None, area, None)
+    by_id = {b["id"]: b for b in businesses}
+
+    body = client.get("/api/businesses", query_string=args).get_json()
+    assert body["total"] == len(expected_ids)
+    for field in ("category", "cuisine"):
+        expected = Counter(by_id[i].get(field) for i in expected_ids)
+        expected.pop(None, None)
+        assert {f["value"]: f["count"] for f in body["facets"][field]} == expected, field
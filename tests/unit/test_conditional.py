@@ -0,0 +1,29 @@
+"""
+./tests/unit/test_conditional.py
+
+A conditional GET must only answer 304 while the data behind the response is unchanged, including
+after a same-size rewrite that keeps the file's mtime.
+"""
+
+import json
+
+from tests.unit.test_repository import rewrite_same_size_same_mtime
+
+
+def test_same_size_rewrite_changes_etag(client, businesses, tmp_path) -> None:
+    businesses = businesses[:50]
+    path = tmp_path / "businesses.json"
+    path.write_text(json.dumps(businesses))
+    args = {"filepath": str(path)}
+
+    first = client.get("/api/businesses", query_string=args)
+    etag = first.headers["ETag"]
+    assert client.get("/api/businesses", query_string=args, headers={"If-None-Match": etag}).status_code == 304
+
+    businesses[0]["name"] = businesses[0]["name"][:-1] + ("x" if businesses[0]["name"][-1] != "x" else "y")
+    rewrite_same_size_same_mtime(path, json.dumps(businesses))
+
+    second = client.get("/api/businesses", query_string=args, headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert second.get_json()["businesses"][0]["name"] == businesses[0]["name"]
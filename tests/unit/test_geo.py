@@ -0,0 +1,55 @@
+"""
+./tests/unit/test_geo.py
+
+The spatial grid must find exactly what a haversine scan over every business finds: the same
+businesses within a radius, and the same k nearest distances.
+"""
+
+import math
+
+import pytest
+
+import backend.core.business_manager as bm
+from backend.utils.geo import haversine_km
+
+POINTS = [
+    (45.4215, -75.6972),  # Ottawa, the densest city
+    (44.2312, -76.4860),  # Kingston
+    (45.0, -75.0),  # Between cities
+    (49.2827, -123.1207),  # Far from every business
+]
+RADII = [0.5, 5, 50, 500]
+EDGE_KM = 1e-6  # Vectorized and scalar haversine may disagree this close to the radius
+
+
+def scan_distances(businesses: list[dict], lat: float, lon: float) -> list[tuple[float, int]]:
+    return [
+        (haversine_km(lat, lon, b["latitude"], b["longitude"]), idx)
+        for idx, b in enumerate(businesses)
+        if b.get("latitude") is not None and b.get("longitude") is not None
+    ]
+
+
+@pytest.mark.parametrize("point", POINTS)
+@pytest.mark.parametrize("radius", RADII)
+def test_query_radius_equals_scan(businesses, point, radius) -> None:
+    idx, distances = bm.spatial_grid(businesses).query_radius(*point, radius)
+    found = dict(zip(idx.tolist(), distances.tolist()))
+
+    for distance, i in scan_distances(businesses, *point):
+        if abs(distance - radius) < EDGE_KM:
+            continue
+        assert (i in found) == (distance < radius), (i, distance)
+        if i in found:
+            assert math.isclose(found[i], distance, abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("point", POINTS)
+@pytest.mark.parametrize("k", [1, 20, 250])
+def test_nearest_equals_scan(businesses, point, k) -> None:
+    idx, distances = bm.spatial_grid(businesses).nearest(*point, k)
+    expected = sorted(scan_distances(businesses, *point))[:k]
+
+    assert len(idx) == len(expected)
+    assert distances.tolist() == pytest.approx([d for d, _ in expected], abs=1e-9)
+    assert list(distances) == sorted(distances)
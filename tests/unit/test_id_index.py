@@ -0,0 +1,72 @@
+"""
+./tests/unit/test_id_index.py
+
+The id index must find every business where a scan of the list finds it, whether it was just
+built, memory-mapped from its sidecar, or rebuilt because the sidecar on disk was stale.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+import backend.storage.repository as repo
+from backend.storage.id_index import _sidecar_name, _write_sidecar, build_id_index, load_id_index
+from tests.unit.test_repository import rewrite_same_size_same_mtime
+
+
+def scan_positions(businesses: list[dict], ids: list) -> list[int]:
+    first = {}
+    for idx, business in enumerate(businesses):
+        first.setdefault(business.get("id"), idx)
+    return [first.get(i, -1) for i in ids]
+
+
+def assert_finds_every_id(index, businesses: list[dict]) -> None:
+    ids = [b["id"] for b in businesses] + [-5, 0, 10**12]
+    assert index.positions(ids).tolist() == scan_positions(businesses, ids)
+
+
+def write_businesses(path: Path, businesses: list[dict]) -> list[dict]:
+    path.write_text(json.dumps(businesses))
+    repo.invalidate(path)
+    return repo.load(path)
+
+
+def test_sidecar_round_trip(businesses, tmp_path) -> None:
+    businesses = write_businesses(tmp_path / "businesses.json", businesses)
+    sidecars = tmp_path / "ids"
+
+    assert_finds_every_id(load_id_index(businesses, sidecars), businesses)  # Built and written
+    assert len(list(sidecars.glob("*.npy"))) == 1
+    assert_finds_every_id(load_id_index(businesses, sidecars), businesses)  # Memory-mapped
+
+
+def test_stale_sidecar_is_rebuilt(businesses, tmp_path) -> None:
+    businesses = write_businesses(tmp_path / "businesses.json", businesses)
+    sidecars = tmp_path / "ids"
+
+    # A same-length index of other ids, stored under this file version's name
+    other = [{"id": b["id"] + 1} for b in reversed(businesses)]
+    name, prefix = _sidecar_name(*repo.source(businesses))
+    _write_sidecar(build_id_index(other), sidecars / name, prefix)
+
+    assert_finds_every_id(load_id_index(businesses, sidecars), businesses)
+    stored = np.load(sidecars / name)
+    assert stored[0].tolist() == [b["id"] for b in businesses]  # Replaced on disk too
+
+
+def test_same_size_rewrite_gets_new_sidecar(businesses, tmp_path) -> None:
+    path = tmp_path / "businesses.json"
+    original = businesses
+    businesses = write_businesses(path, original)
+    sidecars = tmp_path / "ids"
+    load_id_index(businesses, sidecars)
+
+    swapped = [dict(b) for b in original]
+    swapped[0]["id"], swapped[1]["id"] = swapped[1]["id"], swapped[0]["id"]  # Same size
+    rewrite_same_size_same_mtime(path, json.dumps(swapped))
+    reloaded = repo.load(path)
+
+    assert reloaded[0]["id"] == swapped[0]["id"]
+    assert_finds_every_id(load_id_index(reloaded, sidecars), reloaded)
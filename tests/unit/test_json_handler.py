@@ -0,0 +1,48 @@
+"""
+./tests/unit/test_json_handler.py
+
+Saving businesses must leave a single valid JSON list on disk, and a reader must see either the
+old file or the new one, never a partial write.
+"""
+
+import json
+
+import pytest
+
+import backend.storage.json_handler as jh
+import backend.storage.repository as repo
+
+
+def test_append_extends_the_list(tmp_path) -> None:
+    path = str(tmp_path / "businesses.json")
+    jh.save_businesses([{"id": 1}], path)  # Appending to a missing file creates it
+    jh.save_businesses([{"id": 2}, {"id": 3}], path)
+
+    with open(path) as f:
+        assert json.load(f) == [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert jh.load_businesses(path) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def test_rewrite_replaces_the_list(tmp_path) -> None:
+    path = str(tmp_path / "businesses.json")
+    jh.save_businesses([{"id": 1}], path)
+    jh.save_businesses([{"id": 2}], path, io_type="w")
+    assert jh.load_businesses(path) == [{"id": 2}]
+
+
+def test_failed_save_leaves_the_old_file(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "businesses.json")
+    jh.save_businesses([{"id": 1}], path, io_type="w")
+
+    def partial_dump(data, f, **kwargs):
+        f.write('[{"id": ')
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repo.json, "dump", partial_dump)
+    with pytest.raises(OSError):
+        jh.save_businesses([{"id": 2}], path)
+    monkeypatch.undo()
+
+    with open(path) as f:
+        assert json.load(f) == [{"id": 1}]
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]  # Temp file cleaned up
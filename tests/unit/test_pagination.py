@@ -0,0 +1,50 @@
+"""
+./tests/unit/test_pagination.py
+
+Walking every page of a cursor-paginated query must return each match exactly once, in the same
+order as fetching all of them at once with query_page.
+"""
+
+import pytest
+
+import backend.core.business_manager as bm
+import backend.storage.repository as repo
+from backend.utils.pagination import version_token
+from config.config import BUSINESSES_JSON
+
+OTTAWA = (45.4215, -75.6972)
+
+QUERIES = [
+    {},
+    {"category": "restaurant"},
+    {"search_query": "maple garden", "sort": "relevance"},
+    {"lat": OTTAWA[0], "lon": OTTAWA[1], "radius": 5, "sort": "distance"},
+    {"lat": OTTAWA[0], "lon": OTTAWA[1], "radius": 20, "category": "cafe", "min_rating": 3},
+]
+
+
+@pytest.mark.parametrize("query", QUERIES, ids=lambda q: ",".join(q) or "all")
+@pytest.mark.parametrize("limit", [7, 100])
+def test_cursor_pages_round_trip(dataset, query, limit) -> None:
+    businesses = bm.load_for_query()
+    version = version_token(repo.signature(BUSINESSES_JSON))
+
+    seen, cursor, totals = [], None, set()
+    while True:
+        page, total, cursor = bm.query_cursor_page(businesses, version, limit, cursor, **query)
+        assert len(page) <= limit
+        seen.extend(b["id"] for b in page)
+        totals.add(total)
+        if cursor is None:
+            break
+
+    assert totals == {len(seen)}
+    assert len(set(seen)) == len(seen)
+
+    offset_query = {key: value for key, value in query.items() if key != "sort"}
+    if query.get("sort") == "relevance":
+        offset_query["ranked_limit"] = len(businesses)
+    offset_query["sort_by_distance"] = query.get("sort") == "distance"
+    everything, total, _, _ = bm.query_page(businesses, 0, len(businesses), **offset_query)
+    assert total == len(seen)
+    assert [b["id"] for b in everything] == seen
@@ -0,0 +1,54 @@
+"""
+./tests/unit/test_query_cache.py
+
+query_page must return the same page, total and errors with the query cache on as with it off,
+both when the entry is first built and when it is served from the cache. Located queries use
+points spread around one grid cell, so snapped entries are shared between them.
+"""
+
+import itertools
+
+import pytest
+
+import backend.core.business_manager as bm
+
+OTTAWA = (45.4215, -75.6972)
+GRID_OFFSETS = [(0.0, 0.0), (0.0049, -0.0049), (-0.0051, 0.0051), (0.003, 0.0)]
+
+SEARCHES = [None, "maple garden", "tim hotrons", "grill "]
+FILTERS = [{}, {"category": "cafe"}, {"category": "restaurant", "min_rating": 4}]
+AREAS = [None] + [(OTTAWA[0] + dlat, OTTAWA[1] + dlon, radius)
+                  for dlat, dlon in GRID_OFFSETS for radius in (1, 10)]
+
+
+def run(businesses, use_cache: bool, search, filters, area, ranked: bool):
+    lat, lon, radius = area if area is not None else (None, None, None)
+    try:
+        page, total, _, _ = bm.query_page(
+            businesses, 0, 50, search_query=search, lat=lat, lon=lon, radius=radius,
+            ranked_limit=50 if ranked and search else None, use_cache=use_cache, **filters,
+        )
+    except ValueError as e:
+        return "error", str(e)
+    return total, [(b["id"], b.get("score"), b.get("distance_km")) for b in page]
+
+
+@pytest.mark.parametrize("ranked", [False, True], ids=["dataset_order", "relevance"])
+def test_cache_on_equals_cache_off(dataset, ranked) -> None:
+    businesses = bm.load_for_query()
+    bm.query_cache(businesses).clear()
+
+    for search, filters, area in itertools.product(SEARCHES, FILTERS, AREAS):
+        expected = run(businesses, False, search, filters, area, ranked)
+        for _ in range(2):  # Miss, then hit
+            assert run(businesses, True, search, filters, area, ranked) == expected, (search, filters, area)
+
+
+def test_name_match_version_invalidates_cached_matches(dataset, monkeypatch) -> None:
+    businesses = bm.load_for_query()
+    bm.query_cache(businesses).clear()
+
+    assert bm.cached_plan_query(businesses, "maple garden")[2].startswith("cache:miss")
+    assert bm.cached_plan_query(businesses, "maple garden")[2].startswith("cache:hit")
+    monkeypatch.setattr(bm.search, "NAME_MATCH_VERSION", bm.search.NAME_MATCH_VERSION + 1)
+    assert bm.cached_plan_query(businesses, "maple garden")[2].startswith("cache:miss")
@@ -0,0 +1,81 @@
+"""
+./tests/unit/test_repository.py
+
+The storage cache must notice every write, including one that another process makes with the
+same size inside the same filesystem timestamp tick.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import backend.storage.repository as repo
+
+
+def rewrite_same_size_same_mtime(path: Path, text: str) -> None:
+    """
+    Replaces path the way _write_atomic does in another process, then restores its mtime.
+    """
+    st = os.stat(path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(path).st_size == st.st_size
+
+
+def test_same_size_rewrite_is_reloaded(tmp_path) -> None:
+    path = tmp_path / "items.json"
+    path.write_text('[{"v": 1}]')
+    assert repo.load(path) == [{"v": 1}]
+    before = repo.signature(path)
+
+    rewrite_same_size_same_mtime(path, '[{"v": 2}]')
+    assert repo.signature(path) != before
+    assert repo.load(path) == [{"v": 2}]
+
+
+def crash_on(monkeypatch, func: str, when) -> None:
+    """
+    Makes repository's os.<func> raise (as if the process died there) when when(*args) is true.
+    """
+    real = getattr(os, func)
+
+    def crashing(*args, **kwargs):
+        if when(*args):
+            raise KeyboardInterrupt("simulated crash")
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(repo.os, func, crashing)
+
+
+@pytest.mark.parametrize(
+    "crash_point",
+    ["after_log_moved_aside", "after_snapshot_replaced"],
+)
+@pytest.mark.parametrize("fresh_process", [False, True])
+def test_compaction_crash_neither_loses_nor_duplicates(tmp_path, monkeypatch, crash_point, fresh_process) -> None:
+    path = tmp_path / "reviews.json"
+    repo.save(path, [{"n": 0}])
+    repo.append(path, [{"n": 1}, {"n": 2}])
+    assert repo.load(path) == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    if crash_point == "after_log_moved_aside":
+        crash_on(monkeypatch, "replace", lambda src, dst: str(dst) == str(path.resolve()))
+    else:
+        crash_on(monkeypatch, "remove", lambda target: ".compacting-" in str(target))
+    with pytest.raises(KeyboardInterrupt):
+        repo.compact(path)
+    monkeypatch.undo()
+    assert list(tmp_path.glob("reviews.jsonl.compacting-*"))  # The crash left the handoff unfinished
+
+    if fresh_process:
+        repo.clear()
+    assert repo.load(path) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    repo.append(path, [{"n": 3}])
+    assert repo.load(path) == [{"n": 0}, {"n": 1}, {"n": 2}, {"n": 3}]
+    repo.compact(path)
+    repo.clear()
+    assert repo.load(path) == [{"n": 0}, {"n": 1}, {"n": 2}, {"n": 3}]
+    assert not list(tmp_path.glob("reviews.jsonl.compacting-*"))
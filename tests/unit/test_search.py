@@ -0,0 +1,106 @@
+"""
+./tests/unit/test_search.py
+
+The indexed fuzzy search must return exactly what the original full scan returns: every name with
+partial_ratio and token_set_ratio both above MATCH_THRESHOLD. Checked on typo'd, truncated and
+padded versions of the dataset's own names, and on hand-picked queries that an earlier trigram
+bound got wrong.
+"""
+
+import random
+
+import pytest
+from fuzzywuzzy import fuzz
+
+import backend.utils.search as search
+
+QUERIES_PER_KIND = 12
+
+
+def brute_force_matches(businesses: list[dict], query: str) -> list[int]:
+    query = query.lower()
+    return [
+        idx for idx, business in enumerate(businesses)
+        if business.get("name") is not None
+        and fuzz.partial_ratio(query, business["name"].lower()) > search.MATCH_THRESHOLD
+        and fuzz.token_set_ratio(query, business["name"].lower()) > search.MATCH_THRESHOLD
+    ]
+
+
+def substitution(rng: random.Random, name: str) -> str:
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1 :]
+
+
+def transposition(rng: random.Random, name: str) -> str:
+    i = rng.randrange(len(name) - 1)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+
+
+def prefix(rng: random.Random, name: str) -> str:
+    return name[: rng.randint(3, len(name))]
+
+
+def padded(rng: random.Random, name: str) -> str:
+    word = rng.choice(name.split())
+    return rng.choice(["", " ", "  "]) + word + rng.choice([" ", "  "])
+
+
+MUTATIONS = [substitution, transposition, prefix, padded]
+
+
+def random_queries(businesses: list[dict], mutation, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    names = [b["name"] for b in businesses if b.get("name") and len(b["name"]) > 3]
+    return [mutation(rng, rng.choice(names)) for _ in range(QUERIES_PER_KIND)]
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS, ids=lambda m: m.__name__)
+def test_match_indices_equals_full_scan(businesses, mutation) -> None:
+    for query in random_queries(businesses, mutation, seed=len(businesses)):
+        assert search.match_indices(businesses, query) == brute_force_matches(businesses, query), query
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("tim hotrons", "Tim Hortons"),
+        ("ottwaa cafe", "Ottawa Cafe"),
+        ("cafe pziza", "Cafe Pizza"),
+        ("grill ", "Bakery Bistro Grill"),
+        ("sushi ", "Sushi"),
+        (" sushi  ", "Sushi"),
+    ],
+)
+def test_match_indices_keeps_typo_and_padding_matches(query, expected) -> None:
+    businesses = [{"name": name} for name in
+                  ["Tim Hortons", "Ottawa Cafe", "Cafe Pizza", "Bakery Bistro Grill", "Sushi",
+                   "Maple Garden", None, "Tim", "A"]]
+    matches = search.match_indices(businesses, query)
+    assert matches == brute_force_matches(businesses, query)
+    assert [b["name"] for b in businesses].index(expected) in matches
+
+
+def brute_force_top_k(businesses: list[dict], query: str, k: int) -> list[tuple[int, float]]:
+    lowered = query.lower()
+    scored = [
+        (idx, (fuzz.partial_ratio(lowered, businesses[idx]["name"].lower())
+               + fuzz.token_set_ratio(lowered, businesses[idx]["name"].lower())) / 2)
+        for idx in brute_force_matches(businesses, query)
+    ]
+    return sorted(scored, key=lambda pair: (-pair[1], pair[0]))[:k]
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS, ids=lambda m: m.__name__)
+@pytest.mark.parametrize("k", [1, 10, 1000])
+def test_top_k_equals_full_sort(businesses, mutation, k) -> None:
+    for query in random_queries(businesses, mutation, seed=len(businesses) + k):
+        assert search.top_k_indices(businesses, query, k) == brute_force_top_k(businesses, query, k), query
+
+
+@pytest.mark.parametrize("k", [0, 5])
+def test_rank_matches_keeps_every_match(businesses, k) -> None:
+    for query in random_queries(businesses, prefix, seed=k):
+        ranked, matches = search.rank_matches(businesses, query, k)
+        assert ranked == brute_force_top_k(businesses, query, k), query
+        assert matches == brute_force_matches(businesses, query), query
@@ -0,0 +1,113 @@
+"""
+./tests/unit/test_sqlite_backend.py
+
+The SQLite backend must be a drop-in replacement for the JSON files: after
+scripts/migrate_to_sqlite.py, repository.load, find, save and append give the same results with
+CNLC_STORAGE_BACKEND=sqlite as with the JSON files they were migrated from.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import backend.storage.repository as repo
+from backend.storage import sqlite_store
+from config.config import DATA_DIR
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope="module")
+def migrated(dataset, tmp_path_factory) -> tuple[Path, Path]:
+    """
+    Copies the generated dataset into a scratch data directory and migrates it into a scratch
+    database with the migration script. Shared by the module; only the last test writes to it.
+    """
+    data_dir = tmp_path_factory.mktemp("data")
+    for path in DATA_DIR.glob("*.json"):
+        shutil.copy(path, data_dir / path.name)
+    db = data_dir / "cnlc.sqlite3"
+
+    env = {**os.environ, "CNLC_DATA_DIR": str(data_dir), "CNLC_SQLITE_DB": str(db)}
+    subprocess.run(
+        [sys.executable, "scripts/migrate_to_sqlite.py"], cwd=PROJECT_ROOT, env=env, check=True,
+        capture_output=True,
+    )
+    return data_dir, db
+
+
+@pytest.fixture
+def backends(migrated, monkeypatch):
+    """
+    Function that switches the repository between the JSON files and the database of migrated,
+    and returns the data directory.
+    """
+    data_dir, db = migrated
+    monkeypatch.setattr(repo, "DATA_DIR", data_dir)
+    monkeypatch.setattr(sqlite_store, "SQLITE_DB", db)
+    monkeypatch.setattr(sqlite_store, "_local", threading.local())  # No connection to another db
+
+    def use(backend: str) -> Path:
+        monkeypatch.setattr(repo, "STORAGE_BACKEND", backend)
+        repo.clear()
+        assert (repo.signature(data_dir / "users.json")[0] == "sqlite") == (backend == "sqlite")
+        return data_dir
+
+    yield use
+    conn = getattr(sqlite_store._local, "conn", None)
+    if conn is not None:
+        conn.close()
+    repo.clear()
+
+
+def on_both(backends, read):
+    """
+    read(data_dir) under the JSON backend, then under SQLite.
+    """
+    return read(backends("json")), read(backends("sqlite"))
+
+
+@pytest.mark.parametrize("name", ["businesses", "users", "reviews", "receipts", "notifications"])
+def test_load_matches(backends, name) -> None:
+    as_json, as_sqlite = on_both(backends, lambda d: repo.load(d / f"{name}.json"))
+    assert as_json and as_sqlite == as_json
+
+
+@pytest.mark.parametrize(
+    "name, field",
+    [("businesses", "id"), ("users", "username"), ("reviews", "businessID"), ("reviews", "userID")],
+)
+def test_find_matches(backends, name, field) -> None:
+    values = [r[field] for r in repo.load(backends("json") / f"{name}.json")[:: 97]] + ["missing"]
+    as_json, as_sqlite = on_both(
+        backends, lambda d: [repo.find(d / f"{name}.json", field, v) for v in values]
+    )
+    assert any(as_json) and as_sqlite == as_json
+
+
+def test_save_and_append_match(backends) -> None:
+    new_reviews = [
+        {"reviewId": 10**9 + i, "businessID": 1, "userID": 2, "username": "t", "rating": 5}
+        for i in range(3)
+    ]
+
+    def write_then_read(data_dir: Path) -> tuple:
+        users = repo.load(data_dir / "users.json", for_update=True)
+        users[0]["username"] = "renamed"
+        repo.save(data_dir / "users.json", users[:-1])
+        repo.append(data_dir / "reviews.json", new_reviews)
+        return (
+            repo.load(data_dir / "users.json"),
+            repo.load(data_dir / "reviews.json"),
+            repo.find(data_dir / "users.json", "username", "renamed"),
+            repo.find(data_dir / "reviews.json", "businessID", 1),
+        )
+
+    as_json, as_sqlite = on_both(backends, write_then_read)
+    assert as_json[1][-3:] == new_reviews and as_json[2]
+    assert as_sqlite == as_json